@@ -0,0 +1,234 @@
+"""
+Microseconds per model object, hand written constructors against generated ones
+
+The "before" numbers build the objects through a subclass whose ``__init__``
+is the constructor the model had before `bhaicord.models.schema`,
+with ``make_optional`` around every conversion and an enum call per object.
+Both must build the same attributes, which is checked first.
+A Member is mostly the `User` it builds, so both take about the same time,
+between 0.8x and 1.1x from run to run.
+
+    python benchmarks/constructors.py [count]
+"""
+import sys
+import time
+from datetime import datetime
+
+import bhaicord
+from bhaicord.utils import attributes_of, make_optional
+from bhaicord.models.channel import ChannelType
+from bhaicord.models.message import MessageTypes
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+def user(i):
+    return {
+        "id": str(10 ** 17 + i),
+        "username": f"user{i}",
+        "discriminator": f"{i % 10000:04d}",
+        "avatar": "a" * 32,
+        "public_flags": 0
+    }
+
+
+def member(i):
+    return {
+        "user": user(i),
+        "nick": None,
+        "roles": [str(10 ** 17 + 1)],
+        "joined_at": "2022-01-01T00:00:00.000000+00:00",
+        "premium_since": None,
+        "deaf": False,
+        "mute": False
+    }
+
+
+def message(i):
+    return {
+        "id": str(10 ** 17 + i),
+        "channel_id": str(10 ** 17),
+        "guild_id": str(10 ** 17),
+        "author": user(i % 500),
+        "member": member(i % 500),
+        "content": f"message number {i}",
+        "timestamp": "2022-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0
+    }
+
+
+def channel(i):
+    return {
+        "id": str(10 ** 17 + i),
+        "type": 0,
+        "guild_id": str(10 ** 17),
+        "name": f"channel-{i}",
+        "position": i,
+        "parent_id": str(10 ** 17 + 1),
+        "last_message_id": str(10 ** 17 + i),
+        "topic": None,
+        "nsfw": False
+    }
+
+
+def role(i):
+    return {"id": str(10 ** 17 + i), "name": f"role-{i}", "permissions": "0", "color": 0}
+
+
+def emoji(i):
+    return {"id": str(10 ** 17 + i), "name": f"emoji{i}", "roles": [], "animated": False}
+
+
+def channel_init(self, data):
+    self.id = data["id"]
+    self.type = ChannelType(data["type"])
+    self.guild_id = make_optional(int, data.get("guild_id"))
+    self.position = data.get("position")
+    self.permission_overwrites = data.get("permission_overwrites", [])
+    self.name = data.get("name")
+    self.topic = data.get("topic")
+    self.nsfw = data.get("nsfw", False)
+    self.last_message_id = make_optional(int, data.get("last_message_id"))
+    self.bitrate = data.get("bitrate")
+    self.user_limit = data.get("user_limit")
+    self.rate_limit_per_user = data.get("rate_limit_per_user")
+    self.recipients = list(map(bhaicord.User.from_data, data.get("recipients", [])))
+    self.icon = data.get("icon")
+    self.owner_id = make_optional(int, data.get("owner_id"))
+    self.application_id = make_optional(int, data.get("application_id"))
+    self.parent_id = make_optional(int, data.get("parent_id"))
+    self.last_pin_timestamp = make_optional(datetime.fromisoformat, data.get("last_pin_timestamp"))
+    self.rtc_region = data.get("rtc_region")
+    self.video_quality_mode = data.get("video_quality_mode")
+    self.message_count = data.get("message_count", -1)
+    self.member_count = data.get("member_count", -1)
+    self.thread_metadata = data.get("thread_metadata")
+    self.thread_member = data.get("thread_member")
+    self.thread_default_auto_archive_duration = data.get("default_auto_archive_duration", -1)
+    self.permissions = data.get("permissions")
+    self.flags = data.get("flags", -1)
+
+
+def member_init(self, data):
+    self._user = make_optional(bhaicord.User.from_data, data.get("user"))
+    self.nick = data.get("nick")
+    self.guild_avatar_hash = data.get("avatar")
+    self.role_ids = data.get("roles", [])
+
+    if data.get("premium_since"):
+        self.premium_since = datetime.fromisoformat(data.get("premium_since"))
+    else:
+        self.premium_since = None
+
+    self.joined_at = datetime.fromisoformat(data["joined_at"])
+    self.deaf = data.get("deaf")
+    self.mute = data.get("mute")
+    self.pending = data.get("pending")
+    self.permissions = data.get("permissions")
+
+
+def role_init(self, data):
+    self.id = data.get("id")
+    self.name = data.get("name")
+    self.color = data.get("color")
+    self.colour = self.color
+    self.hoist = data.get("hoist")
+    self._icon = data.get("icon")
+    self.unicode_emoji = data.get("unicode_emoji")
+    self.position = data.get("position", 0)
+    self._permissions = int(data.get("permissions", 0))
+    self.managed = data.get("managed", False)
+    self.mentionable = data.get("mentionable", False)
+    self.tags = make_optional(bhaicord.RoleTags, data.get("tags"))
+
+
+def emoji_init(self, data):
+    self.id = data.get("id")
+
+    if self.id:
+        self.id = int(self.id)
+
+    self.name = data.get("name")
+    self.roles = [int(role_id) for role_id in data.get("roles", [])]
+    self.user = make_optional(bhaicord.User.from_data, data.get("user"))
+    self.require_colons = data.get("require_colons", False)
+    self.managed = data.get("managed", False)
+    self.animated = data.get("animated", False)
+    self.available = data.get("available", True)
+
+
+def message_init(self, data):
+    self._data = data
+    self.id = int(data["id"])
+    self.channel_id = int(data["channel_id"])
+    self.guild_id = data.get("guild_id")
+
+    if self.guild_id is not None:
+        self.guild_id = int(self.guild_id)
+
+    self.content = data["content"]
+    self.tts = data["tts"]
+    self.mention_everyone = data["mention_everyone"]
+    self.nonce = data.get("nonce")
+    self.pinned = data.get("pinned")
+    self.webhook_id = data.get("webhook_id")
+    self.type = MessageTypes(data["type"])
+    self.application_id = data.get("application_id")
+    self.flags = data.get("flags")
+    self.thread = data.get("thread", {})
+    self.components = data.get("components", [])
+
+
+MODELS = (
+    (bhaicord.Channel, channel_init, channel),
+    (bhaicord.Member, member_init, member),
+    (bhaicord.Role, role_init, role),
+    (bhaicord.Emoji, emoji_init, emoji),
+    (bhaicord.Message, message_init, message)
+)
+
+
+def before(cls, init):
+    # the same slots, the old constructor
+    return type(cls.__name__, (cls, ), {"__slots__": (), "__init__": init})
+
+
+def state(obj):
+    return {name: getattr(obj, name, None) for name in attributes_of(obj) if name != "_data"}
+
+
+def measure(cls, payloads):
+    start = time.perf_counter()
+
+    for payload in payloads:
+        cls(payload)
+
+    return (time.perf_counter() - start) / len(payloads) * 1e6
+
+
+def main():
+    print(f"{'model':<10}{'before':>10}{'after':>10}{'faster':>10}  microseconds per object, {COUNT} objects")
+
+    for cls, init, make in MODELS:
+        payloads = [make(i) for i in range(COUNT)]
+        old = before(cls, init)
+
+        if state(old(payloads[0])) != state(cls(payloads[0])):
+            raise AssertionError(f"{cls.__name__} isn't built the same")
+
+        slow = min(measure(old, payloads) for _ in range(3))
+        fast = min(measure(cls, payloads) for _ in range(3))
+
+        print(f"{cls.__name__:<10}{slow:>10.2f}{fast:>10.2f}{slow / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Bytes per cached model object, with and without ``__slots__``
+
+The "dict" numbers build the same objects through a subclass that
+doesn't define ``__slots__``, so every instance gets a ``__dict__`` again,
+which is how the models were before. Only the measured class loses its
+slots, the models it builds (the author of a message...) keep theirs.
+
+    python benchmarks/memory.py [count]
+"""
+import sys
+import tracemalloc
+
+import bhaicord
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+def user(i):
+    return {
+        "id": str(10 ** 17 + i),
+        "username": f"user{i}",
+        "discriminator": f"{i % 10000:04d}",
+        "avatar": "a" * 32,
+        "public_flags": 0
+    }
+
+
+def member(i):
+    return {
+        "user": user(i),
+        "nick": None,
+        "roles": [str(10 ** 17 + 1)],
+        "joined_at": "2022-01-01T00:00:00.000000+00:00",
+        "deaf": False,
+        "mute": False
+    }
+
+
+def message(i):
+    return {
+        "id": str(10 ** 17 + i),
+        "channel_id": str(10 ** 17),
+        "guild_id": str(10 ** 17),
+        "author": user(i % 500),
+        "member": member(i % 500),
+        "content": f"message number {i}",
+        "timestamp": "2022-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [user(i % 7)],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0
+    }
+
+
+def channel(i):
+    return {"id": str(10 ** 17 + i), "type": 0, "guild_id": str(10 ** 17), "name": f"channel-{i}"}
+
+
+def role(i):
+    return {"id": str(10 ** 17 + i), "name": f"role-{i}", "permissions": "0", "color": 0}
+
+
+MODELS = (
+    (bhaicord.User, user),
+    (bhaicord.Member, member),
+    (bhaicord.Message, message),
+    (bhaicord.Channel, channel),
+    (bhaicord.Role, role)
+)
+
+
+def measure(cls, make):
+    payloads = [make(i) for i in range(COUNT)]
+
+    tracemalloc.start()
+    objects = [cls(payload) for payload in payloads]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del objects
+    return size / COUNT
+
+
+def unslotted(cls):
+    # a subclass without __slots__ has a __dict__ again
+    return type(cls.__name__, (cls, ), {})
+
+
+def main():
+    print(f"{'model':<10}{'dict':>10}{'slots':>10}{'saved':>10}  bytes per object, {COUNT} objects")
+
+    for cls, make in MODELS:
+        before = measure(unslotted(cls), make)
+        after = measure(cls, make)
+
+        print(f"{cls.__name__:<10}{before:>10.0f}{after:>10.0f}{1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,13 @@ from typing import Union
 
 async def fetch_channel_base(channel_id: int) -> Channel:
 
-    """Gets a channel by id"""
+    """Gets a channel by id, from the gateway state if it's there"""
 
     client = bhaicord.CurrentClient.get_client()
 
-    rs = await client.http.request("GET", f"/channels/{channel_id}")
-    return Channel(await rs.json())
\ No newline at end of file
+    channel = client.state.get_channel(channel_id)
+
+    if channel is not None:
+        return channel
+
+    return await client.http.get(f"/channels/{channel_id}", Channel)
\ No newline at end of file
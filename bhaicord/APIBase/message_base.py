@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Union, Optional, Iterable, TYPE_CHECKING, Dict, Any, List
+from typing import Union, Optional, Iterable, TYPE_CHECKING, Dict, Any, List, Callable
+import json
+import time
+import inspect
+import datetime
 import bhaicord
 
 from bhaicord.models.embed import Embed
@@ -52,12 +56,67 @@ async def create_message(
             "content": content,
             "tts": tts,
             "embeds": [em.to_dict() for em in embeds],
-            "allowed_mentions": allowed_mentions
+            "allowed_mentions": allowed_mentions,
+            # makes retrying safe, discord won't create this message twice
+            "nonce": bhaicord.generate_nonce(),
+            "enforce_nonce": True
         },
         files=files
     )
 
-    return Message(await rs.json())
+    return await client.http.decode(rs, Message)
+
+
+async def broadcast_messages(
+        channel_ids: Iterable[Union[int, str]],
+        content: Optional[str] = None,
+        embeds: Optional[Iterable[Embed]] = None,
+        *,
+        tts: Optional[bool] = None,
+        allowed_mentions: Optional[Dict[str, bool]] = None,
+        concurrency: int = 10) -> Dict[int, Union[Message, Exception]]:
+
+    """Sends the same message to many channels
+
+    The payload is encoded once, every channel only gets its own nonce appended,
+    the requests are sent in batch, see `HTTPClient.batch`.
+
+    Return:
+        typing.Dict[int, typing.Union[Message, Exception]]:
+            The message by channel id, or the exception if it couldn't be sent
+    """
+    client = bhaicord.CurrentClient.get_client()
+
+    channel_ids = list(dict.fromkeys(int(id_) for id_ in channel_ids))
+
+    if content is not None:
+        content = str(content)
+
+    body = json.dumps({
+        "content": content,
+        "tts": tts,
+        "embeds": [em.to_dict() for em in embeds or []],
+        "allowed_mentions": allowed_mentions or {}
+    }).encode()
+
+    # the closing brace is added back after the nonce
+    head = body[:-1]
+
+    results = await client.http.batch(
+        [
+            (
+                "POST",
+                f"/channels/{channel_id}/messages",
+                head + b', "nonce": "%s", "enforce_nonce": true}' % bhaicord.generate_nonce().encode()
+            )
+            for channel_id in channel_ids
+        ],
+        Message,
+        concurrency=concurrency,
+        idempotent=True
+    )
+
+    return dict(zip(channel_ids, results))
 
 
 async def edit_message(
@@ -103,28 +162,172 @@ async def delete_message(channel_id: int, message_id: int) -> None:
     )
 
 
+def _cache_message(client: "bhaicord.Client", message: Message) -> None:
+    """Adds the message to the cache, the least recently used message is removed if it's full"""
+    client.message_cache[message.id] = message
+    # requested again, it's not the one of the snapshot anymore
+    client.state.stale["messages"].discard(message.id)
+
+
 async def fetch_message_base(channel_id: int, message_id: int) -> Message:
     message_id = int(message_id)
     channel_id = int(channel_id)
 
     client = bhaicord.CurrentClient.get_client()
+    latency = client.fetch_latency["messages"]
+
+    start = time.perf_counter()
+    msg = None
 
-    msg = client.message_cache.get(message_id)
+    # a message loaded from a snapshot may have been edited or deleted since
+    if not client.state.is_stale("messages", message_id):
+        msg = client.message_cache.get(message_id)
+
+    latency["cache"].add(time.perf_counter() - start)
 
     if msg:
         return msg
 
-    if len(client.message_cache) >= client.cache_size:
-        key = list(client.message_cache.keys())
+    # failed requests take time too
+    start = time.perf_counter()
 
-        del client.message_cache[key]
+    try:
+        rs = await client.http.request(
+            "GET",
+            f"channels/{channel_id}/messages/{message_id}"
+        )
+        message = await client.http.decode(rs, Message)
+    finally:
+        latency["rest"].add(time.perf_counter() - start)
 
-    rs = await client.http.request(
-        "GET",
-        f"channels/{channel_id}/messages/{message_id}"
+    _cache_message(client, message)
+
+    return message
+
+
+async def fetch_messages_base(
+        channel_id: int,
+        message_ids: Iterable[int]) -> List[Union[Message, Exception]]:
+
+    """Gets many messages of a channel by id
+
+    The cached messages are returned as they are,
+    the others and the stale ones of a snapshot are requested in batch, see `HTTPClient.batch`.
+    A message that couldn't be fetched has its exception in the list instead.
+    """
+    channel_id = int(channel_id)
+    message_ids = [int(id_) for id_ in message_ids]
+
+    client = bhaicord.CurrentClient.get_client()
+
+    stale = client.state.stale["messages"]
+    cached = ((id_, client.message_cache.get(id_)) for id_ in message_ids if id_ not in stale)
+    found = {id_: value for id_, value in cached if value is not None}
+
+    # no repeated requests
+    missing = list(dict.fromkeys(id_ for id_ in message_ids if id_ not in found))
+
+    fetched = await client.http.batch(
+        [("GET", f"channels/{channel_id}/messages/{id_}") for id_ in missing],
+        Message
     )
-    message = Message(await rs.json())
 
-    client.message_cache[message_id] = message
+    for id_, message in zip(missing, fetched):
+        if isinstance(message, Message):
+            _cache_message(client, message)
 
-    return message
+        found[id_] = message
+
+    return [found[id_] for id_ in message_ids]
+
+
+# discord refuses to bulk delete messages older than 2 weeks
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14)
+BULK_DELETE_MAX_MESSAGES = 100
+
+
+async def purge_messages_base(
+        channel_id: int,
+        message_ids: Iterable[int],
+        *,
+        concurrency: int = 5,
+        progress: Optional[Callable[[int, int], Any]] = None) -> List[int]:
+
+    """Deletes any amount of messages with as few requests as possible
+
+    Messages younger than 2 weeks, told by their snowflake,
+    are bulk deleted 100 at a time from the oldest, the older ones are deleted one by one
+    with at most ``concurrency`` requests at once.
+
+    Args:
+        channel_id (int): The channel id
+        message_ids (typing.Iterable[int]): The messages to delete
+        concurrency (int): The maximum of single deletes at once
+        progress (typing.Optional[typing.Callable[[int, int], typing.Any]]):
+            Called with the messages done and the total after every request,
+            it can be a coroutine function
+
+    Return:
+        typing.List[int]: The ids deleted, messages already deleted count as deleted
+    """
+    client = bhaicord.CurrentClient.get_client()
+
+    channel_id = int(channel_id)
+    # avoids repetitive message ids, which will return 404 response,
+    # the oldest first so the ones close to 2 weeks are bulk deleted before they get too old
+    message_ids = sorted(set(int(id_) for id_ in message_ids))
+
+    # a minute of margin for the time the requests take
+    now = datetime.datetime.now(datetime.timezone.utc)
+    oldest = bhaicord.time_snowflake(now - BULK_DELETE_MAX_AGE + datetime.timedelta(minutes=1))
+
+    recent = [id_ for id_ in message_ids if id_ >= oldest]
+    old = [id_ for id_ in message_ids if id_ < oldest]
+
+    chunks = [
+        recent[index:index + BULK_DELETE_MAX_MESSAGES]
+        for index in range(0, len(recent), BULK_DELETE_MAX_MESSAGES)
+    ]
+
+    # bulk delete needs at least 2 messages
+    if chunks and len(chunks[-1]) == 1:
+        old.extend(chunks.pop())
+
+    deleted: List[int] = []
+    done = 0
+
+    async def report(ids: List[int], result: Any) -> None:
+        nonlocal done
+        done += len(ids)
+
+        if not isinstance(result, Exception) or isinstance(result, bhaicord.NotFound):
+            deleted.extend(ids)
+
+            for id_ in ids:
+                client.message_cache.discard(id_)
+
+        if progress is not None:
+            rs = progress(done, len(message_ids))
+
+            if inspect.isawaitable(rs):
+                await rs
+
+    for chunk in chunks:
+        try:
+            result = await client.http.request(
+                "POST",
+                f"/channels/{channel_id}/messages/bulk-delete",
+                {"messages": chunk}
+            )
+        except bhaicord.HTTPError as error:
+            result = error
+
+        await report(chunk, result)
+
+    await client.http.batch(
+        [("DELETE", f"/channels/{channel_id}/messages/{id_}") for id_ in old],
+        concurrency=concurrency,
+        on_result=lambda index, result: report([old[index]], result)
+    )
+
+    return deleted
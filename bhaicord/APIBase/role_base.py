@@ -6,12 +6,13 @@ from bhaicord.models.role import Role
 
 
 async def fetch_roles_from_guild_base(guild_id: int) -> List[Role]:
+    """Gets the roles of a guild, from the gateway state if it's there"""
+
     client = bhaicord.CurrentClient.get_client()
 
-    rs = await client.http.request(
-        "GET",
-        f"/guilds/{guild_id}/roles"
-    )
-    return list(map(
-        Role, await rs.json()
-    ))
\ No newline at end of file
+    roles = client.state.get_roles(guild_id)
+
+    if roles is not None:
+        return roles
+
+    return await client.http.get(f"/guilds/{guild_id}/roles", Role)
\ No newline at end of file
@@ -4,39 +4,99 @@ if TYPE_CHECKING:
     import bhaicord
     from bhaicord import User, CurrentClient
 
+import time
 import bhaicord
-from typing import Union
+from typing import Union, Iterable, List
 
 
-async def fetch_user_base(user_id: int) -> "User":
+def _cache_user(client: "bhaicord.Client", user: "User") -> None:
+    """Adds the user to the cache, the least recently used user is removed if it's full"""
+    client.user_cache[user.id] = user
+    # requested again, it's not the one of the snapshot anymore
+    client.state.stale["users"].discard(user.id)
+
+
+async def fetch_user_base(user_id: int, *, partial: bool = True) -> "User":
     """
     Gets a member object by id
 
     Args:
         user_id (int): user or member id
+        partial (bool): Whether a user the gateway sent is returned,
+            they have no banner or accent color, see `bhaicord.ConnectionState.get_user`
 
-    it checks first if this user is already in cache
-    if so, don't make a request but return the user
+    it checks first if the gateway sent this user or it is already in cache,
+    if so, don't make a request but return the user.
+    A user loaded from a snapshot that no event confirmed yet is requested again.
     If the user is not in cache add it
-    but if cache size exceeded, just remove the first
-    user from cache, and add the requested.
+    but if cache size exceeded, the least recently
+    used user is removed from cache.
     """
 
     client = bhaicord.CurrentClient.get_client()
+    latency = client.fetch_latency["users"]
+
+    start = time.perf_counter()
+    user = None
+
+    if not client.state.is_stale("users", user_id):
+        user = (partial and client.state.get_user(user_id)) or client.user_cache.get(int(user_id))
 
-    user = client.user_cache.get(user_id)
+    latency["cache"].add(time.perf_counter() - start)
 
     if user:
         return user
 
-    if len(client.user_cache) >= client.cache_size:
-        key = list(client.user_cache.keys())[0]
+    # failed requests take time too
+    start = time.perf_counter()
 
-        del client.user_cache[key]
+    try:
+        # cached data can be older than the shared user
+        user = await client.http.get(
+            f"/users/{user_id}",
+            bhaicord.User.from_data,
+            cached_model=bhaicord.User.from_cached_data
+        )
+    finally:
+        latency["rest"].add(time.perf_counter() - start)
 
-    rs = await client.http.request("GET", f"/users/{user_id}")
-    user = bhaicord.User(await rs.json())
+    _cache_user(client, user)
 
-    client.user_cache[user.id] = user
+    return user
+
+
+async def fetch_users_base(user_ids: Iterable[int]) -> List[Union["User", Exception]]:
+    """
+    Gets many users by id
+
+    Args:
+        user_ids (typing.Iterable[int]): users or members ids
+
+    The cached users are returned as they are,
+    the others and the stale ones of a snapshot are requested in batch, see `HTTPClient.batch`.
+    A user that couldn't be fetched has its exception in the list instead.
+    """
+
+    client = bhaicord.CurrentClient.get_client()
+
+    user_ids = [int(id_) for id_ in user_ids]
+    stale = client.state.stale["users"]
+    cached = ((id_, client.user_cache.get(id_)) for id_ in user_ids if id_ not in stale)
+    found = {id_: value for id_, value in cached if value is not None}
+
+    # no repeated requests
+    missing = list(dict.fromkeys(id_ for id_ in user_ids if id_ not in found))
+
+    fetched = await client.http.batch(
+        [("GET", f"/users/{id_}") for id_ in missing],
+        bhaicord.User.from_data,
+        cached_model=bhaicord.User.from_cached_data
+    )
+
+    for id_, user in zip(missing, fetched):
+        if isinstance(user, bhaicord.User):
+            _cache_user(client, user)
+
+        found[id_] = user
 
-    return user
\ No newline at end of file
+    return [found[id_] for id_ in user_ids]
\ No newline at end of file
@@ -1,16 +1,47 @@
 from __future__ import annotations
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 
 import bhaicord
 
+import json
+import time
+import asyncio
+import weakref
+import threading
+import http.client
+from urllib.parse import urlencode, urlsplit
 
 from bhaicord.models.embed import Embed
 from bhaicord.models.file import File
+from bhaicord.ratelimit import Bucket, RateLimiter
 
-import aiohttp
+# One unauthenticated client per event loop,
+# so every webhook of a loop shares the connections and rate limits
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, bhaicord.HTTPClient]" = weakref.WeakKeyDictionary()
 
 
-async def async_send(
+def webhook_http() -> "bhaicord.HTTPClient":
+    """The HTTP client used for webhooks in the running loop"""
+
+    loop = asyncio.get_running_loop()
+    http = _clients.get(loop)
+
+    if http is None:
+        http = _clients[loop] = bhaicord.HTTPClient(bot_token=None)
+
+    return http
+
+
+async def close_webhook_http() -> None:
+    """Closes the session of `webhook_http` in the running loop, a new one is made if needed"""
+
+    http = _clients.pop(asyncio.get_running_loop(), None)
+
+    if http is not None:
+        await http.close()
+
+
+def make_webhook_payload(
         *,
         content: Optional[str] = None,
         username: Optional[str] = None,
@@ -26,7 +57,14 @@ async def async_send(
         id_: Optional[int] = None,
         token: Optional[str] = None
 
-) -> Optional["bhaicord.Message"]:
+) -> Tuple[str, Dict[str, Any], List[File]]:
+
+    """Builds what executing a webhook sends
+
+    Return:
+        typing.Tuple[str, typing.Dict[str, typing.Any], typing.List[File]]:
+            The endpoint, the json payload and the files
+    """
 
     if content is not None:
         content = str(content)
@@ -37,11 +75,8 @@ async def async_send(
     if file is not None and files is not None:
         raise Exception('Either file or files')
 
-    if embeds is None:
-        embeds = []
-
-    if files is None:
-        files = []
+    embeds = list(embeds or [])
+    files = list(files or [])
 
     if file is not None:
         files.append(file)
@@ -53,12 +88,16 @@ async def async_send(
         allowed_mentions = {}
 
     endpoint = f"/webhooks/{id_}/{token}"
+    params = {}
 
-    if wait is not None and isinstance(wait, bool):
-        endpoint += "?wait=true"
+    if wait:
+        params["wait"] = "true"
 
     if thread_id is not None and isinstance(thread_id, (int, str)):
-        endpoint += f"&thread_id={thread_id}"
+        params["thread_id"] = thread_id
+
+    if params:
+        endpoint += f"?{urlencode(params)}"
 
     data = {
         "content": content,
@@ -68,31 +107,278 @@ async def async_send(
         "embeds": [em.to_dict() for em in embeds],
         "allowed_mentions": allowed_mentions
     }
-    if files:
-        content_type = f"multipart/form-data; boundary={bhaicord.HTTPClient.boundary}"
-        kwargs = {"data": await bhaicord.HTTPClient.multipart_handler(data, files)}
-    else:
-        content_type = "application/json"
-        kwargs = {"json": data}
-
-    async with aiohttp.ClientSession() as session:
-        rs = await session.request(
-            "POST",
-            f"{bhaicord.api_url}/{endpoint}",
-            **kwargs,
-            headers={
-                "Content-Type": content_type
-            }
-        )
-        if rs.status == 204:
-            return
-
-        return bhaicord.Message(await rs.json())
-
-
-def sync_send() -> None:
-    return
+
+    return endpoint, data, files
+
+
+async def async_send(
+        *,
+        content: Optional[str] = None,
+        username: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        tts: bool = False,
+        embed: Optional[Embed] = None,
+        embeds: Optional[List[Embed]] = None,
+        file: Optional[File] = None,
+        files: List[File] = None,
+        allowed_mentions: Optional[Dict[str, Any]] = None,
+        wait: bool = False,
+        thread_id: Any = None,
+        id_: Optional[int] = None,
+        token: Optional[str] = None
+
+) -> Optional["bhaicord.Message"]:
+
+    endpoint, data, files = make_webhook_payload(
+        content=content,
+        username=username,
+        avatar_url=avatar_url,
+        tts=tts,
+        embed=embed,
+        embeds=embeds,
+        file=file,
+        files=files,
+        allowed_mentions=allowed_mentions,
+        wait=wait,
+        thread_id=thread_id,
+        id_=id_,
+        token=token
+    )
+    http = webhook_http()
+
+    rs = await http.request("POST", endpoint, data, files=files)
+
+    # without wait, discord answers 204
+    if rs is None:
+        return
+
+    return await http.decode(rs, bhaicord.Message)
+
+
+class SyncTransport:
+    """
+    Blocking requests for webhooks, safe to use from many threads
+
+    Every thread keeps its own keep-alive connection,
+    the rate limits are shared by all of them
+    """
+
+    timeout: float = 30.0
+
+    def __init__(self):
+        self.retry_policy = bhaicord.RetryPolicy()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Bucket] = {}
+        self._global_reset_at: float = 0.0
+
+    def _connection(self, *, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        """The connection of this thread, and whether it was already used"""
+
+        url = urlsplit(bhaicord.api_url)
+        key = (url.scheme, url.netloc)
+
+        connections: Dict[Tuple[str, str], http.client.HTTPConnection] = getattr(self._local, "connections", None)
+
+        if connections is None:
+            connections = self._local.connections = {}
+
+        connection = connections.get(key)
+
+        if connection is not None and not fresh:
+            return connection, True
+
+        if connection is not None:
+            connection.close()
+
+        if url.scheme == "https":
+            connection = http.client.HTTPSConnection(url.netloc, timeout=self.timeout)
+        else:
+            connection = http.client.HTTPConnection(url.netloc, timeout=self.timeout)
+
+        connections[key] = connection
+
+        return connection, False
+
+    def _acquire(self, bucket: Bucket) -> None:
+        """Sleeps, without holding the lock, until the bucket has budget"""
+
+        while True:
+            with self._lock:
+                delay = max(bucket.delay(), self._global_reset_at - time.monotonic())
+
+                if delay <= 0:
+                    bucket.consume()
+                    return
+
+            time.sleep(delay)
+
+    def _send(
+            self,
+            method: str,
+            path: str,
+            body: Any,
+            headers: Dict[str, str]) -> Tuple[http.client.HTTPResponse, bytes]:
+
+        """Sends through the connection of this thread, once more on a new one if it went stale
+
+        A connection that failed in any other way, a timeout for example, is closed and dropped,
+        it's in the middle of a request and couldn't send another one
+        """
+        connection, reused = self._connection()
+
+        try:
+            try:
+                # http.client sends iterables chunked unless we know the length
+                connection.request(method, path, body=body, headers=headers)
+                rs = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # the server closed the idle connection before reading anything
+                if not reused or not isinstance(body, (bytes, type(None))):
+                    raise
+
+                connection, _ = self._connection(fresh=True)
+                connection.request(method, path, body=body, headers=headers)
+                rs = connection.getresponse()
+
+            # read everything so the connection can be reused
+            return rs, rs.read()
+        except BaseException:
+            self._drop(connection)
+            raise
+
+    def _drop(self, connection: http.client.HTTPConnection) -> None:
+        """Closes the connection and removes it from this thread, the next request makes a new one"""
+
+        connection.close()
+        connections: Dict[Tuple[str, str], http.client.HTTPConnection] = getattr(self._local, "connections", {})
+
+        for key, value in list(connections.items()):
+            if value is connection:
+                del connections[key]
+
+    def request(
+            self,
+            method: str,
+            endpoint: str,
+            payload: Optional[Dict[str, Any]] = None,
+            files: Optional[List[File]] = None) -> Any:
+
+        """Makes a request, rate limits and 429 responses are waited for
+
+        Return:
+            The json of the response, None if there is no content
+
+        Raises:
+            bhaicord.HTTPError: the error matching the status
+        """
+        path = urlsplit(bhaicord.api_url).path + endpoint
+        headers = {
+            "Accept": "application/json",
+            "User-Agent": f"DiscordBot ({bhaicord.__github__}, {bhaicord.__version__})"
+        }
+
+        with self._lock:
+            key = RateLimiter.route(method, endpoint)
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = Bucket(key)
+
+        attempt = 0
+
+        while True:
+            if files:
+                # made for every attempt, the files are streamed again
+                content_type, length, body = bhaicord.HTTPClient.encode_multipart(payload, files)
+                headers["Content-Type"] = content_type
+
+                if length is not None:
+                    headers["Content-Length"] = str(length)
+            else:
+                body = json.dumps(payload).encode() if payload is not None else None
+                headers["Content-Type"] = "application/json"
+
+            self._acquire(bucket)
+            rs, raw = self._send(method, path, body, headers)
+
+            with self._lock:
+                bucket.update(rs.headers)
+
+            if rs.status == 204:
+                return
+
+            if (rs.headers.get("Content-Type") or "").startswith("application/json"):
+                data = json.loads(raw)
+            else:
+                data = raw.decode(errors="replace")
+
+            if 200 <= rs.status < 300:
+                return data
+
+            if rs.status != 429 or attempt >= self.retry_policy.max_retries:
+                bhaicord.determine_error(rs.status, data)
+
+            if isinstance(data, dict) and "retry_after" in data:
+                delay = float(data["retry_after"])
+            else:
+                delay = float(rs.headers.get("Retry-After", self.retry_policy.backoff(attempt)))
+
+            if isinstance(data, dict) and data.get("global"):
+                with self._lock:
+                    self._global_reset_at = time.monotonic() + delay
+
+            attempt += 1
+            time.sleep(delay)
+
+
+sync_transport = SyncTransport()
+
+
+def sync_send(
+        *,
+        content: Optional[str] = None,
+        username: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+        tts: bool = False,
+        embed: Optional[Embed] = None,
+        embeds: Optional[List[Embed]] = None,
+        file: Optional[File] = None,
+        files: List[File] = None,
+        allowed_mentions: Optional[Dict[str, Any]] = None,
+        wait: bool = False,
+        thread_id: Any = None,
+        id_: Optional[int] = None,
+        token: Optional[str] = None
+
+) -> Optional["bhaicord.Message"]:
+
+    """Executes a webhook without asyncio, blocks until it's sent"""
+
+    endpoint, data, files = make_webhook_payload(
+        content=content,
+        username=username,
+        avatar_url=avatar_url,
+        tts=tts,
+        embed=embed,
+        embeds=embeds,
+        file=file,
+        files=files,
+        allowed_mentions=allowed_mentions,
+        wait=wait,
+        thread_id=thread_id,
+        id_=id_,
+        token=token
+    )
+
+    data = sync_transport.request("POST", endpoint, data, files)
+
+    # without wait, discord answers 204
+    if data is None:
+        return
+
+    return bhaicord.Message(data)
 
 
 async def fetch_webhook_base() -> Optional["bhaicord.Webhook"]:
-    return
\ No newline at end of file
+    return
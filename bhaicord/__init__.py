@@ -2,8 +2,8 @@ from .client import Client
 from .intents import Intents
 from .utils import *
 
-from bhaicord.http import HTTPClient
-from . import errors, models, websocket, APIBase, events
+from bhaicord.http import HTTPClient, RetryPolicy
+from . import errors, models, websocket, ratelimit, cache, storage, state, members, iterators, exporter, snapshot, APIBase, events
 
 from .models.file import *
 from .models.guild import *
@@ -17,8 +17,17 @@ from .models.emoji import *
 from .models.role import *
 from .models.webhook import *
 
+from .cache import *
+from .storage import *
+from .state import *
+from .members import *
+from .iterators import *
+from .exporter import *
+from .snapshot import *
+
 from .events.channel_events import *
 from .events.message_events import *
+from .events.member_events import *
 from .events.ready_event import *
 from .events.typing_start import *
 
@@ -0,0 +1,991 @@
+from __future__ import annotations
+
+import re
+import attr
+import time
+import bisect
+import datetime
+import bhaicord
+
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING
+)
+
+from bhaicord.utils import DataType, approximate_size, time_snowflake
+from bhaicord.iterators import SnowflakeOrDate, _to_snowflake
+
+if TYPE_CHECKING:
+    from bhaicord.storage import BaseStorage
+    from bhaicord.models.message import Message
+
+__all__: Tuple[str] = (
+    "CachePolicy",
+    "CacheStats",
+    "LatencyStats",
+    "LRUCache",
+    "MessageCache",
+    "ResponseCache"
+)
+
+# the entity types a policy can be given for
+CACHE_TYPES = frozenset({"users", "messages", "members", "channels"})
+
+_ID = re.compile(r"\d{15,21}")
+
+MISSING = object()
+
+
+class _NotFound:
+    """The url answered 404 with this data"""
+
+    def __init__(self, data: Any):
+        self.data = data
+
+
+def _key(url: str) -> str:
+    return "/" + url.lstrip("/")
+
+
+@attr.define(kw_only=True)
+class CachePolicy:
+    """
+    How much of an entity type the client keeps
+
+    Example:
+        Client(intents, cache_policies={
+            "messages": CachePolicy(max_memory=256, max_age=3600),
+            "members": CachePolicy(enabled=False)
+        })
+    """
+
+    max_entries: Optional[int] = attr.field(default=None)
+    """The maximum of entries, unbounded if None"""
+
+    max_age: Optional[float] = attr.field(default=None)
+    """Seconds an entry is kept, forever if None, messages are kept this long after being sent"""
+
+    max_memory: Optional[float] = attr.field(default=None)
+    """The maximum of megabytes the entries take, approximated, unbounded if None"""
+
+    enabled: bool = attr.field(default=True)
+    """Whether to cache this type at all"""
+
+    max_per_channel: Optional[int] = attr.field(default=None)
+    """The maximum of messages per channel, unbounded if None, only used for messages"""
+
+    @property
+    def unbounded(self) -> bool:
+        """Whether the policy keeps everything, forever"""
+        return self.enabled and self.max_entries is None and self.max_age is None and self.max_memory is None
+
+    def build(self, *, storage: Optional[BaseStorage] = None, namespace: str = "cache") -> MutableMapping:
+        """A dict if the policy is unbounded, otherwise a `LRUCache` with its limits
+
+        Args:
+            storage (typing.Optional[bhaicord.BaseStorage]): Where the evicted entries go
+            namespace (str): Their namespace in the storage
+        """
+
+        if self.unbounded:
+            return {}
+
+        return LRUCache.from_policy(self, storage=storage, namespace=namespace)
+
+
+@attr.define(kw_only=True)
+class CacheStats:
+    """
+    What a cache did since it was created
+
+    The counters are kept by the caches as they work,
+    ``size`` is the entries in memory when the stats were taken
+    """
+
+    hits: int = attr.field(default=0)
+    """Lookups answered from memory"""
+
+    storage_hits: int = attr.field(default=0)
+    """Lookups answered from the storage, see `bhaicord.BaseStorage`"""
+
+    misses: int = attr.field(default=0)
+    """Lookups of keys that weren't cached"""
+
+    inserts: int = attr.field(default=0)
+    """Entries added or replaced"""
+
+    evictions: int = attr.field(default=0)
+    """Entries removed because the cache was full or they were too old"""
+
+    size: int = attr.field(default=0)
+    """The entries in memory"""
+
+    @classmethod
+    def of(cls, cache: Any) -> CacheStats:
+        """The stats of a cache, a dict (an unbounded policy) only has a size"""
+
+        if isinstance(cache, (LRUCache, MessageCache, ResponseCache)):
+            return cache.stats
+
+        return cls(size=len(cache))
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.storage_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """The part of the lookups answered, from memory or the storage, 0 without lookups"""
+
+        if not self.lookups:
+            return 0.0
+
+        return (self.hits + self.storage_hits) / self.lookups
+
+    def __add__(self, other: CacheStats) -> CacheStats:
+        return CacheStats(**{
+            name: getattr(self, name) + getattr(other, name)
+            for name in attr.fields_dict(CacheStats)
+        })
+
+
+@attr.define(kw_only=True)
+class LatencyStats:
+    """The calls of something and the seconds they took"""
+
+    calls: int = attr.field(default=0)
+    total: float = attr.field(default=0.0)
+    max: float = attr.field(default=0.0)
+
+    @property
+    def mean(self) -> float:
+        """Seconds per call, 0 without calls"""
+        return self.total / self.calls if self.calls else 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+
+class LRUCache(MutableMapping):
+    """
+    A dict-like cache that removes its least recently used entry when full
+
+    Getting, setting and removing are O(1).
+    Expired entries are removed when they are found,
+    `expire` removes all of them at once.
+
+    Args:
+        maxsize (typing.Optional[int]): The maximum of entries, unbounded if None
+        ttl (typing.Optional[float]): Seconds an entry is kept, forever if None
+        max_memory (typing.Optional[int]): The maximum of bytes the values take,
+            measured with `bhaicord.utils.approximate_size` when added
+        storage (typing.Optional[bhaicord.BaseStorage]):
+            Where the evicted entries go instead of being lost,
+            a key missing in memory is looked up there and brought back
+        namespace (str): The namespace of the entries in the storage
+
+    Note:
+        ``len`` and iterating only see the entries in memory,
+        ``del`` and `clear` remove from the storage too
+    """
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = None,
+            *,
+            ttl: Optional[float] = None,
+            max_memory: Optional[int] = None,
+            storage: Optional[BaseStorage] = None,
+            namespace: str = "cache"):
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self.storage = storage
+        self.namespace = namespace
+
+        # the sum of the sizes, only measured with max_memory
+        self._memory = 0
+
+        # key -> (expires at, value, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any, int]]" = OrderedDict()
+
+        self._stats = CacheStats()
+
+    @classmethod
+    def from_policy(
+            cls,
+            policy: CachePolicy,
+            *,
+            storage: Optional[BaseStorage] = None,
+            namespace: str = "cache") -> LRUCache:
+
+        """A cache with the limits of the policy
+
+        It keeps nothing in memory if the policy is disabled, only in the storage if there's one
+        """
+
+        if not policy.enabled:
+            return cls(0, storage=storage, namespace=namespace)
+
+        return cls(
+            policy.max_entries,
+            ttl=policy.max_age,
+            max_memory=None if policy.max_memory is None else int(policy.max_memory * 1024 * 1024),
+            storage=storage,
+            namespace=namespace
+        )
+
+    def __repr__(self) -> str:
+        return f"<LRUCache size={len(self)} maxsize={self.maxsize} ttl={self.ttl}>"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the storage is a connection, and monotonic times mean nothing in another process
+        now = time.monotonic()
+        state = self.__dict__.copy()
+
+        state["storage"] = None
+        state["_entries"] = OrderedDict(
+            (key, (None if expires_at is None else expires_at - now, value, size))
+            for key, (expires_at, value, size) in self._entries.items()
+        )
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        now = time.monotonic()
+
+        self.__dict__.update(state)
+        self._entries = OrderedDict(
+            (key, (None if left is None else now + left, value, size))
+            for key, (left, value, size) in state["_entries"].items()
+        )
+
+    def entries(self) -> Iterator[Tuple[Hashable, Any]]:
+        """The entries in memory that haven't expired, least recently used first, without using them"""
+
+        now = time.monotonic()
+
+        return iter([
+            (key, value) for key, (expires_at, value, _) in self._entries.items()
+            if expires_at is None or now < expires_at
+        ])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        now = time.monotonic()
+
+        return iter([
+            key for key, (expires_at, _, _) in self._entries.items()
+            if expires_at is None or now < expires_at
+        ])
+
+    def __contains__(self, key: Hashable) -> bool:
+        # not a lookup, nothing is counted, used or loaded
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            return entry[0] is None or time.monotonic() < entry[0]
+
+        return self.storage is not None and self.storage.get(self.namespace, key) is not MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.peek(key, MISSING)
+
+        if value is MISSING:
+            raise KeyError(key)
+
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+
+        if key not in self._entries and self.storage is None:
+            raise KeyError(key)
+
+        self.discard(key)
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Removes the key if it's cached, like `MessageCache.discard`
+
+        Unlike ``pop`` it isn't a lookup, it's not counted in `stats`
+        and the value isn't loaded from the storage to be removed.
+        """
+        if key in self._entries:
+            self._discard(key)
+
+        if self.storage is not None:
+            self.storage.delete(self.namespace, key)
+
+    def _discard(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._memory -= size
+
+    @property
+    def stats(self) -> CacheStats:
+        """What the cache did, see `CacheStats`"""
+        return attr.evolve(self._stats, size=len(self))
+
+    @property
+    def memory(self) -> int:
+        """The approximate bytes the values take"""
+
+        if self.max_memory is not None:
+            return self._memory
+
+        return sum(approximate_size(value) for _, value, _ in self._entries.values())
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """The value of the key without marking it as used"""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return self._load(key, default)
+
+        expires_at, value, _ = entry
+
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._discard(key)
+            self._stats.evictions += 1
+            self._stats.misses += 1
+            return default
+
+        self._stats.hits += 1
+        return value
+
+    def _load(self, key: Hashable, default: Any) -> Any:
+        """Brings the key back from the storage"""
+
+        if self.storage is None:
+            self._stats.misses += 1
+            return default
+
+        value = self.storage.get(self.namespace, key)
+
+        if value is MISSING:
+            self._stats.misses += 1
+            return default
+
+        self._stats.storage_hits += 1
+        self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any, *, ttl: Optional[float] = None) -> None:
+        """
+        Adds or replaces the key, the least recently used entries are removed if it's full
+
+        Args:
+            key (typing.Hashable): The key
+            value (typing.Any): The value
+            ttl (typing.Optional[float]): Seconds to keep it, the cache ``ttl`` if None
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        size = 0 if self.max_memory is None else approximate_size(value)
+
+        if key in self._entries:
+            self._discard(key)
+
+        self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value, size)
+        self._memory += size
+        self._stats.inserts += 1
+
+        while self._entries and self._full():
+            evicted, value = self.popitem()
+            self._stats.evictions += 1
+
+            if self.storage is not None:
+                self.storage.set(self.namespace, evicted, value)
+
+    def _full(self) -> bool:
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            return True
+
+        return self.max_memory is not None and self._memory > self.max_memory
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        """Removes and returns the least recently used entry in memory"""
+
+        key, (_, value, size) = self._entries.popitem(last=False)
+        self._memory -= size
+
+        return key, value
+
+    def expire(self) -> int:
+        """Removes the expired entries, returns how many were removed"""
+
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _, _) in self._entries.items()
+            if expires_at is not None and now >= expires_at
+        ]
+
+        for key in expired:
+            self._discard(key)
+
+        self._stats.evictions += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._memory = 0
+
+        # or the cleared entries would come back from it
+        if self.storage is not None:
+            self.storage.clear(self.namespace)
+
+
+class MessageCache(MutableMapping):
+    """
+    The cached messages, kept per channel sorted by id
+
+    Every channel has its message ids in a sorted list, the oldest is dropped
+    when it has ``max_per_channel`` of them, like a ring buffer.
+    Since ids are snowflakes, sorted by id is sorted by date,
+    so `history` finds any range of messages with a binary search instead of requesting them.
+    It's still a dict of message id -> message for the rest of the library.
+
+    Args:
+        maxsize (typing.Optional[int]): The maximum of messages, unbounded if None,
+            the channel with the least recent message loses its oldest one first
+        max_per_channel (typing.Optional[int]): The maximum of messages per channel, unbounded if None
+        max_age (typing.Optional[float]): Seconds since a message was sent, told by its id,
+            that it is kept, forever if None
+        max_memory (typing.Optional[int]): The maximum of bytes the messages take,
+            measured with `bhaicord.utils.approximate_size` when added
+        storage (typing.Optional[bhaicord.BaseStorage]):
+            Where the evicted messages go instead of being lost, like `LRUCache`
+        namespace (str): The namespace of the messages in the storage
+
+    Example:
+        last_50 = client.message_cache.history(channel_id, limit=50)
+        last_hour = client.message_cache.history(channel_id, after=now - timedelta(hours=1))
+    """
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = None,
+            *,
+            max_per_channel: Optional[int] = None,
+            max_age: Optional[float] = None,
+            max_memory: Optional[int] = None,
+            storage: Optional[BaseStorage] = None,
+            namespace: str = "messages"):
+
+        self.maxsize = maxsize
+        self.max_per_channel = max_per_channel
+        self.max_age = max_age
+        self.max_memory = max_memory
+        self.storage = storage
+        self.namespace = namespace
+
+        self._messages: Dict[int, Message] = {}
+
+        # channel id -> sorted message ids, the channels ordered by their last message
+        self._channels: "OrderedDict[int, List[int]]" = OrderedDict()
+
+        # message id -> size, only measured with max_memory
+        self._sizes: Dict[int, int] = {}
+        self._memory = 0
+
+        self._stats = CacheStats()
+
+    @classmethod
+    def from_policy(
+            cls,
+            policy: CachePolicy,
+            *,
+            storage: Optional[BaseStorage] = None,
+            namespace: str = "messages") -> MessageCache:
+
+        """A cache with the limits of the policy, it keeps nothing in memory if the policy is disabled"""
+
+        if not policy.enabled:
+            return cls(0, storage=storage, namespace=namespace)
+
+        return cls(
+            policy.max_entries,
+            max_per_channel=policy.max_per_channel,
+            max_age=policy.max_age,
+            max_memory=None if policy.max_memory is None else int(policy.max_memory * 1024 * 1024),
+            storage=storage,
+            namespace=namespace
+        )
+
+    def __repr__(self) -> str:
+        return f"<MessageCache size={len(self)} channels={len(self._channels)} maxsize={self.maxsize}>"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["storage"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._messages))
+
+    def __contains__(self, message_id: Any) -> bool:
+        return self.get(message_id) is not None
+
+    def __getitem__(self, message_id: int) -> Message:
+        message = self._messages.get(message_id)
+
+        if message is None:
+            message = self._load(message_id)
+
+        elif message_id < self._oldest():
+            self._discard(message)
+            self._stats.evictions += 1
+            message = None
+
+        else:
+            self._stats.hits += 1
+
+        if message is None:
+            self._stats.misses += 1
+            raise KeyError(message_id)
+
+        return message
+
+    def __setitem__(self, message_id: int, message: Message) -> None:
+
+        if message_id != message.id:
+            raise ValueError(f"message {message.id} can't be cached as {message_id}")
+
+        self.add(message)
+
+    def __delitem__(self, message_id: int) -> None:
+
+        if message_id not in self._messages and self.storage is None:
+            raise KeyError(message_id)
+
+        self.discard(message_id)
+
+    def discard(self, message_id: int) -> None:
+        """
+        Removes the message if it's cached, for deleted messages
+
+        Unlike ``pop`` it isn't a lookup, it's not counted in `stats`
+        and the message isn't loaded from the storage to be removed.
+        """
+        message = self._messages.get(message_id)
+
+        if message is not None:
+            self._discard(message)
+
+        if self.storage is not None:
+            self.storage.delete(self.namespace, message_id)
+
+    @property
+    def stats(self) -> CacheStats:
+        """What the cache did, see `CacheStats`"""
+        return attr.evolve(self._stats, size=len(self))
+
+    @property
+    def memory(self) -> int:
+        """The approximate bytes the messages take"""
+
+        if self.max_memory is not None:
+            return self._memory
+
+        return sum(approximate_size(message) for message in self._messages.values())
+
+    def _oldest(self) -> int:
+        """The lowest id that isn't too old, 0 without max_age"""
+
+        if self.max_age is None:
+            return 0
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return time_snowflake(now - datetime.timedelta(seconds=self.max_age))
+
+    def _load(self, message_id: int) -> Optional[Message]:
+        """Brings the message back from the storage"""
+
+        if self.storage is None:
+            return None
+
+        message = self.storage.get(self.namespace, message_id)
+
+        if message is MISSING or message_id < self._oldest():
+            return None
+
+        self._stats.storage_hits += 1
+
+        # it can be the oldest message and go right back to the storage
+        self.add(message)
+        return message
+
+    def _discard(self, message: Message) -> None:
+        """Removes a message from memory"""
+
+        del self._messages[message.id]
+        self._memory -= self._sizes.pop(message.id, 0)
+
+        ids = self._channels.get(message.channel_id)
+
+        if ids is None:
+            return
+
+        index = bisect.bisect_left(ids, message.id)
+
+        if index < len(ids) and ids[index] == message.id:
+            del ids[index]
+
+        if not ids:
+            del self._channels[message.channel_id]
+
+    def _evict(self, message: Message) -> None:
+        """Removes a message from memory, into the storage if there's one"""
+
+        self._discard(message)
+        self._stats.evictions += 1
+
+        if self.storage is not None:
+            self.storage.set(self.namespace, message.id, message)
+
+    def _full(self) -> bool:
+        if self.maxsize is not None and len(self._messages) > self.maxsize:
+            return True
+
+        return self.max_memory is not None and self._memory > self.max_memory
+
+    def add(self, message: Message) -> None:
+        """Adds or replaces a message, the oldest messages are removed if it's full
+
+        A message older than ``max_age`` isn't added
+        """
+
+        if message.id < self._oldest():
+            return
+
+        old = self._messages.get(message.id)
+
+        if old is not None and old.channel_id != message.channel_id:
+            self._discard(old)
+            old = None
+
+        self._messages[message.id] = message
+        self._stats.inserts += 1
+
+        if self.max_memory is not None:
+            size = approximate_size(message)
+            self._memory += size - self._sizes.get(message.id, 0)
+            self._sizes[message.id] = size
+
+        ids = self._channels.get(message.channel_id)
+
+        if ids is None:
+            ids = self._channels[message.channel_id] = []
+
+        if old is None:
+            # new messages usually are the newest of their channel
+            if not ids or message.id > ids[-1]:
+                ids.append(message.id)
+            else:
+                bisect.insort(ids, message.id)
+
+        self._channels.move_to_end(message.channel_id)
+
+        if self.max_per_channel is not None:
+            while len(ids) > self.max_per_channel:
+                self._evict(self._messages[ids[0]])
+
+        while self._messages and self._full():
+            _, ids = next(iter(self._channels.items()))
+            self._evict(self._messages[ids[0]])
+
+    def history(
+            self,
+            channel_id: int,
+            *,
+            limit: Optional[int] = None,
+            before: Optional[SnowflakeOrDate] = None,
+            after: Optional[SnowflakeOrDate] = None) -> List[Message]:
+
+        """
+        The cached messages of a channel, without requesting
+
+        Like `bhaicord.HistoryIterator`, they are newest first, or oldest first if only ``after`` is given.
+        Finding them is O(log n) in the messages of the channel.
+
+        Args:
+            channel_id (int): The channel id
+            limit (typing.Optional[int]): The maximum of messages, None for all of them
+            before (typing.Optional[typing.Union[int, datetime.datetime]]): Messages before this id or date
+            after (typing.Optional[typing.Union[int, datetime.datetime]]): Messages after this id or date
+        """
+        ids = self._channels.get(int(channel_id))
+
+        if not ids:
+            return []
+
+        self._expire(ids)
+
+        before_id = _to_snowflake(before)
+        after_id = _to_snowflake(after, high=True)
+
+        start = 0 if after_id is None else bisect.bisect_right(ids, after_id)
+        stop = len(ids) if before_id is None else bisect.bisect_left(ids, before_id)
+
+        if start >= stop:
+            return []
+
+        if after_id is not None and before_id is None:
+            selected = ids[start:stop if limit is None else min(stop, start + limit)]
+        else:
+            selected = ids[start if limit is None else max(start, stop - limit):stop][::-1]
+
+        return [self._messages[id_] for id_ in selected]
+
+    def _expire(self, ids: List[int]) -> int:
+        """Removes the messages of a channel older than max_age"""
+
+        if self.max_age is None:
+            return 0
+
+        count = bisect.bisect_left(ids, self._oldest())
+
+        if not count:
+            return 0
+
+        channel_id = self._messages[ids[0]].channel_id
+
+        for id_ in ids[:count]:
+            del self._messages[id_]
+            self._memory -= self._sizes.pop(id_, 0)
+
+        del ids[:count]
+
+        if not ids:
+            del self._channels[channel_id]
+
+        self._stats.evictions += count
+        return count
+
+    def expire(self) -> int:
+        """Removes the messages older than ``max_age``, returns how many were removed"""
+        return sum(self._expire(ids) for ids in list(self._channels.values()))
+
+    def entries(self) -> Iterator[Tuple[int, Message]]:
+        """The messages in memory, oldest first in every channel"""
+
+        return iter([
+            (id_, self._messages[id_])
+            for ids in self._channels.values()
+            for id_ in ids
+        ])
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self._channels.clear()
+        self._sizes.clear()
+        self._memory = 0
+
+        if self.storage is not None:
+            self.storage.clear(self.namespace)
+
+
+class ResponseCache:
+    """
+    Caches the json of GET routes for some seconds
+
+    404 responses are cached too, for ``negative_ttl`` seconds,
+    so an unknown id isn't requested again and again.
+
+    Args:
+        ttls (typing.Optional[typing.Dict[str, float]]):
+            Seconds to cache every route, ids are written ``{id}``,
+            e.g. ``{"/channels/{id}": 60}``. Routes not here aren't cached
+        negative_ttl (float): Seconds to cache a 404
+        maxsize (int): The maximum of responses, the least recently used is removed
+    """
+
+    default_ttls: Dict[str, float] = {
+        "/channels/{id}": 60.0,
+        "/guilds/{id}/roles": 60.0,
+        "/users/{id}": 300.0
+    }
+
+    # written route -> the cached urls it changes besides itself, filled with the ids of the url
+    default_writes: Dict[str, Tuple[str, ...]] = {
+        "/channels/{id}/permissions/{id}": ("/channels/{0}", ),
+        "/guilds/{id}/roles/{id}": ("/guilds/{0}/roles", )
+    }
+
+    def __init__(
+            self,
+            ttls: Optional[Dict[str, float]] = None,
+            *,
+            negative_ttl: float = 10.0,
+            maxsize: int = 1000):
+
+        self.ttls: Dict[str, float] = dict(self.default_ttls if ttls is None else ttls)
+        self.writes: Dict[str, Tuple[str, ...]] = dict(self.default_writes)
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+
+        self._entries = LRUCache(maxsize)
+        # path -> (requests running, invalidations since the first started)
+        self._running: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """What the cache did, see `CacheStats`"""
+        return self._entries.stats
+
+    @staticmethod
+    def route(url: str) -> str:
+        """The route of an url, ``/channels/1234`` is ``/channels/{id}``"""
+        return _ID.sub("{id}", _key(url.split("?", 1)[0]))
+
+    def ttl(self, url: str) -> Optional[float]:
+        """Seconds the url is cached, None if it isn't"""
+        return self.ttls.get(ResponseCache.route(url))
+
+    def get(self, url: str) -> Any:
+        """
+        The cached data of the url
+
+        Return:
+            The data, ``MISSING`` if not cached
+
+        Raises:
+            bhaicord.NotFound: if the url answered 404 recently
+        """
+        data = self._entries.get(_key(url), MISSING)
+
+        if isinstance(data, _NotFound):
+            raise bhaicord.NotFound(404, data.data)
+
+        return data
+
+    def _put(self, url: str, ttl: float, data: Any) -> None:
+        self._entries.set(_key(url), data, ttl=ttl)
+
+    def begin(self, url: str) -> int:
+        """
+        Marks a request of the url as running, until `end`
+
+        Return:
+            int: The generation to give to `set`, an invalidation meanwhile changes it
+        """
+        path = _key(url.split("?", 1)[0])
+        running, generation = self._running.get(path, (0, 0))
+        self._running[path] = (running + 1, generation)
+
+        return generation
+
+    def end(self, url: str) -> None:
+        """The request marked by `begin` is done"""
+
+        path = _key(url.split("?", 1)[0])
+        running, generation = self._running[path]
+
+        if running == 1:
+            del self._running[path]
+        else:
+            self._running[path] = (running - 1, generation)
+
+    def _outdated(self, url: str, generation: Optional[int]) -> bool:
+        if generation is None:
+            return False
+
+        return self._running.get(_key(url.split("?", 1)[0]), (0, generation))[1] != generation
+
+    def set(self, url: str, data: Any, *, generation: Optional[int] = None) -> None:
+        """
+        Caches the data of the url, if its route is cached
+
+        Args:
+            url (str): The url
+            data (typing.Any): The json
+            generation (typing.Optional[int]): From `begin`, the data isn't cached
+                if the url was invalidated while it was requested
+        """
+        ttl = self.ttl(url)
+
+        if ttl and not self._outdated(url, generation):
+            self._put(url, ttl, data)
+
+    def set_not_found(self, url: str, data: Any = None, *, generation: Optional[int] = None) -> None:
+        """Remembers the url answered 404, if its route is cached, ``generation`` is as in `set`"""
+
+        if self.negative_ttl and self.ttl(url) is not None and not self._outdated(url, generation):
+            self._put(url, self.negative_ttl, _NotFound(data))
+
+    def invalidate(self, url: str) -> None:
+        """Removes the url from cache, what a running request of it answers isn't cached"""
+
+        path = _key(url.split("?", 1)[0])
+        self._entries.discard(path)
+
+        if path in self._running:
+            running, generation = self._running[path]
+            self._running[path] = (running, generation + 1)
+
+    def on_write(self, url: str) -> None:
+        """
+        Removes what a request changing the url made outdated
+
+        That's the url itself and the urls in `writes` for its route,
+        a message sent to ``/channels/{id}/messages`` doesn't change ``/channels/{id}``
+        """
+        path = _key(url.split("?", 1)[0])
+        self.invalidate(path)
+
+        for template in self.writes.get(ResponseCache.route(path), ()):
+            self.invalidate(template.format(*_ID.findall(path)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+        for path, (running, generation) in self._running.items():
+            self._running[path] = (running, generation + 1)
+
+    def on_event(self, event_name: str, data: DataType) -> None:
+        """Removes what a gateway event made outdated"""
+
+        event_name = event_name.upper()
+
+        if event_name in ("CHANNEL_CREATE", "CHANNEL_UPDATE", "CHANNEL_DELETE") or event_name.startswith("THREAD_"):
+            # CHANNEL_PINS_UPDATE and THREAD_LIST_SYNC have no id
+            channel_id = data.get("id")
+
+            if channel_id is not None:
+                self.invalidate(f"/channels/{channel_id}")
+
+        elif event_name.startswith("GUILD_ROLE_"):
+            self.invalidate(f"/guilds/{data['guild_id']}/roles")
+
+        elif event_name == "GUILD_DELETE":
+            self.invalidate(f"/guilds/{data['id']}/roles")
+
+        elif event_name in ("GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE", "GUILD_MEMBER_REMOVE"):
+            self.invalidate(f"/users/{data['user']['id']}")
+
+        elif event_name == "USER_UPDATE":
+            self.invalidate(f"/users/{data['id']}")
@@ -8,6 +8,7 @@ from typing import (
     Optional,
     Union,
     List,
+    Iterable,
     TYPE_CHECKING
 )
 import inspect
@@ -22,9 +23,35 @@ class Client:
 
     Args:
         intents (int): The intents for permissions
+        cache_size (int): The default maximum of entries of every cache
+        user_cache_size (typing.Optional[int]): The maximum of cached users, ``cache_size`` if None
+        message_cache_size (typing.Optional[int]): The maximum of cached messages, ``cache_size`` if None
+        cache_ttl (typing.Optional[float]): Seconds users are cached and messages are kept after being sent,
+            forever if None
+        compact_members (bool): Whether guilds keep their members in a `bhaicord.MemberStore`,
+            which takes much less memory for very large guilds
+        cache_policies (typing.Optional[typing.Dict[str, bhaicord.CachePolicy]]):
+            The policy of ``"users"``, ``"messages"``, ``"members"`` or ``"channels"``,
+            they replace the sizes and ttl above for their type
+        storage (typing.Optional[bhaicord.BaseStorage]):
+            Where the caches put what they evict, e.g. a `bhaicord.SQLiteStorage`
+        snapshot_path (typing.Optional[str]): A file the caches are saved to when the bot stops
+            and loaded from when it starts, see `bhaicord.save_snapshot`
     """
 
-    def __init__(self, intents: int, cache_size: int = 1500):
+    def __init__(
+            self,
+            intents: int,
+            cache_size: int = 1500,
+            *,
+            user_cache_size: Optional[int] = None,
+            message_cache_size: Optional[int] = None,
+            cache_ttl: Optional[float] = None,
+            compact_members: bool = False,
+            cache_policies: Optional[Dict[str, bhaicord.CachePolicy]] = None,
+            storage: Optional[bhaicord.BaseStorage] = None,
+            snapshot_path: Optional[str] = None):
+
         self.intents: int = intents
         self.cache_size = int(cache_size)
 
@@ -37,17 +64,55 @@ class Client:
         self.events: Dict[str, Dict[str, Any]] = {}
 
         # cache
-        self.user_cache: Dict[str, bhaicord.User.User] = {}
-        self.message_cache: Dict[str, bhaicord.Message] = {}
+        self.cache_policies: Dict[str, bhaicord.CachePolicy] = dict(cache_policies or {})
+
+        unknown = set(self.cache_policies) - bhaicord.cache.CACHE_TYPES
+
+        if unknown:
+            raise ValueError(f"unknown cache types: {', '.join(sorted(unknown))}")
+
+        self.cache_policies.setdefault("users", bhaicord.CachePolicy(
+            max_entries=self.cache_size if user_cache_size is None else user_cache_size,
+            max_age=cache_ttl
+        ))
+        self.cache_policies.setdefault("messages", bhaicord.CachePolicy(
+            max_entries=self.cache_size if message_cache_size is None else message_cache_size,
+            max_age=cache_ttl
+        ))
+
+        self._storage: Optional[bhaicord.BaseStorage] = storage
+        self.snapshot_path: Optional[str] = snapshot_path
+
+        self.user_cache: bhaicord.LRUCache = bhaicord.LRUCache.from_policy(
+            self.cache_policies["users"],
+            storage=storage,
+            namespace="users"
+        )
+        self.message_cache: bhaicord.MessageCache = bhaicord.MessageCache.from_policy(
+            self.cache_policies["messages"],
+            storage=storage,
+            namespace="messages"
+        )
+
+        # seconds fetch_user and fetch_message spend in the caches and in requests
+        self.fetch_latency: Dict[str, Dict[str, bhaicord.LatencyStats]] = {
+            kind: {"cache": bhaicord.LatencyStats(), "rest": bhaicord.LatencyStats()}
+            for kind in ("users", "messages")
+        }
+
+        # what the gateway sent
+        self.state: bhaicord.ConnectionState = bhaicord.ConnectionState(
+            compact_members=compact_members,
+            policies=self.cache_policies,
+            storage=storage
+        )
+        self.state.bind()
 
         self._listeners: Dict[str, Dict[str, Any]] = {}
         self._message_create_listener = None
 
         self.loop = None
 
-        # UNIMPLEMENTED
-        self._storage = None
-
     @staticmethod
     def __add_on(event_or_listener: str) -> str:
         """adds on_ if needed"""
@@ -129,6 +194,19 @@ class Client:
             for listener in self.events.get(name)["listeners"]:
                 task2 = asyncio.create_task(listener(obj))
 
+        self.http.cache.on_event(event_name, event_data)
+        parsed = self.state.parse(event_name, event_data)
+        message_obj = self._cache_messages(event_name, event_data)
+
+        # the cached objects are updated even without a listener
+        update_obj = None
+
+        if event_name.upper() == "MESSAGE_UPDATE":
+            update_obj = self._update_message(event_data)
+
+        elif event_name.upper() == "GUILD_MEMBER_UPDATE":
+            update_obj = bhaicord.MemberUpdateEvent(event_data, *(parsed or ()))
+
         func_name = Client.__add_on(event_name.lower())
 
         if func_name not in self.events:
@@ -145,7 +223,9 @@ class Client:
 
         if event_name.lower() == "message_create":
 
-            message_obj = bhaicord.Message(data=event_data)
+            if message_obj is None:
+                message_obj = bhaicord.Message(data=event_data)
+
             if asyncio.isfuture(self._message_create_listener):
                 try:
                     self._message_create_listener.set_result(message_obj)
@@ -158,7 +238,45 @@ class Client:
                 fun=f, data=message_obj
             )
 
+        if update_obj is not None:
+            f = self.events.get(func_name).get("event")
+
+            await call_event(
+                fun=f, data=update_obj
+            )
+
+    def _cache_messages(self, event_name: str, data: Dict[str, Any]) -> Optional[bhaicord.Message]:
+        """Keeps the message cache up to date, returns the message of MESSAGE_CREATE if it was cached"""
+
+        event_name = event_name.upper()
+
+        if event_name == "MESSAGE_CREATE" and self.cache_policies["messages"].enabled:
+            message = bhaicord.Message(data=data)
+            self.message_cache[message.id] = message
+            return message
+
+        if event_name == "MESSAGE_DELETE":
+            self.message_cache.discard(int(data["id"]))
+
+        elif event_name == "MESSAGE_DELETE_BULK":
+            for id_ in data["ids"]:
+                self.message_cache.discard(int(id_))
+
+        return None
+
+    def _update_message(self, data: Dict[str, Any]) -> bhaicord.MessageUpdateEvent:
+        """Updates the cached message in place with a MESSAGE_UPDATE"""
+
+        message = self.message_cache.get(int(data["id"]))
+
+        if message is None:
+            return bhaicord.MessageUpdateEvent(data)
+
+        return bhaicord.MessageUpdateEvent(data, message, message._update(data))
+
     async def login_http(self) -> None:
+        # the tasks of this client share the users of its state
+        self.state.bind()
         self.http.bot_token = self.bot_token
 
         await self.http.authenticate()
@@ -175,6 +293,9 @@ class Client:
 
         bhaicord.CurrentClient.client = self
 
+        if self.snapshot_path is not None:
+            self.load_snapshot()
+
         self.loop = asyncio.get_event_loop()
         task = self.loop.create_task(self.login_http())
         try:
@@ -184,11 +305,91 @@ class Client:
 
             if self.ws and self.ws.sock:
                 self.loop.run_until_complete(self.ws.sock.close())
+        finally:
+            # the sessions and the decoding threads
+            if not self.loop.is_closed():
+                self.loop.run_until_complete(self.http.close())
+                self.loop.run_until_complete(bhaicord.close_webhook_http())
+
+            if self.snapshot_path is not None:
+                self.save_snapshot()
+
+            if self._storage is not None:
+                self._storage.close()
+
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Saves the caches to a file, see `bhaicord.save_snapshot`
+
+        Args:
+            path (typing.Optional[str]): The file, ``snapshot_path`` if None
+        """
+        bhaicord.save_snapshot(self, path or self.snapshot_path)
+
+    def load_snapshot(self, path: Optional[str] = None) -> bool:
+        """
+        Loads the caches from a file before connecting, see `bhaicord.load_snapshot`
+
+        Args:
+            path (typing.Optional[str]): The file, ``snapshot_path`` if None
+
+        Return:
+            bool: Whether a snapshot was loaded
+        """
+        return bhaicord.load_snapshot(self, path or self.snapshot_path)
+
+    def cache_stats(self) -> Dict[str, bhaicord.CacheStats]:
+        """
+        What every cache did, see `bhaicord.CacheStats`
+
+        The members are summed over the guilds, ``"responses"`` is the cache of `bhaicord.HTTPClient`.
+        Caches of unbounded policies are dicts and only have a size.
+        The time fetching spends in the caches and in requests is in ``fetch_latency``
+
+        Return:
+            typing.Dict[str, bhaicord.CacheStats]: The stats of
+                ``"users"``, ``"messages"``, ``"members"``, ``"channels"`` and ``"responses"``
+        """
+        members = bhaicord.CacheStats()
+
+        for guild in self.state.guilds.values():
+            members += bhaicord.CacheStats.of(guild.members)
+
+        return {
+            "users": bhaicord.CacheStats.of(self.user_cache),
+            "messages": bhaicord.CacheStats.of(self.message_cache),
+            "members": members,
+            "channels": bhaicord.CacheStats.of(self.state.channels),
+            "responses": bhaicord.CacheStats.of(self.http.cache)
+        }
+
+    @property
+    def guilds(self) -> List[bhaicord.Guild]:
+        """The guilds the gateway sent"""
+        return list(self.state.guilds.values())
+
+    def get_guild(self, guild_id: int) -> Optional[bhaicord.Guild]:
+        """A guild the gateway sent by id, None if it's unknown or unavailable"""
+        return self.state.get_guild(guild_id)
 
     @staticmethod
-    async def fetch_user(user_id: int) -> bhaicord.User:
-        """Returns an user by id"""
-        return await bhaicord.User.from_id(user_id)
+    async def fetch_user(user_id: int, *, partial: bool = True) -> bhaicord.User:
+        """Returns an user by id, from the gateway state if it's there
+
+        Args:
+            user_id (int): The user id
+            partial (bool): Whether a user the gateway sent is good enough,
+                they have no banner or accent color, False requests them
+        """
+        return await bhaicord.User.from_id(user_id, partial=partial)
+
+    @staticmethod
+    async def fetch_users(user_ids: Iterable[int]) -> List[Union[bhaicord.User, Exception]]:
+        """Returns many users by id, in the same order
+
+        Failed ones are returned as their exception
+        """
+        return await bhaicord.fetch_users_base(user_ids)
 
     @staticmethod
     async def fetch_channel(channel_id: int) -> bhaicord.Channel:
@@ -208,6 +409,42 @@ class Client:
             message_id=message_id
         )
 
+    @staticmethod
+    async def fetch_messages(
+            channel_id: int,
+            message_ids: Iterable[int]) -> List[Union[bhaicord.Message, Exception]]:
+        """Returns many messages of a channel by id, in the same order
+
+        Failed ones are returned as their exception
+        """
+        return await bhaicord.fetch_messages_base(
+            channel_id=channel_id,
+            message_ids=message_ids
+        )
+
+    @staticmethod
+    async def broadcast(
+            channel_ids: Iterable[int],
+            content: Optional[str] = None,
+            embeds: Optional[Iterable[bhaicord.Embed]] = None,
+            *,
+            tts: Optional[bool] = None,
+            allowed_mentions: Optional[Dict[str, bool]] = None,
+            concurrency: int = 10) -> Dict[int, Union[bhaicord.Message, Exception]]:
+        """Sends the same message to many channels
+
+        Returns the message by channel id,
+        the channels it couldn't be sent to have the exception instead
+        """
+        return await bhaicord.broadcast_messages(
+            channel_ids,
+            content,
+            embeds,
+            tts=tts,
+            allowed_mentions=allowed_mentions,
+            concurrency=concurrency
+        )
+
     @property
     async def connections(self) -> List["bhaicord.Connection"]:
         """
@@ -218,14 +455,14 @@ class Client:
             "/users/@me/connections"
         )
 
-        return list(map(bhaicord.Connection, await rs.json()))
+        return await self.http.decode(rs, bhaicord.Connection)
 
     @property
     async def user(self) -> bhaicord.User:
         """Gets the bot user"""
 
         rs = await self.http.request("GET", "/users/@me")
-        return bhaicord.User(await rs.json())
+        return await self.http.decode(rs, bhaicord.User.from_data)
 
     async def wait_for(
             self, event_name: Optional[str] = None,
@@ -7,4 +7,12 @@ class SizeOutOfBounds(Exception):
 class ClientNotFound(Exception):
 
     def __init__(self):
-        super().__init__("Client instance wasn't found")
\ No newline at end of file
+        super().__init__("Client instance wasn't found")
+
+
+class PayloadTooLarge(Exception):
+
+    def __init__(self, size: int, limit: int):
+        self.size = size
+        self.limit = limit
+        super().__init__(f"the files weigh {size} bytes and the maximum is {limit} bytes")
@@ -1,7 +1,103 @@
-def determine_error(code: int):
-    """Raise a HTTP exception according to the given HTTP code"""
+from typing import Any, Dict, Optional, Type, Union
+
+__all__ = (
+    "HTTPError",
+    "BadRequest",
+    "Unauthorized",
+    "Forbidden",
+    "NotFound",
+    "MethodNotAllowed",
+    "TooManyRequests",
+    "ServerError",
+    "determine_error"
+)
+
+
+class HTTPError(Exception):
+    """A request to the discord API failed
+
+    Args:
+        status (int): The HTTP status
+        data (typing.Union[typing.Dict[str, typing.Any], str, None]):
+            The body of the response, discord sends a json with a ``code`` and a ``message``
+    """
+
+    def __init__(self, status: int, data: Optional[Union[Dict[str, Any], str]] = None):
+        self.status: int = status
+        self.data = data
+
+        if isinstance(data, dict):
+            self.code: int = data.get("code", 0)
+            self.text: str = data.get("message", "")
+        else:
+            self.code = 0
+            self.text = data or ""
+
+        super().__init__(f"{status} (error code: {self.code}): {self.text}")
+
+
+class BadRequest(HTTPError):
+    ...
+
+
+class Unauthorized(HTTPError):
+    ...
+
+
+class Forbidden(HTTPError):
+    ...
+
+
+class NotFound(HTTPError):
     ...
 
 
-class HTTPError:
-    ...
\ No newline at end of file
+class MethodNotAllowed(HTTPError):
+    ...
+
+
+class TooManyRequests(HTTPError):
+    """We are being rate limited
+
+    ``retry_after`` is the time in seconds to wait
+    and ``is_global`` whether the limit is for every route
+    """
+
+    def __init__(self, status: int, data: Optional[Union[Dict[str, Any], str]] = None):
+        super().__init__(status, data)
+
+        if not isinstance(data, dict):
+            data = {}
+
+        self.retry_after: float = float(data.get("retry_after", 0))
+        self.is_global: bool = data.get("global", False)
+
+
+class ServerError(HTTPError):
+    ...
+
+
+_errors: Dict[int, Type[HTTPError]] = {
+    400: BadRequest,
+    401: Unauthorized,
+    403: Forbidden,
+    404: NotFound,
+    405: MethodNotAllowed,
+    429: TooManyRequests
+}
+
+
+def determine_error(code: int, data: Optional[Union[Dict[str, Any], str]] = None):
+    """Raise a HTTP exception according to the given HTTP code
+
+    Args:
+        code (int): The HTTP status
+        data (typing.Union[typing.Dict[str, typing.Any], str, None]): The body of the response
+
+    Raises:
+        bhaicord.HTTPError: or the subclass matching ``code``
+    """
+    if code >= 500:
+        raise ServerError(code, data)
+
+    raise _errors.get(code, HTTPError)(code, data)
@@ -0,0 +1,47 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple
+)
+import bhaicord
+
+__all__: Tuple[str] = ("MemberUpdateEvent", )
+
+
+class MemberUpdateEvent:
+    """
+    A member of a guild changed, their roles, nickname, or their user
+
+    If the member is cached it's updated in place and ``changes`` has the old values.
+    The user is shared by every guild and message, what changed in it is in ``user_changes``
+
+    Example:
+        @client.event
+        async def on_guild_member_update(event):
+            if "role_ids" in event.changes:
+                print(event.member, event.changes["role_ids"], "->", event.member.role_ids)
+    """
+
+    def __init__(
+            self,
+            data: Dict[str, Any],
+            member: Optional["bhaicord.Member"] = None,
+            changes: Optional[Dict[str, Any]] = None,
+            user_changes: Optional[Dict[str, Any]] = None):
+
+        self.data = data
+        self.guild_id: int = int(data["guild_id"])
+        self.user_id: int = int(data["user"]["id"])
+
+        self.member: Optional["bhaicord.Member"] = member
+        """The member, None if the guild isn't known or members aren't cached"""
+
+        self.changes: Dict[str, Any] = changes or {}
+        """The attributes of the member that changed, with their old value"""
+
+        self.user_changes: Dict[str, Any] = user_changes or {}
+        """The attributes of the user that changed, with their old value"""
+
+    def __repr__(self) -> str:
+        return f"<MemberUpdateEvent guild_id={self.guild_id} user_id={self.user_id} changes={list(self.changes)}>"
@@ -0,0 +1,53 @@
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple
+)
+import bhaicord
+
+__all__: Tuple[str] = ("MessageUpdateEvent", )
+
+
+class MessageUpdateEvent:
+    """
+    A message was edited, or discord added embeds to it
+
+    The payload only has the fields that changed. If the message is cached it's updated in place,
+    so it's the same object as before, and ``changes`` has the old values.
+
+    Example:
+        @client.event
+        async def on_message_update(event):
+            if "content" in event.changes:
+                print(event.changes["content"], "->", event.message.content)
+    """
+
+    def __init__(
+            self,
+            data: Dict[str, Any],
+            message: Optional["bhaicord.Message"] = None,
+            changes: Optional[Dict[str, Any]] = None):
+
+        self.data = data
+        self.id: int = int(data["id"])
+        self.channel_id: int = int(data["channel_id"])
+        self.guild_id: Optional[int] = data.get("guild_id")
+
+        if self.guild_id is not None:
+            self.guild_id = int(self.guild_id)
+
+        self.message: Optional["bhaicord.Message"] = message
+        """The cached message, updated, None if it wasn't cached"""
+
+        self.changes: Dict[str, Any] = changes or {}
+        """The attributes of the message that changed, with their old value,
+        the data discord sent for the ones built lazily, like ``author`` or ``edited_timestamp``"""
+
+    def __repr__(self) -> str:
+        return f"<MessageUpdateEvent id={self.id} cached={self.cached} changes={list(self.changes)}>"
+
+    @property
+    def cached(self) -> bool:
+        """Whether the message was cached"""
+        return self.message is not None
@@ -7,7 +7,7 @@ class ReadyEvent:
     def __init__(self, data: Dict[str, Any]):
         self.data = data
         self.getaway_version: int = data["v"]
-        self.user: "bhaicord.User" = bhaicord.User(data.get("user"))
+        self.user: "bhaicord.User" = bhaicord.User.from_data(data.get("user"))
 
         self.guilds: List[int] = [int(guild["id"]) for guild in data["guilds"]]
 
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import gzip
+import json
+import asyncio
+import datetime
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple
+)
+
+import bhaicord
+from bhaicord.utils import DataType, time_snowflake
+from bhaicord.iterators import HistoryIterator, PAGE_SIZE
+from bhaicord.models.channel import ChannelType
+
+__all__: Tuple[str] = ("ChannelExporter", )
+
+# channels with messages in them
+MESSAGE_CHANNEL_TYPES = frozenset({
+    ChannelType.text.value,
+    ChannelType.voice.value,
+    ChannelType.guild_news.value,
+    ChannelType.guild_news_thread.value,
+    ChannelType.guild_public_thread.value,
+    ChannelType.guild_private_thread.value,
+    ChannelType.guild_stage_voice.value
+})
+
+
+def _append_lines(path: str, messages: List[DataType]) -> None:
+    """Appends the messages as json lines, every call adds a gzip member"""
+
+    data = "".join(json.dumps(message, separators=(",", ":")) + "\n" for message in messages)
+
+    with gzip.open(path, "ab") as fp:
+        fp.write(data.encode())
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Writes the file at once, a crash never leaves it half written"""
+
+    tmp = f"{path}.tmp"
+
+    with open(tmp, "w") as fp:
+        json.dump(data, fp)
+
+    os.replace(tmp, path)
+
+
+class ChannelExporter:
+    """Archives the messages of channels into gzipped json lines
+
+    The time range of every channel is split by snowflake into ``segments``,
+    fetched at the same time and written to their own file,
+    ``directory/<channel id>/<segment>.jsonl.gz``, newest message first.
+    Messages are written as discord sends them, no `Message` is built.
+
+    ``directory/<channel id>/checkpoint.json`` keeps how far every segment went,
+    exporting the channel again resumes from there.
+    A message may be written twice if the process dies between a page and its checkpoint.
+
+    Args:
+        directory (str): Where the files are written
+        segments (int): The segments every channel is split into
+        concurrency (int): The maximum of segments fetched at once
+        since (typing.Optional[datetime.datetime]): Ignores the messages before this date
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            *,
+            segments: int = 4,
+            concurrency: int = 8,
+            since: Optional[datetime.datetime] = None):
+
+        self.directory = directory
+        self.segments = max(1, segments)
+        self.since = since
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _channel_directory(self, channel_id: int) -> str:
+        path = os.path.join(self.directory, str(channel_id))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _split(self, channel_id: int, last_message_id: Optional[int]) -> List[Dict[str, Any]]:
+        """The segments of a channel, ``after`` and ``before`` are exclusive"""
+
+        # no message is older than its channel
+        low = channel_id - 1
+
+        if self.since is not None:
+            low = max(low, time_snowflake(self.since))
+
+        if last_message_id is not None:
+            high = last_message_id + 1
+        else:
+            high = time_snowflake(datetime.datetime.now(datetime.timezone.utc), high=True)
+
+        if high <= low:
+            return []
+
+        step = -(-(high - low) // self.segments)
+
+        return [
+            {"after": start, "before": min(start + step + 1, high), "cursor": None, "done": False}
+            for start in range(low, high - 1, step)
+        ]
+
+    async def export_channel(self, channel_id: int, last_message_id: Optional[int] = None) -> int:
+        """Exports a channel, or resumes its export
+
+        Args:
+            channel_id (int): The channel id
+            last_message_id (typing.Optional[int]):
+                The newest message, saves scanning up to now if known
+
+        Return:
+            int: The messages written now
+        """
+        channel_id = int(channel_id)
+        loop = asyncio.get_running_loop()
+
+        directory = self._channel_directory(channel_id)
+        checkpoint_path = os.path.join(directory, "checkpoint.json")
+
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as fp:
+                segments = json.load(fp)
+        else:
+            segments = self._split(channel_id, last_message_id)
+            await loop.run_in_executor(None, _write_json, checkpoint_path, segments)
+
+        lock = asyncio.Lock()
+
+        async def save() -> None:
+            async with lock:
+                await loop.run_in_executor(None, _write_json, checkpoint_path, segments)
+
+        async def export_segment(index: int, segment: Dict[str, Any]) -> int:
+            path = os.path.join(directory, f"{index:03d}.jsonl.gz")
+            written = 0
+
+            async with self._semaphore:
+                history = HistoryIterator(
+                    channel_id,
+                    limit=None,
+                    before=segment["cursor"] or segment["before"],
+                    after=segment["after"],
+                    raw=True
+                )
+                page: List[DataType] = []
+
+                async for message in history:
+                    page.append(message)
+
+                    if len(page) >= PAGE_SIZE:
+                        await loop.run_in_executor(None, _append_lines, path, page)
+                        written += len(page)
+                        segment["cursor"] = int(page[-1]["id"])
+                        page = []
+                        await save()
+
+                if page:
+                    await loop.run_in_executor(None, _append_lines, path, page)
+                    written += len(page)
+                    segment["cursor"] = int(page[-1]["id"])
+
+                segment["done"] = True
+                await save()
+
+            return written
+
+        written = await asyncio.gather(*(
+            export_segment(index, segment)
+            for index, segment in enumerate(segments)
+            if not segment["done"]
+        ))
+
+        return sum(written)
+
+    async def export_guild(self, guild_id: int) -> Dict[int, int]:
+        """Exports, or resumes, every channel with messages of a guild
+
+        Return:
+            typing.Dict[int, int]: The messages written now by channel id
+        """
+        client = bhaicord.CurrentClient.get_client()
+
+        rs = await client.http.request("GET", f"/guilds/{guild_id}/channels")
+        channels = [
+            channel for channel in await client.http.decode(rs)
+            if channel["type"] in MESSAGE_CHANNEL_TYPES
+        ]
+
+        written = await asyncio.gather(*(
+            self.export_channel(
+                int(channel["id"]),
+                bhaicord.make_optional(int, channel.get("last_message_id"))
+            )
+            for channel in channels
+        ))
+
+        return {int(channel["id"]): count for channel, count in zip(channels, written)}
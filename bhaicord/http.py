@@ -1,6 +1,11 @@
 import aiohttp
 
 import json
+import attr
+import uuid
+import random
+import inspect
+import asyncio
 import bhaicord
 
 from typing import (
@@ -9,18 +14,117 @@ from typing import (
     Any,
     List,
     Union,
-    Tuple
+    Tuple,
+    FrozenSet,
+    Callable,
+    Iterable,
+    Iterator,
+    Deque
 )
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-__all__: Tuple[str] = ("HTTPClient", )
+from bhaicord.utils import _T
+from bhaicord.ratelimit import RateLimiter
+from bhaicord.cache import ResponseCache, MISSING
 
+__all__: Tuple[str] = ("HTTPClient", "RetryPolicy")
 
-class Writer:
-    def __init__(self):
-        self.buffer = bytearray()
 
-    async def write(self, data):
-        self.buffer.extend(data)
+class FilePayload(aiohttp.payload.Payload):
+    """
+    Streams a `bhaicord.File` in chunks,
+    reading is done in the default executor so the loop isn't blocked
+    """
+
+    def __init__(self, file: "bhaicord.File", **kwargs):
+        super().__init__(
+            file,
+            content_type=file.content_type,
+            filename=file.filename,
+            **kwargs
+        )
+        self._size = file.size
+
+    async def write(self, writer) -> None:
+        loop = asyncio.get_running_loop()
+        chunks = self._value.iter_chunks()
+
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+
+                if chunk is None:
+                    break
+
+                await writer.write(chunk)
+        finally:
+            # closes the file if we opened it
+            chunks.close()
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self._value.content.decode(encoding, errors)
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@attr.define(kw_only=True)
+class RetryPolicy:
+    """How transient failures of a request are retried
+
+    Rate limits (429) are always retried after ``retry_after``,
+    server and connection errors only when the request is safe to send twice
+    """
+
+    max_retries: int = attr.field(default=5)
+    """How many times a request is retried before giving up"""
+
+    backoff_base: float = attr.field(default=0.5)
+    """Seconds to wait before the first retry, doubled on every retry"""
+
+    backoff_max: float = attr.field(default=30.0)
+    """The maximum seconds to wait between retries"""
+
+    retry_statuses: FrozenSet[int] = attr.field(default=frozenset({502, 503, 504}))
+    """The HTTP statuses considered transient"""
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before the given retry, with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def is_idempotent(method: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether sending the request twice has the same effect as sending it once
+
+        POST and PATCH requests only are if they carry an enforced nonce
+        """
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+
+        if not payload:
+            return False
+
+        return payload.get("nonce") is not None and bool(payload.get("enforce_nonce"))
+
+
+def _build(data: Any, model: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Maps the data into ``model``, if it's a list every item is mapped"""
+
+    if model is None:
+        return data
+
+    if isinstance(data, list):
+        return [model(item) for item in data]
+
+    return model(data)
+
+
+def _decode_body(body: bytes, model: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, Any]:
+    """Parses the json body and maps it into ``model``, returns the data and the model"""
+
+    data = json.loads(body)
+    return data, _build(data, model)
 
 
 class HTTPClient:
@@ -28,81 +132,227 @@ class HTTPClient:
     """
     To make requests and authenticate
     """
-    boundary = "boundary"
 
-    def __init__(self, bot_token: str):
+    # The default upload limit for bots, in bytes
+    max_upload_size: int = 25 * 1024 * 1024
+
+    # Responses bigger than this, in bytes, are decoded in a thread
+    # so the gateway keeps being read while they are parsed
+    decode_threshold: int = 64 * 1024
+
+    def __init__(self, bot_token: Optional[str], *, retry_policy: Optional[RetryPolicy] = None):
         self.bot_token = bot_token
         self.api_url = bhaicord.api_url
         self.session: Optional[aiohttp.ClientSession] = None
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.ratelimiter: RateLimiter = RateLimiter()
+        self.cache: ResponseCache = ResponseCache()
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     async def authenticate(self) -> None:
-        """Creates the session"""
+        """Creates the session
+
+        Without a bot token requests aren't authenticated, enough for webhooks
+        """
 
         # if self.session:
         # await self.session.close()
 
-        self.session = aiohttp.ClientSession(headers={
-            "Authorization": f"Bot {self.bot_token}",
+        headers = {
             "Accept": "application/json",
-            "User-Agent": f"DiscordBot ({bhaicord.__github__}, {bhaicord.__version__})"}
-        )
+            "User-Agent": f"DiscordBot ({bhaicord.__github__}, {bhaicord.__version__})"
+        }
+
+        if self.bot_token is not None:
+            headers["Authorization"] = f"Bot {self.bot_token}"
+
+        self.session = aiohttp.ClientSession(headers=headers)
+
+    async def close(self) -> None:
+        """Closes the session and the decoding threads"""
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def decode(
+            self,
+            rs: aiohttp.ClientResponse,
+            model: Optional[Callable[[Any], _T]] = None) -> Union[_T, List[_T], Any]:
+
+        """Reads the json of a response and maps it into a model
+
+        Bodies over ``decode_threshold`` bytes are parsed, and their models built,
+        in a thread pool instead of the event loop.
+
+        Args:
+            rs (aiohttp.ClientResponse): The response
+            model (typing.Optional[typing.Callable]):
+                Called with the data, or with every item if the data is a list
+
+        Return:
+            The model, a list of models, or the raw data if ``model`` is None
+        """
+        _, built = await self._decode(rs, model)
+        return built
+
+    async def _decode(
+            self,
+            rs: aiohttp.ClientResponse,
+            model: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, Any]:
+
+        """`decode`, also returning the data the model was built from"""
+
+        body = await rs.read()
+
+        if len(body) < self.decode_threshold:
+            return _decode_body(body, model)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="bhaicord-decode")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _decode_body, body, model)
+
+    @classmethod
+    def _attachments_payload(cls, data: Union[str, Dict], files: List["bhaicord.File"]) -> Dict[str, Any]:
+        """Checks the size of the files and adds them to the json payload"""
+
+        if isinstance(data, str):
+            data = json.loads(data)
+
+        size = sum(file.size or 0 for file in files)
+
+        if size > cls.max_upload_size:
+            raise bhaicord.PayloadTooLarge(size, cls.max_upload_size)
+
+        data = dict(data)
+        data["attachments"] = [file.to_dict(index) for index, file in enumerate(files)]
+
+        return data
+
+    @classmethod
+    def encode_multipart(
+            cls,
+            data: Union[str, Dict],
+            files: List["bhaicord.File"]) -> Tuple[str, Optional[int], Iterator[bytes]]:
+
+        """The blocking counterpart of `multipart_handler`, for code without a loop
+
+        Args:
+            data (typing.Union[str, Dict]): The json payload
+            files (List[cordic.File]): List of file objects
+        Raises:
+            bhaicord.PayloadTooLarge: if the files exceed ``max_upload_size``
+        Return:
+            typing.Tuple[str, typing.Optional[int], typing.Iterator[bytes]]:
+                The content type, the length if known and the body in chunks
+        """
+        data = cls._attachments_payload(data, files)
+        boundary = uuid.uuid4().hex
+
+        payload_json = json.dumps(data).encode()
+        heads = [
+            (
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="payload_json"\r\n'
+                f'Content-Type: application/json\r\n\r\n'
+            ).encode()
+        ]
+
+        for index, file in enumerate(files):
+            filename = file.filename.replace('"', "%22")
+            heads.append((
+                f'\r\n--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="files[{index}]"; filename="{filename}"\r\n'
+                f'Content-Type: {file.content_type}\r\n\r\n'
+            ).encode())
+
+        tail = f'\r\n--{boundary}--\r\n'.encode()
+
+        sizes = [file.size for file in files]
+        length = None
+
+        if None not in sizes:
+            length = sum(map(len, heads)) + len(payload_json) + sum(sizes) + len(tail)
+
+        def chunks() -> Iterator[bytes]:
+            yield heads[0]
+            yield payload_json
+
+            for head, file in zip(heads[1:], files):
+                yield head
+                yield from file.iter_chunks()
+
+            yield tail
+
+        return f"multipart/form-data; boundary={boundary}", length, chunks()
 
     @classmethod
-    async def multipart_handler(
+    def multipart_handler(
             cls,
             data: Union[str, Dict],
             files: List["bhaicord.File"]) -> "aiohttp.MultipartWriter":
 
         """Creates the multipart form-data
 
+        Nothing is serialised here, the files are streamed
+        by aiohttp once the request is sent
+
         Args:
             data (typing.Union[str, Dict]): The json payload
             files (List[cordic.File]): List of file objects
+        Raises:
+            bhaicord.PayloadTooLarge: if the files exceed ``max_upload_size``
         Return:
             aiohttp.MultipartWriter
 
         """
 
-        if isinstance(data, str):
-            data = json.load(data)
-
-        data["attachments"]: list = []
-        writer = Writer()
-
-        with aiohttp.MultipartWriter(boundary=cls.boundary) as mpwriter:
-
-            for index, file in enumerate(files):
-                data["attachments"].append(file.to_dict(index))
+        data = cls._attachments_payload(data, files)
 
-            mpwriter.append_json(data, headers={
-                "Content-Disposition": "form-data; name=\"payload_json\"",
-                "Content-Type": "application/json"
-            })
-            # loop through all files
+        mpwriter = aiohttp.MultipartWriter("form-data")
 
-            for index, file in enumerate(files):
+        payload_json = aiohttp.JsonPayload(data)
+        payload_json.set_content_disposition("form-data", name="payload_json")
+        mpwriter.append_payload(payload_json)
 
-                mpwriter.append(
-                    file.content,
-                    headers={
-                        "Content-Disposition": f"form-data; name=\"files[{index}]\";"
-                                               f" filename=\"{file.filename}\"",
-                        "Content-Type": "application/text-plain"
-                    }
-                )
+        # loop through all files
+        for index, file in enumerate(files):
+            payload = FilePayload(file)
+            payload.set_content_disposition(
+                "form-data",
+                name=f"files[{index}]",
+                filename=file.filename
+            )
+            mpwriter.append_payload(payload)
 
-            await mpwriter.write(writer)
         return mpwriter
 
     @classmethod
     def request_handler(cls) -> Dict[str, Any]:
         """"""
 
+    @staticmethod
+    async def _error_data(rs: aiohttp.ClientResponse) -> Union[Dict[str, Any], str]:
+        """The body of a failed response, discord sends json most of the times"""
+
+        if rs.content_type == "application/json":
+            return await rs.json()
+
+        return await rs.text()
+
     async def request(
             self, method: str,
             url: str,
-            payload: Dict[str, Any] = None,
-            files: Optional[List["bhaicord.File"]] = None
+            payload: Union[Dict[str, Any], bytes] = None,
+            files: Optional[List["bhaicord.File"]] = None,
+            *,
+            idempotent: Optional[bool] = None
 
     ) -> Optional[aiohttp.ClientResponse]:
 
@@ -112,47 +362,224 @@ class HTTPClient:
         Arguments:
             method (str): HTTP valid method
             url (str): The endpoint
-            payload (typing.Dict[str, Any]):
-                A dict to send data (data or json) over the request
+            payload (typing.Union[typing.Dict[str, Any], bytes]):
+                A dict to send data (data or json) over the request,
+                or the json already encoded
 
             files (typing.Optional[cordic.File]):
                 A list of files
 
+            idempotent (typing.Optional[bool]):
+                Whether it's safe to send this request twice,
+                guessed by ``RetryPolicy.is_idempotent`` if None
+
+        Raises:
+            bhaicord.HTTPError: the error matching the status, once retries are exhausted
+            aiohttp.ClientConnectionError: if the connection failed and it wasn't safe to retry
+
         Return: Optional[aiohttp.ClientResponse]
 
         As the documentation says, if we add a file to the request
         "application/json" must be replaced by "multipart/form-data"
         """
-        # await self.authenticate()
+        if self.session is None:
+            await self.authenticate()
 
         if not url.startswith("/"):
             url = f"/{url}"
 
         endpoint = self.api_url + url
-        content_type = "application/json"
-
-        if files:
-            content_type = f'multipart/form-data; boundary="{self.boundary}"'
-            kwargs = {'data': await HTTPClient.multipart_handler(payload, files)}
-        else:
-            kwargs = {'json': payload} if payload else {}
-            # we avoid sending an empty dictionary which would cause an error
-
-        rs = await self.session.request(
-            method, endpoint, **kwargs,
-            headers={
-                "Content-Type": content_type
-            }
-        )
-        # no content, we can't parse it to json
-        if rs.status == 204:
-            return
-
-        if not rs.ok:
-            # not done yet
-            # cordic.errors.determine_error(code=rs.status)
-            raise Exception('HTTP error')
-        # print(rs.status)
-        # await self.session.close()
-        # for unknown reasons, closing this session gives an error lol
-        return rs
+        policy = self.retry_policy
+
+        if idempotent is None:
+            # an encoded body can't be looked into, pass idempotent for those
+            idempotent = not isinstance(payload, bytes) and policy.is_idempotent(method, payload)
+
+        if method.upper() != "GET":
+            # what we change can't be served from cache anymore
+            self.cache.on_write(url)
+
+        attempt = 0
+
+        while True:
+            content_type = "application/json"
+
+            if files:
+                # made for every attempt, the files can only be streamed once per writer
+                mpwriter = HTTPClient.multipart_handler(payload, files)
+                content_type = mpwriter.content_type
+                kwargs = {'data': mpwriter}
+            elif isinstance(payload, bytes):
+                kwargs = {'data': payload}
+            else:
+                kwargs = {'json': payload} if payload else {}
+                # we avoid sending an empty dictionary which would cause an error
+
+            await self.ratelimiter.acquire(method, url)
+
+            try:
+                rs = await self.session.request(
+                    method, endpoint, **kwargs,
+                    headers={
+                        "Content-Type": content_type
+                    }
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                # if we couldn't even connect, discord never received the request
+                retry = idempotent or isinstance(error, aiohttp.ClientConnectorError)
+
+                if not retry or attempt >= policy.max_retries:
+                    raise
+
+                delay = policy.backoff(attempt)
+            else:
+                self.ratelimiter.update(method, url, rs.headers)
+
+                # no content, we can't parse it to json
+                if rs.status == 204:
+                    return
+
+                if rs.ok:
+                    return rs
+
+                data = await HTTPClient._error_data(rs)
+
+                if rs.status == 429 and attempt < policy.max_retries:
+                    # a rate limited request wasn't processed, always safe
+                    if isinstance(data, dict) and "retry_after" in data:
+                        delay = float(data["retry_after"])
+                    else:
+                        delay = float(rs.headers.get("Retry-After", policy.backoff(attempt)))
+
+                    if isinstance(data, dict) and data.get("global"):
+                        self.ratelimiter.set_global(delay)
+
+                elif rs.status in policy.retry_statuses and idempotent and attempt < policy.max_retries:
+                    delay = policy.backoff(attempt)
+
+                else:
+                    bhaicord.determine_error(rs.status, data)
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(
+            self,
+            url: str,
+            model: Optional[Callable[[Any], _T]] = None,
+            *,
+            cached_model: Optional[Callable[[Any], _T]] = None) -> Union[_T, List[_T], Any]:
+
+        """A GET request through the response cache, see `ResponseCache`
+
+        What the url answers isn't cached if a gateway event invalidated it meanwhile.
+
+        Args:
+            url (str): The endpoint
+            model (typing.Optional[typing.Callable]): Passed to `decode`
+            cached_model (typing.Optional[typing.Callable]): Used instead of ``model`` for cached data,
+                which can be older than what ``model`` updates, e.g. `bhaicord.User.from_cached_data`
+
+        Raises:
+            bhaicord.NotFound: also when the url answered 404 recently
+        """
+        data = self.cache.get(url)
+
+        if data is not MISSING:
+            return _build(data, model if cached_model is None else cached_model)
+
+        generation = self.cache.begin(url)
+
+        try:
+            try:
+                rs = await self.request("GET", url)
+            except bhaicord.NotFound as error:
+                self.cache.set_not_found(url, error.data, generation=generation)
+                raise
+
+            if rs is None:
+                data, built = None, _build(None, model)
+            else:
+                data, built = await self._decode(rs, model)
+
+            self.cache.set(url, data, generation=generation)
+        finally:
+            self.cache.end(url)
+
+        return built
+
+    async def batch(
+            self,
+            requests: Iterable[Tuple[Any, ...]],
+            model: Optional[Callable[[Any], _T]] = None,
+            *,
+            concurrency: int = 10,
+            idempotent: Optional[bool] = None,
+            cached_model: Optional[Callable[[Any], _T]] = None,
+            on_result: Optional[Callable[[int, Any], Any]] = None) -> List[Union[_T, Any, Exception]]:
+
+        """Runs many requests at once
+
+        Requests are grouped by rate limit bucket,
+        a bucket out of budget waits without holding back the others.
+        GET requests go through `get`, so the response cache and its 404s are used
+
+        Args:
+            requests (typing.Iterable[typing.Tuple]):
+                ``(method, url)`` or ``(method, url, payload)`` tuples
+            model (typing.Optional[typing.Callable]): Passed to `decode` for every response
+            concurrency (int): The maximum of requests in flight
+            idempotent (typing.Optional[bool]): Passed to `request` for every request
+            cached_model (typing.Optional[typing.Callable]): Passed to `get` for every GET
+            on_result (typing.Optional[typing.Callable]):
+                Called with the index and the result of every request once it's done,
+                it can be a coroutine function
+
+        Return:
+            The results in the same order as the requests,
+            a failed request has its exception instead
+        """
+        requests = [tuple(request) for request in requests]
+        results: List[Any] = [None] * len(requests)
+        groups: Dict[str, Deque[int]] = {}
+
+        for index, (method, url, *_) in enumerate(requests):
+            groups.setdefault(self.ratelimiter.bucket_key(method, url), deque()).append(index)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int) -> None:
+            method, url, *payload = requests[index]
+
+            try:
+                if method.upper() == "GET" and not payload:
+                    results[index] = await self.get(url, model, cached_model=cached_model)
+                else:
+                    rs = await self.request(method, url, *payload, idempotent=idempotent)
+                    results[index] = None if rs is None else await self.decode(rs, model)
+            except Exception as error:
+                results[index] = error
+
+            if on_result is not None:
+                rs = on_result(index, results[index])
+
+                if inspect.isawaitable(rs):
+                    await rs
+
+        async def worker(queue: Deque[int]) -> None:
+            while queue:
+                index = queue.popleft()
+
+                # waits for the bucket before taking a slot
+                await self.ratelimiter.get_bucket(*requests[index][:2]).wait()
+
+                async with semaphore:
+                    await run(index)
+
+        await asyncio.gather(*(
+            worker(queue)
+            for queue in groups.values()
+            for _ in range(min(concurrency, len(queue)))
+        ))
+
+        return results
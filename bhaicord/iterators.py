@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+
+from collections import deque
+from urllib.parse import urlencode
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+import bhaicord
+from bhaicord.utils import DataType, time_snowflake
+
+__all__: Tuple[str] = ("HistoryIterator", )
+
+SnowflakeOrDate = Union[int, str, datetime.datetime]
+
+# the maximum of messages discord gives per request
+PAGE_SIZE = 100
+
+
+def _to_snowflake(value: Optional[SnowflakeOrDate], *, high: bool = False) -> Optional[int]:
+    if value is None:
+        return None
+
+    if isinstance(value, datetime.datetime):
+        return time_snowflake(value, high=high)
+
+    return int(value)
+
+
+async def _get_page(
+        http: bhaicord.HTTPClient,
+        channel_id: int,
+        params: Dict[str, Any]) -> Tuple[Dict[str, Any], List[DataType]]:
+
+    rs = await http.request("GET", f"/channels/{channel_id}/messages?{urlencode(params)}")
+    return params, (await http.decode(rs) if rs is not None else None) or []
+
+
+class HistoryIterator:
+    """Iterates the messages of a channel, page by page
+
+    While a page is being consumed the next one is already requested,
+    so the consumer rarely waits for the API.
+    Messages are yielded newest first, or oldest first if only ``after`` is given.
+
+    Args:
+        channel_id (int): The channel id
+        limit (typing.Optional[int]): The maximum of messages, None for all of them
+        before (typing.Optional[typing.Union[int, datetime.datetime]]): Messages before this id or date
+        after (typing.Optional[typing.Union[int, datetime.datetime]]): Messages after this id or date
+        around (typing.Optional[typing.Union[int, datetime.datetime]]):
+            Messages around this id or date, at most 100
+        cache (bool): Whether to add the messages to the message cache
+        raw (bool): Whether to yield the dictionaries discord sends instead of `Message` objects
+
+    Note:
+        When the loop is left early the page being requested is cancelled
+        once the iterator is garbage collected, `aclose` cancels it at once
+
+    Example:
+        async for message in channel.history(limit=500):
+            print(message.content)
+    """
+
+    def __init__(
+            self,
+            channel_id: int,
+            *,
+            limit: Optional[int] = 100,
+            before: Optional[SnowflakeOrDate] = None,
+            after: Optional[SnowflakeOrDate] = None,
+            around: Optional[SnowflakeOrDate] = None,
+            cache: bool = False,
+            raw: bool = False):
+
+        if around is not None and (before is not None or after is not None):
+            raise Exception('around cannot be used with before or after')
+
+        self.channel_id = int(channel_id)
+        self.remaining = limit
+        self.before = _to_snowflake(before)
+        self.after = _to_snowflake(after, high=True)
+        self.around = _to_snowflake(around)
+        self.cache = cache
+        self.raw = raw
+
+        if self.around is not None and (self.remaining is None or self.remaining > PAGE_SIZE):
+            self.remaining = PAGE_SIZE
+
+        # oldest first only when going forward from ``after``
+        self.oldest_first = self.after is not None and self.before is None
+
+        self._client = bhaicord.CurrentClient.get_client()
+        self._page: Deque[DataType] = deque()
+        self._next: Optional[asyncio.Future] = None
+        self._started = False
+        self._done = False
+
+    def __aiter__(self) -> HistoryIterator:
+        return self
+
+    def _params(self) -> Optional[Dict[str, Any]]:
+        """The query of the next page, None if there are no more"""
+
+        if self._done or (self.remaining is not None and self.remaining <= 0):
+            return None
+
+        params: Dict[str, Any] = {
+            "limit": PAGE_SIZE if self.remaining is None else min(PAGE_SIZE, self.remaining)
+        }
+
+        if self.around is not None:
+            params["around"] = self.around
+        elif self.oldest_first:
+            params["after"] = self.after
+        elif self.before is not None:
+            params["before"] = self.before
+
+        return params
+
+    def _prefetch(self) -> None:
+        params = self._params()
+
+        if params is not None:
+            # the task doesn't hold the iterator, which can be collected while it runs
+            self._next = asyncio.ensure_future(_get_page(self._client.http, self.channel_id, params))
+
+    def _receive(self, params: Dict[str, Any], page: List[DataType]) -> None:
+        """Queues the page and requests the next one"""
+
+        # a page shorter than asked for is the last one
+        if len(page) < params["limit"] or self.around is not None:
+            self._done = True
+
+        page.sort(key=lambda message: int(message["id"]), reverse=not self.oldest_first)
+
+        if page:
+            if self.oldest_first:
+                self.after = int(page[-1]["id"])
+            else:
+                self.before = int(page[-1]["id"])
+
+        if self.after is not None and not self.oldest_first and self.around is None:
+            # going back, until ``after`` is reached
+            kept = [message for message in page if int(message["id"]) > self.after]
+
+            if len(kept) < len(page):
+                self._done = True
+
+            page = kept
+
+        if self.remaining is not None:
+            page = page[:self.remaining]
+            self.remaining -= len(page)
+
+        self._page.extend(page)
+        self._prefetch()
+
+    async def __anext__(self) -> Union[bhaicord.Message, DataType]:
+
+        if not self._started:
+            self._started = True
+            self._prefetch()
+
+        while not self._page:
+            if self._next is None:
+                raise StopAsyncIteration
+
+            next_, self._next = self._next, None
+            self._receive(*await next_)
+
+        data = self._page.popleft()
+
+        if self.raw:
+            return data
+
+        message = bhaicord.Message(data)
+
+        if self.cache:
+            bhaicord.APIBase.message_base._cache_message(self._client, message)
+
+        return message
+
+    def _cancel(self) -> None:
+        next_, self._next = self._next, None
+        self._done = True
+
+        if next_ is None:
+            return
+
+        if not next_.done():
+            next_.cancel()
+        elif not next_.cancelled():
+            # nobody will read it, the error isn't logged as never retrieved
+            next_.exception()
+
+    async def aclose(self) -> None:
+        """Stops the iteration and cancels the page being requested"""
+        self._cancel()
+
+    def __del__(self) -> None:
+        try:
+            self._cancel()
+        except RuntimeError:
+            # the loop is closed already
+            pass
+
+    async def flatten(self) -> List[Union[bhaicord.Message, DataType]]:
+        """All the messages in a list"""
+        return [message async for message in self]
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import sys
+import math
+import datetime
+
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple
+)
+
+from bhaicord.utils import DataType
+from bhaicord.models.guild import Member
+
+__all__: Tuple[str] = ("MemberStore", )
+
+# the bits of the flags column
+DEAF = 1 << 0
+MUTE = 1 << 1
+PENDING = 1 << 2
+BOT = 1 << 3
+
+_NONE = math.nan
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+def _timestamp(value: Optional[str]) -> float:
+    if not value:
+        return _NONE
+
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def _isoformat(value: float) -> Optional[str]:
+    if math.isnan(value):
+        return None
+
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).isoformat()
+
+
+class MemberStore(Mapping):
+    """
+    The members of a guild stored by column instead of by object
+
+    Every field is a row of an array or a list, strings are interned and equal role lists
+    are the same tuple, so a member costs some bytes instead of two objects with a ``__dict__``.
+    Getting a member builds a `Member` from its row, changing it doesn't change the store,
+    the gateway events do through `add`, `update` and `remove`.
+
+    It's used for the members of a `Guild` when the client is made with ``compact_members=True``
+    """
+
+    def __init__(self):
+        self._index: Dict[int, int] = {}
+
+        self._ids = array("Q")
+        self._flags = array("B")
+        self._public_flags = array("L")
+        self._joined_at = array("d")
+        self._premium_since = array("d")
+
+        self._usernames: List[str] = []
+        self._discriminators: List[str] = []
+        self._avatars: List[Optional[str]] = []
+        self._nicks: List[Optional[str]] = []
+        self._guild_avatars: List[Optional[str]] = []
+        self._roles: List[Tuple[int, ...]] = []
+
+        # every role combination once
+        self._role_sets: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+    def __repr__(self) -> str:
+        return f"<MemberStore size={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._ids))
+
+    def __contains__(self, user_id: Any) -> bool:
+        return user_id in self._index
+
+    def __getitem__(self, user_id: int) -> Member:
+        return self._member(self._index[user_id])
+
+    def _role_set(self, roles: List[Any]) -> Tuple[int, ...]:
+        roles = tuple(sorted(int(role_id) for role_id in roles))
+        return self._role_sets.setdefault(roles, roles)
+
+    def _member(self, row: int) -> Member:
+        """Builds the member of a row"""
+
+        flags = self._flags[row]
+
+        return Member({
+            "user": {
+                "id": self._ids[row],
+                "username": self._usernames[row],
+                "discriminator": self._discriminators[row],
+                "avatar": self._avatars[row],
+                "bot": bool(flags & BOT),
+                "public_flags": self._public_flags[row]
+            },
+            "nick": self._nicks[row],
+            "avatar": self._guild_avatars[row],
+            "roles": [str(role_id) for role_id in self._roles[row]],
+            "joined_at": _isoformat(self._joined_at[row]),
+            "premium_since": _isoformat(self._premium_since[row]),
+            "deaf": bool(flags & DEAF),
+            "mute": bool(flags & MUTE),
+            "pending": bool(flags & PENDING)
+        })
+
+    def _write(self, row: int, data: DataType) -> None:
+        """Writes the fields the data has, the others are kept"""
+
+        user = data.get("user", {})
+
+        if "username" in user:
+            self._usernames[row] = sys.intern(user["username"])
+
+        if "discriminator" in user:
+            self._discriminators[row] = sys.intern(user["discriminator"])
+
+        if "avatar" in user:
+            self._avatars[row] = _intern(user["avatar"])
+
+        if "public_flags" in user:
+            self._public_flags[row] = user["public_flags"] or 0
+
+        if "nick" in data:
+            self._nicks[row] = _intern(data["nick"])
+
+        if "avatar" in data:
+            self._guild_avatars[row] = _intern(data["avatar"])
+
+        if "roles" in data:
+            self._roles[row] = self._role_set(data["roles"])
+
+        if "joined_at" in data:
+            self._joined_at[row] = _timestamp(data["joined_at"])
+
+        if "premium_since" in data:
+            self._premium_since[row] = _timestamp(data["premium_since"])
+
+        flags = self._flags[row]
+
+        for key, bit, source in (
+                ("deaf", DEAF, data),
+                ("mute", MUTE, data),
+                ("pending", PENDING, data),
+                ("bot", BOT, user)):
+
+            if key in source:
+                flags = flags | bit if source[key] else flags & ~bit
+
+        self._flags[row] = flags
+
+    def add(self, data: DataType) -> None:
+        """Adds or replaces a member from its payload"""
+
+        user_id = int(data["user"]["id"])
+        row = self._index.get(user_id)
+
+        if row is None:
+            row = len(self._ids)
+            self._index[user_id] = row
+
+            self._ids.append(user_id)
+            self._flags.append(0)
+            self._public_flags.append(0)
+            self._joined_at.append(_NONE)
+            self._premium_since.append(_NONE)
+            self._usernames.append("")
+            self._discriminators.append("0")
+            self._avatars.append(None)
+            self._nicks.append(None)
+            self._guild_avatars.append(None)
+            self._roles.append(())
+        else:
+            # a full payload, what isn't in it is reset
+            self._flags[row] = 0
+            self._nicks[row] = None
+            self._guild_avatars[row] = None
+            self._premium_since[row] = _NONE
+
+        self._write(row, data)
+
+    def update(self, data: DataType) -> None:
+        """Updates a member with a partial payload, it's added if it isn't stored"""
+
+        row = self._index.get(int(data["user"]["id"]))
+
+        if row is None:
+            self.add(data)
+        else:
+            self._write(row, data)
+
+    def remove(self, user_id: int) -> bool:
+        """Removes a member, returns whether it was stored
+
+        The last row is moved into its place, so removing is O(1)
+        """
+        row = self._index.pop(int(user_id), None)
+
+        if row is None:
+            return False
+
+        last = len(self._ids) - 1
+
+        for column in (
+                self._ids, self._flags, self._public_flags, self._joined_at,
+                self._premium_since, self._usernames, self._discriminators,
+                self._avatars, self._nicks, self._guild_avatars, self._roles):
+
+            if row != last:
+                column[row] = column[last]
+
+            column.pop()
+
+        if row != last:
+            self._index[self._ids[row]] = row
+
+        return True
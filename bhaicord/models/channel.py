@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import datetime
 from datetime import datetime
-from typing import Optional, Dict, Any, Iterable, List, Union
+from typing import Optional, Dict, Any, Iterable, List, Union, Callable, Tuple
 import attr
 import bhaicord
+from bhaicord.models.user import User
 from bhaicord.models.message import Message
+from bhaicord.models.schema import Field, constructor, snowflake, timestamp
 from bhaicord.models.embed import Embed
 from bhaicord.models.file import File
-from bhaicord.utils import simplify_attrs_from_dict, make_optional
+from bhaicord.utils import simplify_attrs_from_dict
 from enum import Enum
 
 
@@ -30,60 +32,73 @@ class ChannelType(Enum):
         return self.name
 
 
-class Channel:
-    def __init__(self, data: Dict[str, Any]):
-        self.id = data["id"]
-        self.type: ChannelType = ChannelType(data["type"])
-        self.guild_id: Optional[int] = make_optional(
-            int,
-            data.get("guild_id")
-        )
-        self.position: Optional[int] = data.get("position")
-        self.permission_overwrites = data.get("permission_overwrites", [])
-        self.name: Optional[str] = data.get("name")
-        self.topic: Optional[str] = data.get("topic")
-        self.nsfw: bool = data.get("nsfw", False)
-        self.last_message_id: Optional[int] = make_optional(
-            int,
-            data.get("last_message_id")
-        )
-        self.bitrate: Optional[int] = data.get("bitrate")
-        self.user_limit: Optional[int] = data.get("user_limit")
-        self.rate_limit_per_user: Optional[int] = data.get("rate_limit_per_user")
-        self.recipients: List[bhaicord.User.User] = list(map(bhaicord.User, data.get("recipients", [])))
-        self.icon: Optional[str] = data.get("icon")
-        self.owner_id: Optional[int] = make_optional(
-            int,
-            data.get("owner_id")
-        )
-        self.application_id: Optional[int] = make_optional(
-            int,
-            data.get("application_id")
-        )
-        self.parent_id: Optional[int] = make_optional(
-            int,
-            data.get("parent_id")
-        )
-        self.last_pin_timestamp: Optional[datetime] = make_optional(
-            datetime.fromisoformat,
-            data.get("last_pin_timestamp")
-        )
-        self.rtc_region: Optional[str] = data.get("rtc_region")
-
-        self.video_quality_mode: Optional[int] = data.get("video_quality_mode")
+CHANNEL_FIELDS: Tuple[Field, ...] = (
+    Field("id", required=True),
+    Field("type", convert=ChannelType, required=True),
+    snowflake("guild_id"),
+    Field("position"),
+    Field("permission_overwrites", default=[]),
+    Field("name"),
+    Field("topic"),
+    Field("nsfw", default=False),
+    snowflake("last_message_id"),
+    Field("bitrate"),
+    Field("user_limit"),
+    Field("rate_limit_per_user"),
+    Field("recipients", convert=User.from_data, each=True),
+    Field("icon"),
+    snowflake("owner_id"),
+    snowflake("application_id"),
+    snowflake("parent_id"),
+    timestamp("last_pin_timestamp"),
+    Field("rtc_region"),
+    Field("video_quality_mode"),
+    # -1 for default value when not found
+    Field("message_count", default=-1),
+    Field("member_count", default=-1),
+    # Thread, UNIMPLEMENTED
+    Field("thread_metadata"),
+    Field("thread_member"),
+    Field("thread_default_auto_archive_duration", key="default_auto_archive_duration", default=-1),
+    # PERMISSIONS UNIMPLEMENTED
+    Field("permissions"),
+    Field("flags", default=-1),
+)
 
-        # -1 for default value when not found
-        self.message_count: int = data.get("message_count", -1)
-        self.member_count: int = data.get("member_count", -1)
 
-        # Thread, UNIMPLEMENTED
-        self.thread_metadata = data.get("thread_metadata")
-        self.thread_member = data.get("thread_member")
-        self.thread_default_auto_archive_duration: int = data.get("default_auto_archive_duration", -1)
+class Channel:
 
-        # PERMISSIONS UNIMPLEMENTED
-        self.permissions = data.get("permissions")
-        self.flags: int = data.get("flags", -1)
+    __slots__ = (
+        "id",
+        "type",
+        "guild_id",
+        "position",
+        "permission_overwrites",
+        "name",
+        "topic",
+        "nsfw",
+        "last_message_id",
+        "bitrate",
+        "user_limit",
+        "rate_limit_per_user",
+        "recipients",
+        "icon",
+        "owner_id",
+        "application_id",
+        "parent_id",
+        "last_pin_timestamp",
+        "rtc_region",
+        "video_quality_mode",
+        "message_count",
+        "member_count",
+        "thread_metadata",
+        "thread_member",
+        "thread_default_auto_archive_duration",
+        "permissions",
+        "flags",
+    )
+
+    __init__ = constructor(CHANNEL_FIELDS)
 
     async def send(
             self,
@@ -108,6 +123,56 @@ class Channel:
             allowed_mentions=allowed_mentions
         )
 
+    def history(
+            self,
+            *,
+            limit: Optional[int] = 100,
+            before: Optional[Union[int, datetime]] = None,
+            after: Optional[Union[int, datetime]] = None,
+            around: Optional[Union[int, datetime]] = None,
+            cache: bool = False) -> bhaicord.HistoryIterator:
+
+        """Iterates the messages of this channel, see `bhaicord.HistoryIterator`
+
+        Example:
+            async for message in channel.history(limit=None, after=some_date):
+                ...
+        """
+        return bhaicord.HistoryIterator(
+            self.id,
+            limit=limit,
+            before=before,
+            after=after,
+            around=around,
+            cache=cache
+        )
+
+    async def purge(
+            self,
+            message_ids: Iterable[int],
+            *,
+            concurrency: int = 5,
+            progress: Optional[Callable[[int, int], Any]] = None) -> List[int]:
+
+        """Deletes the messages of this channel in as few requests as possible
+
+        Args:
+            message_ids (typing.Iterable[int]): The messages to delete
+            concurrency (int): The maximum of single deletes at once,
+                for messages older than 2 weeks
+            progress (typing.Optional[typing.Callable[[int, int], typing.Any]]):
+                Called with the messages done and the total
+
+        Return:
+            typing.List[int]: The ids deleted
+        """
+        return await bhaicord.purge_messages_base(
+            self.id,
+            message_ids,
+            concurrency=concurrency,
+            progress=progress
+        )
+
     @staticmethod
     async def from_id(channel_id: Union[int, str]) -> Channel:
         """Gets a channel by id"""
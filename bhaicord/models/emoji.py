@@ -8,9 +8,9 @@ from bhaicord.utils import (
     Utilities,
     _T,
     T,
-    DataType,
-    make_optional
+    DataType
 )
+from bhaicord.models.schema import Field, constructor, snowflake
 from bhaicord.models.user import User
 from bhaicord.models.role import Role
 import bhaicord
@@ -19,23 +19,28 @@ import bhaicord
 class Emoji:
     """Represents the emoji Object"""
 
-    def __init__(self, data: DataType):
-        self.id: Optional[str] = data.get("id")
+    __slots__ = (
+        "id",
+        "name",
+        "roles",
+        "user",
+        "require_colons",
+        "managed",
+        "animated",
+        "available",
+    )
 
-        if self.id:
-            self.id = int(self.id)
-
-        self.name: Optional[str] = data.get("name")
-
-        self.roles: List[Role] = [Role(d) for d in data.get("roles", [])]
-        self.user: Optional[User] = make_optional(
-            User,
-            data.get("user")
-        )
-        self.require_colons: bool = data.get("require_colons", False)
-        self.managed: bool = data.get("managed", False)
-        self.animated: bool = data.get("animated", False)
-        self.available: bool = data.get("available", True)
+    __init__ = constructor((
+        snowflake("id"),
+        Field("name"),
+        # the ids of the roles allowed to use it
+        Field("roles", convert=int, each=True),
+        Field("user", convert=User.from_data),
+        Field("require_colons", default=False),
+        Field("managed", default=False),
+        Field("animated", default=False),
+        Field("available", default=True),
+    ))
 
     def __str__(self) -> str:
         if self.animated:
@@ -55,10 +60,17 @@ class Emoji:
 class Reaction:
     """Represents a reaction Object"""
 
-    def __init__(self, reaction_data: DataType):
-        self.count: int = reaction_data.get("count", 1)
-        self.emoji: Optional[Emoji] = make_optional(Emoji, reaction_data.get("emoji"))
-        self.me: Optional[bool] = reaction_data.get("me")
+    __slots__ = (
+        "count",
+        "emoji",
+        "me",
+    )
+
+    __init__ = constructor((
+        Field("count", default=1),
+        Field("emoji", convert=Emoji),
+        Field("me"),
+    ))
 
     def __repr__(self) -> str:
         return f"<Reaction emoji={str(self.emoji)} " \
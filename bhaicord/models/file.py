@@ -1,17 +1,33 @@
-from typing import Union, Optional, Dict, Any, BinaryIO
+from typing import Union, Optional, Dict, Any, BinaryIO, Iterator
 
 import attr
 import io
+import os
+import mmap
+import mimetypes
+
+from bhaicord.models.schema import Field, constructor
+
+FileType = Union[str, bytes, "os.PathLike[str]", io.IOBase]
+
+# Chunk size used when streaming files, 64 KiB
+CHUNK_SIZE: int = 1 << 16
 
 
 @attr.s
 class File:
-    """Represents a file object"""
+    """Represents a file object
+
+    ``fp`` may be the content itself (``str`` or ``bytes``),
+    a path (``os.PathLike``) or a file object.
+    Paths and file objects are streamed in chunks when the request is sent,
+    they are never read into memory as a whole.
+    """
 
-    fp: Union[str, io.IOBase, io.TextIOBase] = attr.field(repr=False)
-    """The content"""
+    fp: FileType = attr.field(repr=False)
+    """The content, a path or a file object"""
 
-    filename: str = attr.field(default="no_file_name.txt")
+    filename: str = attr.field()
     """The filename"""
 
     description: Optional[str] = attr.field(
@@ -21,19 +37,113 @@ class File:
     )
     """The description for the attachment"""
 
-    content = attr.ib(init=False)
+    use_mmap: bool = attr.field(default=False, repr=False, kw_only=True)
+    """Whether to map paths into memory instead of reading them in chunks"""
+
+    _offset: Optional[int] = attr.field(init=False, repr=False)
+
+    @filename.default
+    def _set_filename(self) -> str:
+
+        if isinstance(self.fp, os.PathLike):
+            return os.path.basename(self.fp)
+
+        name = getattr(self.fp, "name", None)
 
-    @content.default
-    def _set_file_content(self) -> Union[str, bytes]:
+        if isinstance(name, str):
+            return os.path.basename(name)
 
-        if isinstance(self.fp, io.TextIOBase):
-            return "".join(self.fp.readlines())
+        return "no_file_name.txt"
+
+    @_offset.default
+    def _set_offset(self) -> Optional[int]:
+        # where the file object was given to us,
+        # so it can be sent more than once (retries)
+        if isinstance(self.fp, io.IOBase) and self.fp.seekable():
+            return self.fp.tell()
+
+    @property
+    def content_type(self) -> str:
+        """The mime type guessed from the filename"""
+
+        content_type, _ = mimetypes.guess_type(self.filename)
+
+        if content_type is None:
+            return "application/octet-stream"
+
+        return content_type
+
+    @property
+    def size(self) -> Optional[int]:
+        """The size in bytes, None if it cannot be known without reading it"""
 
         if isinstance(self.fp, str):
-            return self.fp
+            return len(self.fp.encode())
+
+        if isinstance(self.fp, bytes):
+            return len(self.fp)
+
+        if isinstance(self.fp, os.PathLike):
+            return os.stat(self.fp).st_size
 
-        if isinstance(self.fp, io.BufferedIOBase):
-            return self.fp.read()
+        if isinstance(self.fp, io.TextIOBase) or self._offset is None:
+            return
+
+        try:
+            return os.fstat(self.fp.fileno()).st_size - self._offset
+        except (OSError, io.UnsupportedOperation):
+            end = self.fp.seek(0, io.SEEK_END)
+            self.fp.seek(self._offset)
+            return end - self._offset
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields the content in chunks of bytes
+
+        Args:
+            chunk_size (int): The maximum size of every chunk
+
+        Note:
+            This is blocking, run it in an executor from async code
+        """
+
+        if isinstance(self.fp, (str, bytes)):
+            data = self.fp.encode() if isinstance(self.fp, str) else self.fp
+            yield data
+            return
+
+        if isinstance(self.fp, os.PathLike):
+            with open(self.fp, "rb") as fp:
+                if self.use_mmap and os.fstat(fp.fileno()).st_size:
+                    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        for start in range(0, len(mapped), chunk_size):
+                            yield mapped[start:start + chunk_size]
+                    return
+
+                yield from iter(lambda: fp.read(chunk_size), b"")
+            return
+
+        if self._offset is not None:
+            self.fp.seek(self._offset)
+
+        while True:
+            chunk = self.fp.read(chunk_size)
+
+            if not chunk:
+                break
+
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+
+            yield chunk
+
+    @property
+    def content(self) -> bytes:
+        """The whole content
+
+        Note:
+            This reads everything into memory, requests use ``iter_chunks``
+        """
+        return b"".join(self.iter_chunks())
 
     def to_dict(self, index: int) -> Dict[str, Any]:
         return {
@@ -45,17 +155,30 @@ class File:
 
 class Attachment:
 
-    def __init__(self, data: Dict[str, Any]):
-        self.id: str = data["id"]
-        self.filename: str = data["filename"]
-        self.description: Optional[str] = data.get("description")
-        self.content_type: Optional[str] = data.get("content_type")
-        self.size: Optional[int] = data.get("size")
-        self.url: Optional[str] = data.get("url")
-        self.proxy_url: Optional[str] = data.get("proxy_url")
-        self.height: Optional[int] = data.get("height")
-        self.width: Optional[int] = data.get("width")
-        # i don't know yet what ephemeral is
+    __slots__ = (
+        "id",
+        "filename",
+        "description",
+        "content_type",
+        "size",
+        "url",
+        "proxy_url",
+        "height",
+        "width",
+    )
+
+    # i don't know yet what ephemeral is
+    __init__ = constructor((
+        Field("id", required=True),
+        Field("filename", required=True),
+        Field("description"),
+        Field("content_type"),
+        Field("size"),
+        Field("url"),
+        Field("proxy_url"),
+        Field("height"),
+        Field("width"),
+    ))
 
     # def to_dict(self) -> Dict[str, Any]:
     # """Attachment to dict"""
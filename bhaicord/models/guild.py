@@ -5,6 +5,7 @@ from typing import (
     Any,
     Tuple,
     Union,
+    MutableMapping,
     TYPE_CHECKING
 
 )
@@ -12,51 +13,285 @@ from typing import (
 import datetime
 from datetime import datetime
 
+import bhaicord
 from bhaicord.models.user import User
-from bhaicord.utils import make_optional
+from bhaicord.models.role import Role
+from bhaicord.models.emoji import Emoji
+from bhaicord.models.channel import Channel
+from bhaicord.models.schema import Field, constructor, snowflake, timestamp, updater
 
-# __all__: Tuple[str] = (
-# "Member",
-# "PartialGuild",
-# "Guild"
-# )
+__all__: Tuple[str] = (
+    "Member",
+    "PartialGuild",
+    "Guild"
+)
 
 
 T = Dict[str, Any]
 
 
+MEMBER_FIELDS: Tuple[Field, ...] = (
+    Field("_user", key="user", convert=User.from_data),
+    Field("nick"),
+    Field("guild_avatar_hash", key="avatar"),
+    Field("role_ids", key="roles", default=[]),
+    timestamp("premium_since"),
+    timestamp("joined_at", required=True),
+    Field("deaf"),
+    Field("mute"),
+    Field("pending"),
+    Field("permissions"),
+)
+
+
 class Member:
-    def __init__(self, data: T):
-        self._user: User = make_optional(
-            User,
-            data.get("user")
+
+    __slots__ = (
+        "_user",
+        "nick",
+        "guild_avatar_hash",
+        "role_ids",
+        "joined_at",
+        "deaf",
+        "mute",
+        "pending",
+        "permissions",
+        "premium_since",
+    )
+
+    __init__ = constructor(MEMBER_FIELDS)
+
+    # GUILD_MEMBER_UPDATE, the user is updated in place by `User.from_data`
+    _update = updater(MEMBER_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"<Member id={self.id} nick={self.nick!r}>"
+
+    @property
+    def user(self) -> Optional[User]:
+        """The user of this member"""
+        return self._user
+
+    @property
+    def id(self) -> Optional[int]:
+        """The user id"""
+        return self._user.id if self._user else None
+
+    @property
+    def display_name(self) -> Optional[str]:
+        """The nickname if there's one, otherwise the username"""
+        return self.nick or (self._user.username if self._user else None)
+
+
+PARTIAL_GUILD_FIELDS: Tuple[Field, ...] = (
+    snowflake("id", required=True),
+    Field("name"),
+    Field("icon_hash", key="icon"),
+    Field("splash_hash", key="splash"),
+    Field("features", default=[]),
+    Field("unavailable", default=False),
+)
+
+
+GUILD_FIELDS: Tuple[Field, ...] = PARTIAL_GUILD_FIELDS + (
+    snowflake("owner_id"),
+    Field("description"),
+    Field("banner_hash", key="banner"),
+    snowflake("afk_channel_id"),
+    Field("afk_timeout"),
+    snowflake("system_channel_id"),
+    snowflake("rules_channel_id"),
+    Field("verification_level"),
+    Field("explicit_content_filter"),
+    Field("mfa_level"),
+    Field("premium_tier"),
+    Field("premium_subscription_count"),
+    Field("preferred_locale"),
+    Field("nsfw_level"),
+    Field("large", default=False),
+    Field("member_count", default=-1),
+)
+
+
+class PartialGuild:
+    """A guild with its basic fields only, as sent in invites or while it's unavailable"""
+
+    id: int
+    name: Optional[str]
+    icon_hash: Optional[str]
+    splash_hash: Optional[str]
+    features: List[str]
+    unavailable: bool
+
+    __init__ = constructor(PARTIAL_GUILD_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} id={self.id} name={self.name!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, PartialGuild) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def icon_url(self) -> Optional[str]:
+        """The icon url, None if it has no icon"""
+
+        if self.icon_hash is None:
+            return None
+
+        return f"{bhaicord.cdn_url}/icons/{self.id}/{bhaicord.utils.add_ext(self.icon_hash)}"
+
+    @property
+    def created_on(self) -> datetime:
+        """The date and time this guild was created"""
+        return bhaicord.utils.snowflake_to_date(self.id)
+
+
+class Guild(PartialGuild):
+    """
+    A guild as the gateway sends it in GUILD_CREATE
+
+    Its channels, roles, members and emojis are kept up to date by `bhaicord.ConnectionState`
+
+    Args:
+        data (typing.Dict[str, typing.Any]): The payload
+        compact_members (bool): Whether to keep the members in a `bhaicord.MemberStore`
+            instead of a dict of `Member`, for very large guilds.
+            Only a disabled ``member_policy`` applies to it
+        member_policy (typing.Optional[bhaicord.CachePolicy]): How many members to keep
+        channel_policy (typing.Optional[bhaicord.CachePolicy]): How many channels to keep
+        storage (typing.Optional[bhaicord.BaseStorage]): Where the bounded members and channels
+            go once evicted
+    """
+
+    def __init__(
+            self,
+            data: T,
+            *,
+            compact_members: bool = False,
+            member_policy: Optional["bhaicord.CachePolicy"] = None,
+            channel_policy: Optional["bhaicord.CachePolicy"] = None,
+            storage: Optional["bhaicord.BaseStorage"] = None):
+
+        self._set_fields(data)
+
+        member_policy = member_policy or bhaicord.CachePolicy()
+        channel_policy = channel_policy or bhaicord.CachePolicy()
+
+        self.channels: MutableMapping[int, Channel] = channel_policy.build(
+            storage=storage,
+            namespace=f"channels:{self.id}"
         )
+        self.roles: Dict[int, Role] = {}
+
+        if compact_members and member_policy.enabled:
+            self.members: Union[MutableMapping[int, Member], "bhaicord.MemberStore"] = bhaicord.MemberStore()
+        else:
+            self.members = member_policy.build(storage=storage, namespace=f"members:{self.id}")
+
+        self.emojis: Dict[int, Emoji] = {}
+
+        self._set_roles_and_emojis(data)
+
+        for channel in data.get("channels", []) + data.get("threads", []):
+            # channels in GUILD_CREATE don't have the guild id
+            channel = Channel({**channel, "guild_id": self.id})
+            self.channels[int(channel.id)] = channel
+
+        for member in data.get("members", []):
+            self._add_member(member)
+
+    _set_fields = constructor(GUILD_FIELDS, name="_set_fields")
+
+    _update_fields = updater(GUILD_FIELDS, name="_update_fields")
+
+    def _update(self, data: T) -> None:
+        """Updates the fields of a GUILD_CREATE or GUILD_UPDATE, the keys it doesn't have are kept"""
+
+        self._update_fields(data)
+
+        # an available guild is sent without the key
+        self.unavailable = data.get("unavailable", False)
 
-        self.nick: Optional[str] = data.get("nick")
-        self.guild_avatar_hash: Optional[str] = data.get("avatar")
-        self.role_ids: List[Any] = data.get("roles", [])
+        self._set_roles_and_emojis(data)
 
-        if data.get("premium_since"):
-            self.premium_since: Optional[datetime] = datetime.fromisoformat(data.get("premium_since"))
+    def _set_roles_and_emojis(self, data: T) -> None:
+
+        if "roles" in data:
+            self.roles = {int(role["id"]): Role(role) for role in data["roles"]}
+
+        if "emojis" in data:
+            self.emojis = {int(emoji["id"]): Emoji(emoji) for emoji in data["emojis"]}
+
+    def _add_member(self, data: T) -> None:
+        """Adds or replaces a member from its payload"""
+
+        if not isinstance(self.members, bhaicord.MemberStore):
+            member = Member(data)
+            self.members[member.id] = member
         else:
-            self.premium_since = None
+            self.members.add(data)
 
-        self.joined_at = datetime.fromisoformat(data["joined_at"])
+    def _update_member(self, data: T) -> Tuple[Optional[Member], Dict[str, Any]]:
+        """
+        Updates a member with a partial payload, it's added if it isn't cached
 
-        self.deaf: bool = data.get("deaf")
-        self.mute: bool = data.get("mute")
-        self.pending: bool = data.get("pending")
+        Return:
+            typing.Tuple[typing.Optional[Member], typing.Dict[str, typing.Any]]:
+                The member, None if members aren't cached, and the attributes that changed
+                with their old value, nothing changed for a member that wasn't cached
+        """
+        user_id = int(data["user"]["id"])
 
-        self.permissions: Optional[str] = data.get("permissions")
+        if not isinstance(self.members, bhaicord.MemberStore):
+            member = self.members.get(user_id)
 
+            if member is None:
+                self._add_member(data)
+                return self.members.get(user_id), {}
 
-class PartialGuild:
-    ...
+            # the cached member is kept
+            return member, member._update(data)
 
+        # a store has no objects to update, the member is built before and after
+        old = self.members.get(user_id)
+        self.members.update(data)
+        member = self.members[user_id]
 
-class Guild:
-    ...
+        if old is None:
+            return member, {}
+
+        return member, {
+            name: getattr(old, name) for name in Member.__slots__
+            if name != "_user" and getattr(old, name) != getattr(member, name)
+        }
+
+    def _remove_member(self, user_id: int) -> bool:
+        """Removes a member, returns whether it was cached"""
+
+        if not isinstance(self.members, bhaicord.MemberStore):
+            # not counted as lookups
+            cached = int(user_id) in self.members
+            self.members.discard(int(user_id))
+
+            return cached
+
+        return self.members.remove(user_id)
+
+    def get_channel(self, channel_id: int) -> Optional[Channel]:
+        """A channel of this guild by id"""
+        return self.channels.get(int(channel_id))
+
+    def get_role(self, role_id: int) -> Optional[Role]:
+        """A role of this guild by id"""
+        return self.roles.get(int(role_id))
+
+    def get_member(self, user_id: int) -> Optional[Member]:
+        """A cached member of this guild by id"""
+        return self.members.get(int(user_id))
 
 
 class Integration:
-    ...
\ No newline at end of file
+    ...
@@ -11,7 +11,8 @@ from typing import (
     Any,
     TYPE_CHECKING,
     List,
-    Iterable
+    Iterable,
+    Tuple
 )
 from pydantic import BaseModel
 
@@ -19,7 +20,9 @@ import bhaicord
 
 from bhaicord.models.embed import Embed
 from bhaicord.models.file import File
-from bhaicord.utils import DataType, make_optional
+from bhaicord.utils import DataType, lazy_slot
+from bhaicord.models.user import User
+from bhaicord.models.schema import Field, constructor, snowflake, updater
 from bhaicord.APIBase.image_base import make_application_image
 
 
@@ -66,15 +69,15 @@ class MessageActivityStructure:
 
     """Represents the Message Activity object"""
 
-    def __init__(self, data: DataType):
+    __slots__ = (
+        "activity_type",
+        "party_id",
+    )
 
-        self.activity_type: Optional[MessageActivityTypes] = make_optional(
-            MessageActivityTypes, data.get("activity_type")
-        )
-
-        self.party_id: Optional[int] = make_optional(
-            int, data.get("party_id")
-        )
+    __init__ = constructor((
+        Field("activity_type", convert=MessageActivityTypes, unknown_none=True),
+        snowflake("party_id"),
+    ))
 
 
 class MessageReference(BaseModel):
@@ -95,17 +98,17 @@ class MessageReference(BaseModel):
 class StickerItem:
     """Sticker Item object"""
 
-    def __init__(self, sticker_item_data: DataType):
-        self.id: Optional[int] = make_optional(
-            int,
-            sticker_item_data.get("id")
-        )
-        self.name: Optional[str] = sticker_item_data.get("name")
+    __slots__ = (
+        "id",
+        "name",
+        "format_type",
+    )
 
-        self.format_type: StickerFormatType = make_optional(
-            StickerFormatType,
-            sticker_item_data.get("format_type")
-        )
+    __init__ = constructor((
+        snowflake("id"),
+        Field("name"),
+        Field("format_type", convert=StickerFormatType, unknown_none=True),
+    ))
 
     def __repr__(self) -> str:
         return f"<StickerItem id={self.id} name={self.name!r} format_type={self.format_type}>"
@@ -123,42 +126,61 @@ class InteractionType(Enum):
 
 
 class MessageInteraction:
-    def __init__(self, data: DataType):
-        self.id: Optional[int] = make_optional(int, data.get("id"))
 
-        self.type: Optional[InteractionType] = make_optional(
-            InteractionType,
-            data.get("type")
-        )
-        self.name: Optional[str] = data.get("name")
+    __slots__ = (
+        "id",
+        "type",
+        "name",
+        "user",
+    )
 
-        self.user: Optional[bhaicord.User.User] = make_optional(
-            bhaicord.User.User,
-            data.get("user")
-        )
+    __init__ = constructor((
+        snowflake("id"),
+        Field("type", convert=InteractionType, unknown_none=True),
+        Field("name"),
+        Field("user", convert=User.from_data),
+    ))
 
 
 class Application:
-    def __init__(self, data: DataType):
-        self.id: int = int(data["id"])
-        self.name: str = data["name"]
-        self.icon: Optional[str] = data.get("icon")
-        self.description: str = data["description"]
-        self.rpc_origins: List[str] = data.get("rpc_origins", [])
-        self.bot_public: bool = data["bot_public"]
-        self.bot_require_code_grant: bool = data["bot_require_code_grant"]
-        self.terms_of_service_url: Optional[str] = data.get("terms_of_service_url")
-        self.privacy_policy_url: Optional[str] = data.get("privacy_policy_url")
-        self.owner = bhaicord.utils.make_optional(
-            bhaicord.User,
-            data.get("owner", {})
-        )
-        self.guild_id: Optional[str] = data.get("guild_id")
-        self.primary_sku_id: Optional[str] = data.get("primary_sku_id")
-        self.slug: Optional[str] = data.get("slug")
-        self.cover_image: Optional[str] = data.get("cover_image")
-        self.flags: Optional[int] = data.get("flags")
-        self.tags: List[str] = data.get("tags", [])
+
+    __slots__ = (
+        "id",
+        "name",
+        "icon",
+        "description",
+        "rpc_origins",
+        "bot_public",
+        "bot_require_code_grant",
+        "terms_of_service_url",
+        "privacy_policy_url",
+        "owner",
+        "guild_id",
+        "primary_sku_id",
+        "slug",
+        "cover_image",
+        "flags",
+        "tags",
+    )
+
+    __init__ = constructor((
+        snowflake("id", required=True),
+        Field("name", required=True),
+        Field("icon"),
+        Field("description", required=True),
+        Field("rpc_origins", default=[]),
+        Field("bot_public", required=True),
+        Field("bot_require_code_grant", required=True),
+        Field("terms_of_service_url"),
+        Field("privacy_policy_url"),
+        Field("owner", convert=User.from_data),
+        Field("guild_id"),
+        Field("primary_sku_id"),
+        Field("slug"),
+        Field("cover_image"),
+        Field("flags"),
+        Field("tags", default=[]),
+    ))
 
     @property
     def icon_url(self) -> Optional[str]:
@@ -171,88 +193,182 @@ class Application:
         return make_application_image(self.id, self.cover_image)
 
 
+MESSAGE_FIELDS: Tuple[Field, ...] = (
+    snowflake("id", required=True),
+    snowflake("channel_id", required=True),
+    snowflake("guild_id"),
+    Field("content", required=True),
+    Field("tts", required=True),
+    Field("mention_everyone", required=True),
+    Field("nonce"),
+    Field("pinned"),
+    Field("webhook_id"),
+    Field("type", convert=MessageTypes, required=True),
+    Field("application_id"),
+    Field("flags"),
+    Field("thread", default={}),
+    Field("components", default=[]),
+)
+
+# built on first access, see `Message`
+MESSAGE_LAZY_FIELDS: Tuple[str, ...] = (
+    "member",
+    "author",
+    "timestamp",
+    "edited_timestamp",
+    "mentions",
+    "mention_roles",
+    "mention_channels",
+    "attachments",
+    "embeds",
+    "reactions",
+    "activity",
+    "application",
+    "message_reference",
+    "referenced_message",
+    "interaction",
+    "sticker_items",
+)
+
+
 # @cordic.utils.simplify_attrs_from_dict(ignore=["id"])
 class Message:
 
     """
     Message Object
 
+    Only the plain fields are read when it's made, the others
+    (the author, member, mentions, embeds, attachments, timestamps, the referenced message...)
+    are built from the data discord sent the first time they are used, and kept.
     """
 
-    def __init__(self, data: Dict[str, Any]):
+    __slots__ = (
+        "_data",
+        "id",
+        "channel_id",
+        "guild_id",
+        "_member",
+        "_author",
+        "content",
+        "_timestamp",
+        "_edited_timestamp",
+        "tts",
+        "mention_everyone",
+        "_mentions",
+        "_mention_roles",
+        "_mention_channels",
+        "_attachments",
+        "_embeds",
+        "_reactions",
+        "nonce",
+        "pinned",
+        "webhook_id",
+        "type",
+        "_activity",
+        "_application",
+        "application_id",
+        "_message_reference",
+        "_referenced_message",
+        "flags",
+        "_interaction",
+        "thread",
+        "components",
+        "_sticker_items",
+    )
+
+    # the lazy fields are built from the data, kept in ``_data``
+    __init__ = constructor(MESSAGE_FIELDS, keep_data="_data")
+
+    # MESSAGE_UPDATE sends the fields that changed, with the ids
+    _update = updater(MESSAGE_FIELDS, keep_data="_data", lazy=MESSAGE_LAZY_FIELDS)
+
+    @lazy_slot
+    def member(self) -> Optional[bhaicord.Member]:
+        member = self._data.get("member")
+        return None if member is None else bhaicord.Member(member)
+
+    @lazy_slot
+    def author(self) -> bhaicord.User:
+        # the name of a webhook author is the one of this message
+        if self._data.get("webhook_id") is not None:
+            return User(self._data["author"])
+
+        # shared with every message of this author, the nickname is in ``member``,
+        # the data can be older than the shared user, which isn't updated with it
+        return User.from_cached_data(self._data["author"])
+
+    @lazy_slot
+    def timestamp(self) -> datetime:
+        return datetime.fromisoformat(self._data["timestamp"])
+
+    @lazy_slot
+    def edited_timestamp(self) -> Optional[datetime]:
+        edited_timestamp = self._data.get("edited_timestamp")
+        return None if edited_timestamp is None else datetime.fromisoformat(edited_timestamp)
+
+    @lazy_slot
+    def mentions(self) -> List[bhaicord.User]:
+        return list(map(User.from_cached_data, self._data.get("mentions", [])))
+
+    @lazy_slot
+    def mention_roles(self) -> List[int]:
+        return [int(id_) for id_ in self._data["mention_roles"]]
+
+    @lazy_slot
+    def mention_channels(self) -> List[bhaicord.ChannelMention]:
+        return list(map(bhaicord.ChannelMention, self._data.get("mention_channels", [])))
+
+    @lazy_slot
+    def attachments(self) -> List[bhaicord.Attachment]:
+        return list(map(bhaicord.Attachment, self._data.get("attachments", [])))
+
+    @lazy_slot
+    def embeds(self) -> List[bhaicord.Embed]:
+        return list(map(bhaicord.Embed.from_dict, self._data.get("embeds", [])))
+
+    @lazy_slot
+    def reactions(self) -> List[bhaicord.Reaction]:
+        return list(map(bhaicord.Reaction, self._data.get("reactions", [])))
+
+    @lazy_slot
+    def activity(self) -> Optional[MessageActivityStructure]:
+        return MessageActivityStructure(self._data.get("activity", {}))
+
+    @lazy_slot
+    def application(self) -> Optional[Application]:
+        application = self._data.get("application")
+        return None if application is None else Application(application)
 
-        self.id: int = int(data["id"])
-        self.channel_id: int = int(data["channel_id"])
-        self.guild_id: Optional[str] = data.get("guild_id")
+    @property
+    def app(self) -> Optional[Application]:
+        return self.application
 
-        if self.guild_id is not None:
-            self.guild_id = int(self.guild_id)
+    @lazy_slot
+    def message_reference(self) -> MessageReference:
+        return MessageReference(**self._data.get("message_reference", {}))
 
-        self.member: bhaicord.Member = bhaicord.make_optional(bhaicord.Member, data.get("member"))
-        self.author: bhaicord.User = bhaicord.User(
-            data["author"],
-            member_data=data.get("member")
-        )
-        self.content: str = data["content"]
-        self.timestamp: datetime = datetime.fromisoformat(data["timestamp"])
+    @lazy_slot
+    def referenced_message(self) -> Optional[Message]:
+        message = self._data.get("referenced_message")
+        return None if message is None else Message(message)
 
-        self.edited_timestamp: Optional[datetime] = bhaicord.make_optional(
-            datetime.fromisoformat, data.get("edited_timestamp")
-        )
-        self.tts: bool = data["tts"]
-
-        self.mention_everyone: bool = data["mention_everyone"]
-        self.mentions: List[bhaicord.User.User] = list(map(bhaicord.User, data.get("mentions", [])))
-        self.mention_roles: List[int] = [int(id_) for id_ in data["mention_roles"]]
-
-        self.mention_channels: List[bhaicord.ChannelMention] = list(map(
-            bhaicord.ChannelMention,
-            data.get("mention_channels", [])
-        ))
-        self.attachments: List[bhaicord.Attachment] = list(map(
-            bhaicord.Attachment,
-            data.get("attachments", [])
-        ))
-        self.embeds: List[bhaicord.Embed] = list(map(
-            bhaicord.Embed.from_dict,
-            data.get("embeds", [])
-        ))
-        self.reactions: List[bhaicord.Reaction] = list(map(
-            bhaicord.Reaction,
-            data.get("reactions", [])
-        ))
-
-        self.nonce: Optional[Union[int, str]] = data.get("nonce")
-        self.pinned: bool = data.get("pinned")
-        self.webhook_id: Optional[str] = data.get("webhook_id")
-        self.type: int = MessageTypes(data["type"])
-
-        self.activity: Optional[MessageActivityStructure] = MessageActivityStructure(data.get("activity", {}))
-
-        self.application: Optional[Application] = bhaicord.make_optional(
-            Application,
-            data.get("application")
-        )
-        self.app = self.application
-        self.application_id: Optional[int] = data.get("application_id")
+    @lazy_slot
+    def interaction(self) -> Optional[MessageInteraction]:
+        interaction = self._data.get("interaction")
+        return None if interaction is None else MessageInteraction(interaction)
 
-        self.message_reference: MessageReference = MessageReference(
-            **data.get("message_reference", {}))
+    @lazy_slot
+    def sticker_items(self) -> List[StickerItem]:
+        return list(map(StickerItem, self._data.get("sticker_items", [])))
 
-        self.referenced_message: Message = make_optional(
-            Message,
-            data.get("referenced_message")
-        )
-        self.flags: Optional[int] = data.get("flags")
+    @property
+    def display_name(self) -> str:
+        """The nickname of the author in this guild if there's one, otherwise the username"""
 
-        self.interaction: Optional[MessageInteraction] = make_optional(
-            MessageInteraction,
-            data.get("interaction")
-        )
+        if self.member is not None and self.member.nick:
+            return self.member.nick
 
-        self.thread = data.get("thread", {})
-        self.components = data.get("components", [])
-        self.sticker_items = list(map(StickerItem, data.get("sticker_items", [])))
+        return self.author.username
 
     @staticmethod
     async def from_id(channel_id: int, message_id: int) -> Message:
@@ -390,15 +506,15 @@ class Message:
             "POST",
             f"/channels/{channel_id}/messages/{message_id}/crosspost")
 
-        return Message(await rs.json())
+        return await client.http.decode(rs, Message)
 
     async def bulk_delete(
             self,
             message_ids: Iterable[int],
             channel_id: Optional[int] = None,
-            guild_id: Optional[int] = None) -> None:
+            guild_id: Optional[int] = None) -> List[int]:
 
-        """Bulk delete messages from 2 to 100
+        """Bulk delete messages, any amount of them
 
         Args:
             channel_id (typing.Optional[int]): the channel id.
@@ -406,29 +522,21 @@ class Message:
 
             message_ids (typing.Iterable[int]): All message ids to delete
 
-            guild_id (typing.Optional[int]): Guild id.
-                if it's None, it will take the guild id from this instance
+            guild_id (typing.Optional[int]): Guild id, not needed anymore
+
+        Return:
+            typing.List[int]: The ids deleted
 
         Note:
-            Messages older than 2 weeks will not be deleted
+            Messages are deleted 100 at a time,
+            the ones older than 2 weeks are deleted one by one,
+            see `bhaicord.purge_messages_base`
         """
         # if it's an empty list
         if not message_ids:
-            return
-
-        # avoids repetitive message ids, which will return 404 response
-        message_ids = list(set(message_ids))
+            return []
 
-        channel_id = channel_id or self.channel_id
-        guild_id = guild_id or self.guild_id
-
-        client = bhaicord.CurrentClient.get_client()
-
-        await client.http.request(
-            "POST",
-            f"/channels/{channel_id}/messages/bulk-delete",
-            {
-                "guild_id": guild_id,
-                "messages": list(message_ids)
-            }
-        )
\ No newline at end of file
+        return await bhaicord.purge_messages_base(
+            channel_id or self.channel_id,
+            message_ids
+        )
@@ -15,7 +15,7 @@ class ActivityTypes(enum.Enum):
     competing = 5
 
 
-@attr.s
+@attr.s(slots=True)
 class Activity:
     """Discord Activity
 
@@ -42,7 +42,7 @@ class Activity:
         }
 
 
-@attr.s
+@attr.s(slots=True)
 class Presence:
     """Discord presence"""
     activities: Optional[Iterable[Activity]] = attr.ib(default=None)
@@ -9,23 +9,24 @@ from typing import (
     List
 )
 import bhaicord
-from bhaicord.utils import simplify_attrs_from_dict, DataType, make_optional
+from bhaicord.utils import simplify_attrs_from_dict, DataType
+from bhaicord.models.schema import Field, constructor, snowflake
 from bhaicord.APIBase.image_base import make_role_icon
 
 
 class RoleTags:
 
-    def __init__(self, role_tags_data: DataType):
+    __slots__ = (
+        "bot_id",
+        "integration_id",
+        "_premium_subscriber",
+    )
 
-        self.bot_id: Optional[int] = make_optional(
-            int,
-            role_tags_data.get("id"))
-
-        self.integration_id: Optional[int] = make_optional(
-            int,
-            role_tags_data.get("id"))
-
-        self._premium_subscriber: Optional[int] = role_tags_data.get("premium_subscriber", 0)
+    __init__ = constructor((
+        snowflake("bot_id"),
+        snowflake("integration_id"),
+        Field("_premium_subscriber", key="premium_subscriber", default=0),
+    ))
 
     def is_premium_subscriber(self) -> bool:
         """Whether the role is premium subscriber"""
@@ -39,19 +40,35 @@ class RoleTags:
 
 class Role:
 
-    def __init__(self, role_data: DataType):
-        self.id: Optional[int] = role_data.get("id")
-        self.name: Optional[str] = role_data.get("name")
-        self.color: Optional[int] = role_data.get("color")
-        self.colour = self.color
-        self.hoist: Optional[bool] = role_data.get("hoist")
-        self._icon: Optional[str] = role_data.get("icon")
-        self.unicode_emoji: Optional[str] = role_data.get("unicode_emoji")
-        self.position: int = role_data.get("position", 0)
-        self._permissions: int = int(role_data.get("permissions", 0))
-        self.managed: bool = role_data.get("managed", False)
-        self.mentionable: bool = role_data.get("mentionable", False)
-        self.tags: Optional[RoleTags] = make_optional(RoleTags, role_data.get("tags"))
+    __slots__ = (
+        "id",
+        "name",
+        "color",
+        "colour",
+        "hoist",
+        "_icon",
+        "unicode_emoji",
+        "position",
+        "_permissions",
+        "managed",
+        "mentionable",
+        "tags",
+    )
+
+    __init__ = constructor((
+        Field("id"),
+        Field("name"),
+        Field("color"),
+        Field("colour", key="color"),
+        Field("hoist"),
+        Field("_icon", key="icon"),
+        Field("unicode_emoji"),
+        Field("position", default=0),
+        Field("_permissions", key="permissions", convert=int, default=0),
+        Field("managed", default=False),
+        Field("mentionable", default=False),
+        Field("tags", convert=RoleTags),
+    ))
 
     @property
     def permissions(self) -> int:
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import ast
+import enum
+import attr
+
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple
+)
+
+__all__: Tuple[str] = (
+    "Field",
+    "snowflake",
+    "timestamp",
+    "constructor",
+    "updater"
+)
+
+
+@attr.define(frozen=True)
+class Field:
+    """
+    How an attribute of a model is read from the data discord sends
+
+    Example:
+        CHANNEL_FIELDS = (
+            Field("id", required=True),
+            Field("type", convert=ChannelType, required=True),
+            snowflake("guild_id"),
+            Field("nsfw", default=False)
+        )
+    """
+
+    name: str
+    """The attribute"""
+
+    key: Optional[str] = attr.field(default=None, kw_only=True)
+    """The key in the data, ``name`` if None"""
+
+    convert: Optional[Callable[[Any], Any]] = attr.field(default=None, kw_only=True)
+    """Called with the value if it isn't None, an `enum.Enum` is looked up in a table"""
+
+    default: Any = attr.field(default=None, kw_only=True)
+    """The value if the key is missing, or if it's None and there's ``convert``, it must be a literal"""
+
+    required: bool = attr.field(default=False, kw_only=True)
+    """Whether the key is always sent, a KeyError is raised otherwise"""
+
+    each: bool = attr.field(default=False, kw_only=True)
+    """Whether the value is a list and ``convert`` is called with every item"""
+
+    unknown_none: bool = attr.field(default=False, kw_only=True)
+    """Whether a value that isn't in the ``convert`` enum is None instead of raising ValueError"""
+
+    @unknown_none.validator
+    def _check_unknown_none(self, _: attr.Attribute, value: bool) -> None:
+        if value and not (isinstance(self.convert, type) and issubclass(self.convert, enum.Enum)):
+            raise ValueError(f"unknown_none of {self.name!r} needs an enum convert")
+
+    @property
+    def data_key(self) -> str:
+        return self.name if self.key is None else self.key
+
+
+def snowflake(name: str, **kwargs: Any) -> Field:
+    """A field holding an id, converted to int"""
+    return Field(name, convert=int, **kwargs)
+
+
+def timestamp(name: str, **kwargs: Any) -> Field:
+    """A field holding an ISO 8601 date, converted to `datetime.datetime`"""
+    return Field(name, convert=datetime.fromisoformat, **kwargs)
+
+
+def _literal(value: Any) -> str:
+    source = repr(value)
+
+    # written in the code, so a list default is a new list every time
+    if ast.literal_eval(source) != value:
+        raise ValueError(f"the default {value!r} isn't a literal")
+
+    return source
+
+
+def _enum_table(cls: type) -> Dict[Any, enum.Enum]:
+    """value -> member, what ``cls(value)`` looks for"""
+    return {member.value: member for member in cls}
+
+
+def constructor(
+        fields: Iterable[Field],
+        *,
+        keep_data: Optional[str] = None,
+        name: str = "__init__") -> Callable[[Any, Dict[str, Any]], None]:
+
+    """
+    Generates the ``__init__`` of a model from its fields
+
+    The function is written once with an assignment per field,
+    ``None`` is checked with ``is None`` instead of catching exceptions around the conversion,
+    and enums are looked up in a dict built here instead of calling the enum for every object.
+    An unknown enum value still raises the ValueError of the enum, or is None with ``unknown_none``.
+
+    Args:
+        fields (typing.Iterable[bhaicord.models.schema.Field]): The fields
+        keep_data (typing.Optional[str]): An attribute to keep the data itself in
+        name (str): The name of the function
+
+    Example:
+        class Channel:
+            __slots__ = ("id", "type", "guild_id", "nsfw")
+
+            __init__ = constructor(CHANNEL_FIELDS)
+    """
+    namespace: Dict[str, Any] = {}
+    lines: List[str] = [f"def {name}(self, data):"]
+
+    if keep_data is not None:
+        lines.append(f"    self.{keep_data} = data")
+
+    for index, field in enumerate(fields):
+        key = repr(field.data_key)
+        target = f"self.{field.name}"
+
+        if field.convert is None:
+            if field.required:
+                lines.append(f"    {target} = data[{key}]")
+            else:
+                lines.append(f"    {target} = data.get({key}, {_literal(field.default)})")
+
+            continue
+
+        get = f"data[{key}]" if field.required else f"data.get({key})"
+
+        lines.append(f"    value = {get}")
+        lines.append(f"    {target} = {_converted(field, index, namespace, required=field.required)}")
+
+    return _compile(name, lines, namespace)
+
+
+def updater(
+        fields: Iterable[Field],
+        *,
+        keep_data: Optional[str] = None,
+        lazy: Iterable[str] = (),
+        name: str = "_update") -> Callable[[Any, Dict[str, Any]], Dict[str, Any]]:
+
+    """
+    Generates the ``_update`` of a model from its fields, for partial payloads
+
+    Only the keys the payload has are read, the other attributes are kept.
+    The function returns the attributes that changed with their old value.
+
+    Args:
+        fields (typing.Iterable[bhaicord.models.schema.Field]): The fields, as given to `constructor`
+        keep_data (typing.Optional[str]): The attribute keeping the data,
+            the payload is merged into a copy of it
+        lazy (typing.Iterable[str]): The `bhaicord.utils.lazy_slot` attributes, read from the key of
+            the same name, they are compared by their data and built again when used.
+            Their old value in the changes is the old data, they aren't built for it
+        name (str): The name of the function
+    """
+    namespace: Dict[str, Any] = {}
+    lines: List[str] = [f"def {name}(self, data):", "    changes = {}"]
+
+    for index, field in enumerate(fields):
+        key = repr(field.data_key)
+        target = f"self.{field.name}"
+
+        lines.append(f"    if {key} in data:")
+        lines.append(f"        value = data[{key}]")
+
+        if field.convert is not None:
+            lines.append(f"        value = {_converted(field, index, namespace, required=False)}")
+
+        lines.append(f"        if value != {target}:")
+        lines.append(f"            changes[{field.name!r}] = {target}")
+        lines.append(f"            {target} = value")
+
+    for attribute in lazy:
+        if keep_data is None:
+            raise ValueError("lazy attributes need keep_data")
+
+        key = repr(attribute)
+
+        # building the old value could update shared objects with the old data, like a user,
+        # the slot is emptied if it was built, and built again from the new data when read
+        lines.append(f"    if {key} in data and data[{key}] != self.{keep_data}.get({key}):")
+        lines.append(f"        changes[{key}] = self.{keep_data}.get({key})")
+        lines.append("        try:")
+        lines.append(f"            del self.{attribute}")
+        lines.append("        except AttributeError:")
+        lines.append("            pass")
+
+    if keep_data is not None:
+        lines.append(f"    self.{keep_data} = {{**self.{keep_data}, **data}}")
+
+    lines.append("    return changes")
+
+    return _compile(name, lines, namespace)
+
+
+def _converted(field: Field, index: int, namespace: Dict[str, Any], *, required: bool) -> str:
+    """The expression converting ``value`` for the field"""
+
+    convert = f"_convert_{index}"
+    namespace[convert] = field.convert
+
+    if isinstance(field.convert, type) and issubclass(field.convert, enum.Enum):
+        table = f"_table_{index}"
+        namespace[table] = _enum_table(field.convert)
+
+        if field.unknown_none:
+            get = f"{table}.get"
+            converted = f"[{get}(item) for item in value]" if field.each else f"{get}(value)"
+        elif field.each:
+            converted = f"[{table}[item] if item in {table} else {convert}(item) for item in value]"
+        else:
+            converted = f"{table}[value] if value in {table} else {convert}(value)"
+
+    elif field.each:
+        converted = f"list(map({convert}, value))"
+    else:
+        converted = f"{convert}(value)"
+
+    if required:
+        return converted
+
+    default = "[]" if field.each and field.default is None else _literal(field.default)
+    return f"{default} if value is None else {converted}"
+
+
+def _compile(name: str, lines: List[str], namespace: Dict[str, Any]) -> Callable[..., Any]:
+
+    if len(lines) == 1:
+        lines.append("    pass")
+
+    source = "\n".join(lines)
+    exec(compile(source, f"<generated {name}>", "exec"), namespace)
+
+    function = namespace[name]
+    function.__source__ = source
+
+    return function
@@ -11,10 +11,16 @@ from typing import (
     TYPE_CHECKING
 )
 
+import sys
 import enum
+import weakref
 import datetime
 import bhaicord
 
+from contextvars import ContextVar
+
+from bhaicord.models.schema import Field, snowflake, constructor, updater
+
 __all__: Tuple[str] = (
     "UserFlag",
     "User",
@@ -46,6 +52,45 @@ class UserFlag(enum.Flag):
     BOT_HTTP_INTERACTIONS = 1 << 19
 
 
+@final
+class PremiumTypes(enum.Enum):
+
+    NONE = 0
+    NITRO_CLASSIC = 1
+    NITRO = 2
+
+
+# the strings repeated across many users are interned
+USER_FIELDS: Tuple[Field, ...] = (
+    snowflake("id", required=True),
+    Field("username", convert=sys.intern, required=True),
+    Field("discriminator", convert=sys.intern, required=True),
+    Field("avatar_hash", key="avatar", convert=sys.intern),
+    Field("bot", default=False),
+    Field("system"),
+    Field("mfa_enabled"),
+    Field("banner_hash", key="banner", convert=sys.intern),
+    Field("accent_color"),
+    Field("locale", convert=sys.intern),
+    Field("verified"),
+    Field("email"),
+    Field("flags"),
+    Field("premium_type", convert=PremiumTypes, unknown_none=True),
+    Field("public_flags")
+)
+
+# the size of the avatar and banner urls, the biggest discord makes
+IMAGE_SIZE = 4096
+
+
+# user id -> the User shared by everything of a client that has this user, see `User.from_data`,
+# it's `bhaicord.ConnectionState.users` in the tasks of the client, None in other threads
+_identity_map: "ContextVar[Optional[weakref.WeakValueDictionary[int, User]]]" = ContextVar(
+    "bhaicord_identity_map",
+    default=None
+)
+
+
 class User:
     """Represents a discord user
 
@@ -54,33 +99,82 @@ class User:
 
     """
 
-    def __init__(self, data: Dict[str, Any], member_data: Optional[Dict[str, Any]] = None):
+    __slots__ = (
+        "id",
+        "username",
+        "discriminator",
+        "avatar_hash",
+        "bot",
+        "system",
+        "mfa_enabled",
+        "banner_hash",
+        "accent_color",
+        "locale",
+        "verified",
+        "email",
+        "flags",
+        "premium_type",
+        "public_flags",
+        "__weakref__",
+    )
+
+    __init__ = constructor(USER_FIELDS)
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> User:
+        """
+        The user of the payload, the same object for the same id
+
+        While a user is referenced, by a cached message, a member, etc.
+        every payload of it returns that object, updated with what the payload has.
+        Use this instead of ``User(data)`` for users that end up cached.
+
+        The users are shared through the `bhaicord.ConnectionState` of the client
+        running the task, a new user is returned in the threads decoding responses,
+        which don't touch the shared ones.
+
+        Note:
+            The nickname is different in every guild, it's in the `Member`
+        """
+        users = _identity_map.get()
+
+        if users is None:
+            return cls(data)
+
+        user = users.get(int(data["id"]))
 
-        self.member_data = member_data
+        if user is None:
+            user = cls(data)
+            users[user.id] = user
+        else:
+            user._update(data)
 
-        if self.member_data is None:
-            self.member_data = {}
+        return user
 
-        self.avatar_size: int = 4096
-        self.banner_size: int = 4096
+    @classmethod
+    def from_cached_data(cls, data: Dict[str, Any]) -> User:
+        """
+        `from_data` for a payload kept for a while, by a message built lazily for example
 
-        self.id = int(data["id"])
-        self.username: str = data["username"]
-        self.discriminator: str = data["discriminator"]
-        self.avatar_hash: str = data["avatar"]
-        self.bot: Optional[bool] = data.get("bot", False)
-        self.system: Optional[bool] = data.get("system")
-        self.mfa_enabled: Optional[bool] = data.get("mfa_enabled")
-        self.banner_hash: Optional[str] = data.get("banner")
-        self.accent_color: Optional[int] = data.get("accent_color")
-        self.locale: Optional[str] = data.get("locale")
-        self.verified: Optional[bool] = data.get("verified")
-        self.email: Optional[str] = data.get("email")
-        self.flags: Optional[int] = data.get("flags")
+        The shared user is returned as it is, it can be newer than the payload.
+        A user is built from the payload, and shared, only if there's none.
+        """
+        users = _identity_map.get()
 
-        self.premium_type: Optional[PremiumTypes] = bhaicord.utils.make_optional(PremiumTypes, data.get("premium_type"))
+        if users is None:
+            return cls(data)
 
-        self.public_flags: Optional[int] = data.get("public_flags")
+        user = users.get(int(data["id"]))
+
+        if user is None:
+            user = cls(data)
+            users[user.id] = user
+
+        return user
+
+    # partial payloads don't reset the fields they don't have,
+    # returns the attributes that changed with their old value
+    _update = updater(USER_FIELDS)
 
     def __str__(self) -> str:
         return f"{self.username}#{self.discriminator}"
@@ -105,38 +199,34 @@ class User:
         """
         return f"<@{self.id}>"
 
-    def set_avatar_size(self, size: int) -> None:
-        """Helper method to set the avatar size
+    def get_avatar_url(self, size: int = IMAGE_SIZE) -> Optional[str]:
+        """The avatar url at a size, see `avatar_url`
 
         Args:
             size (int): The size for the avatar.
         """
-        self.avatar_size = size
+        return self._make_image(hash_=self.avatar_hash, size=size)
 
-    def set_banner_size(self, size: int) -> None:
-        """Helper method to set the banner size
+    def get_banner_url(self, size: int = IMAGE_SIZE) -> Optional[str]:
+        """The banner url at a size, see `banner_url`
 
         Args:
             size (int): The size for the banner.
         """
-        self.banner_size = size
+        return self._make_image(hash_=self.banner_hash, avatar=False, size=size)
 
-    def _make_image(self, hash_: Optional[str] = None, avatar: bool = True) -> Optional[str]:
+    def _make_image(self, hash_: Optional[str] = None, avatar: bool = True, size: int = IMAGE_SIZE) -> Optional[str]:
         """Builds the avatar url
 
         Args:
 
             avatar (bool, Optional):
                 True for avatar's url, False for banner's.
+            size (int): The size of the image
 
         Note:
             ``avatar`` is True by default
         """
-        if avatar:
-            size = self.avatar_size
-        else:
-            size = self.banner_size
-
         return bhaicord.make_image_url(
             user_id=self.id,
             hash_=hash_,
@@ -217,8 +307,12 @@ class User:
 
     @property
     def display_name(self) -> str:
-        """Display the nickname if possible, otherwise the username"""
-        return self.member_data.get("nick") or self.username
+        """
+        The username, a user is shared by every guild
+
+        The nickname is in `bhaicord.Member.display_name` and `bhaicord.Message.display_name`
+        """
+        return self.username
 
     @property
     def created_on(self) -> datetime.datetime:
@@ -226,13 +320,25 @@ class User:
         return bhaicord.utils.snowflake_to_date(self.id)
 
     @classmethod
-    async def from_id(cls, user_id: int) -> User:
-        """Fetches the user by the id"""
-        return await bhaicord.fetch_user_base(user_id=user_id)
+    async def from_id(cls, user_id: int, *, partial: bool = True) -> User:
+        """Fetches the user by the id, see `bhaicord.Client.fetch_user`"""
+        return await bhaicord.fetch_user_base(user_id=user_id, partial=partial)
 
 
 class Connection:
 
+    __slots__ = (
+        "id",
+        "name",
+        "type",
+        "revoked",
+        "integrations",
+        "verified",
+        "friend_sync",
+        "show_activity",
+        "visibility",
+    )
+
     def __init__(self, data: Dict[str, Any]):
 
         self.id: str = data["id"]
@@ -254,11 +360,3 @@ class ConnectionVisibility(enum.Enum):
 
     NONE = 0
     EVERYONE = 1
-
-
-@final
-class PremiumTypes(enum.Enum):
-
-    NONE = 0
-    NITRO_CLASSIC = 1
-    NITRO = 2
\ No newline at end of file
@@ -1,5 +1,7 @@
 from __future__ import annotations
 import aiohttp
+import asyncio
+import inspect
 import bhaicord
 from enum import Enum
 
@@ -7,7 +9,10 @@ from typing import (
     TYPE_CHECKING,
     List,
     Optional,
-    Union
+    Union,
+    Callable,
+    Any,
+    Dict
 )
 
 from bhaicord.utils import DataType, make_optional
@@ -15,7 +20,7 @@ from bhaicord.models.user import User
 from bhaicord.models.embed import Embed
 from bhaicord.models.file import File
 
-from bhaicord.APIBase.webhook_base import async_send
+from bhaicord.APIBase.webhook_base import async_send, sync_send, webhook_http, close_webhook_http
 
 
 class WebhookTypes(Enum):
@@ -59,7 +64,7 @@ class BaseWebhook:
         base_webhook.type = WebhookTypes(webhook_data["type"])
         base_webhook.guild_id = make_optional(int, webhook_data.get("guild_id"))
         base_webhook.channel_id = make_optional(int, webhook_data.get("channel_id"))
-        base_webhook.user = make_optional(User, webhook_data.get("user"))
+        base_webhook.user = make_optional(User.from_data, webhook_data.get("user"))
         base_webhook.name = webhook_data.get("name")
         base_webhook.avatar = webhook_data.get("avatar")
         base_webhook.token = webhook_data.get("token")
@@ -71,6 +76,16 @@ class BaseWebhook:
 
         return base_webhook
 
+    def _set_id_and_token(self) -> None:
+        """Takes the id and the token from the url"""
+
+        url = list(filter(lambda x: x, self.url.split("/")))
+
+        try:
+            self.token, self.id = url[::-1][0:2]
+        except Exception:
+            raise Exception('Does not seem to be a right url')
+
 
 
 class Webhook(BaseWebhook):
@@ -79,12 +94,7 @@ class Webhook(BaseWebhook):
     def __init__(self, *args, **kwargs):
         super(Webhook, self).__init__(*args, **kwargs)
 
-        url = list(filter(lambda x: x, self.url.split("/")))
-
-        try:
-            self.token, self.id = url[::-1][0:2]
-        except Exception:
-            raise Exception('Does not seem to be a right url')
+        self._set_id_and_token()
 
     @staticmethod
     async def from_id(id_: int) -> Webhook:
@@ -297,3 +307,366 @@ class Webhook(BaseWebhook):
     @staticmethod
     async def edit_message() -> bhaicord.Message:
         """Edits a message"""
+
+
+class SyncWebhook(BaseWebhook):
+    """Represents the Synchronous Webhook object
+
+    Usable from plain threads without any event loop,
+    every thread keeps a keep-alive connection and the rate limits are shared
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SyncWebhook, self).__init__(*args, **kwargs)
+
+        self._set_id_and_token()
+
+    def send(
+            self,
+            *,
+            content: Optional[str] = None,
+            username: Optional[str] = None,
+            avatar_url: Optional[str] = None,
+            tts: Optional[bool] = False,
+            embed: Optional[Embed] = None,
+            embeds: Optional[List[Embed]] = None,
+            file: Optional[File] = None,
+            files: Optional[List[File]] = None,
+            allowed_mentions: Optional[DataType] = None,
+            wait: bool = False,
+            thread_id: Optional[Union[str, int]] = None
+
+    ) -> Optional[bhaicord.Message]:
+
+        """Execute the webhook, blocks until it's sent"""
+
+        return sync_send(
+            content=content,
+            username=username,
+            avatar_url=avatar_url,
+            tts=tts,
+            embed=embed,
+            embeds=embeds,
+            file=file,
+            files=files,
+            allowed_mentions=allowed_mentions,
+            wait=wait,
+            thread_id=thread_id,
+            id_=self.id,
+            token=self.token
+        )
+
+
+# Discord limits for a single message
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBEDS_LENGTH = 6000
+
+
+def _embed_length(embed: Embed) -> int:
+    """The characters discord counts for the 6000 limit of an embed"""
+
+    data = embed.to_dict()
+    length = len(data.get("title") or "") + len(data.get("description") or "")
+
+    for field in data.get("fields") or []:
+        length += len(field.get("name") or "") + len(field.get("value") or "")
+
+    for key in ("footer", "author"):
+        part = data.get(key) or {}
+        length += len(part.get("text") or part.get("name") or "")
+
+    return length
+
+
+class BufferedWebhook:
+    """Collects the sends of a webhook for a while and posts them packed together
+
+    Contents are joined by new lines up to 2000 characters
+    and embeds are packed up to 10 per message, so a chatty feed
+    needs a fraction of the requests. Sends with files are posted on their own.
+
+    Args:
+        webhook (Webhook): The webhook to send with
+        delay (float): Seconds the sends are collected before being posted
+        on_error (typing.Optional[typing.Callable]):
+            Called with the exception if posting fails in the background,
+            if None the exception is raised in the flushing task.
+            The messages after the one that failed are posted by the next flush
+    """
+
+    def __init__(
+            self,
+            webhook: Webhook,
+            *,
+            delay: float = 1.0,
+            on_error: Optional[Callable[[Exception], Any]] = None):
+
+        self.webhook = webhook
+        self.delay = delay
+        self.on_error = on_error
+
+        self._pending: List[DataType] = []
+        self._timer: Optional[asyncio.Task] = None
+        # the timer that is past its sleep and posting
+        self._posting: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def send(
+            self,
+            content: Optional[str] = None,
+            *,
+            username: Optional[str] = None,
+            avatar_url: Optional[str] = None,
+            embed: Optional[Embed] = None,
+            embeds: Optional[List[Embed]] = None,
+            file: Optional[File] = None,
+            files: Optional[List[File]] = None,
+            allowed_mentions: Optional[DataType] = None) -> None:
+
+        """Adds a send, posted in at most ``delay`` seconds"""
+
+        embeds = list(embeds or [])
+        files = list(files or [])
+
+        if embed is not None:
+            embeds.append(embed)
+
+        if file is not None:
+            files.append(file)
+
+        self._pending.append({
+            "content": None if content is None else str(content),
+            "username": username,
+            "avatar_url": avatar_url,
+            "embeds": embeds,
+            "files": files,
+            "allowed_mentions": allowed_mentions
+        })
+
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+
+        # from here close waits for the timer instead of cancelling it
+        self._posting = asyncio.current_task()
+
+        try:
+            await self.flush()
+        except Exception as error:
+            # what wasn't posted is tried again later
+            if self._pending:
+                self._timer = asyncio.create_task(self._flush_later())
+
+            if self.on_error is None:
+                raise
+
+            result = self.on_error(error)
+
+            if inspect.isawaitable(result):
+                await result
+
+    @staticmethod
+    def _fits(message: DataType, send: DataType) -> bool:
+        """Whether the send can be packed into the message"""
+
+        if message["files"] or send["files"]:
+            return False
+
+        for key in ("username", "avatar_url", "allowed_mentions"):
+            if message[key] != send[key]:
+                return False
+
+        if message["content"] is not None and send["content"] is not None:
+            if len(message["content"]) + 1 + len(send["content"]) > MAX_CONTENT_LENGTH:
+                return False
+
+        embeds = message["embeds"] + send["embeds"]
+
+        if len(embeds) > MAX_EMBEDS:
+            return False
+
+        return sum(map(_embed_length, embeds)) <= MAX_EMBEDS_LENGTH
+
+    @staticmethod
+    def pack(sends: List[DataType]) -> List[DataType]:
+        """Packs consecutive sends into as few messages as possible"""
+
+        messages: List[DataType] = []
+
+        for send in sends:
+            if not messages or not BufferedWebhook._fits(messages[-1], send):
+                messages.append({**send, "embeds": list(send["embeds"])})
+                continue
+
+            message = messages[-1]
+
+            if send["content"] is not None:
+                if message["content"] is None:
+                    message["content"] = send["content"]
+                else:
+                    message["content"] += "\n" + send["content"]
+
+            message["embeds"].extend(send["embeds"])
+
+        return messages
+
+    async def flush(self) -> None:
+        """Posts everything pending now, rate limits are respected
+
+        If a message fails its exception is raised,
+        the messages after it are pending again, before the sends made meanwhile.
+        If the flush is cancelled the message being posted is pending again too,
+        as it may not have been posted
+        """
+
+        async with self._lock:
+            sends, self._pending = self._pending, []
+            messages = BufferedWebhook.pack(sends)
+
+            for index, message in enumerate(messages):
+                try:
+                    await self.webhook.send(**message)
+                except asyncio.CancelledError:
+                    # a packed message has the keys of a send
+                    self._pending[:0] = messages[index:]
+                    raise
+                except BaseException:
+                    self._pending[:0] = messages[index + 1:]
+                    raise
+
+    async def close(self) -> None:
+        """Stops the timer and posts what's pending
+
+        A timer that is posting is waited for rather than cancelled,
+        its errors go to ``on_error`` or its task as usual
+        """
+
+        # a failing timer starts another one, which is still sleeping
+        while self._timer is not None and not self._timer.done():
+            timer = self._timer
+
+            if timer is not self._posting:
+                timer.cancel()
+
+            await asyncio.wait((timer,))
+
+        await self.flush()
+
+
+class WebhookPool:
+    """Spreads the sends to a channel across many webhooks
+
+    A single webhook can only post a few messages per second,
+    every send goes to the webhook of the pool with the most rate limit budget left.
+    The webhooks named ``name`` in the channel are reused,
+    more are created while all of them are out of budget, up to ``size``.
+
+    Args:
+        channel_id (int): The channel id
+        size (int): The maximum of webhooks in the pool
+        name (str): The name of the webhooks of the pool
+        ordered (bool): Whether the messages must be posted in the order they were sent,
+            sends are made one at a time then
+        webhooks (typing.Optional[typing.List[Webhook]]):
+            The webhooks to use, none is looked for in the channel if given
+
+    Note: Authentication is required to find and create the webhooks
+    """
+
+    # what a webhook is assumed to be able to send before discord tells us
+    unknown_budget: int = 5
+
+    def __init__(
+            self,
+            channel_id: int,
+            *,
+            size: int = 5,
+            name: str = "bhaicord pool",
+            ordered: bool = False,
+            webhooks: Optional[List[Webhook]] = None):
+
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.channel_id = int(channel_id)
+        self.size = size
+        self.name = name
+        self.ordered = ordered
+        self.webhooks: List[Webhook] = list(webhooks or [])
+
+        self._loaded = webhooks is not None
+        # sends picked but not done yet, by webhook id
+        self._in_flight: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._order_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.webhooks)
+
+    def budget(self, webhook: Webhook) -> int:
+        """The sends the webhook can make right now, minus the ones being made"""
+
+        bucket = webhook_http().ratelimiter.get_bucket(
+            "POST",
+            f"/webhooks/{webhook.id}/{webhook.token}"
+        )
+        budget = self.unknown_budget if bucket.budget is None else bucket.budget
+
+        return budget - self._in_flight.get(str(webhook.id), 0)
+
+    async def _load(self) -> None:
+        """Takes the webhooks of the pool that already exist in the channel"""
+
+        client = bhaicord.CurrentClient.get_client()
+
+        rs = await client.http.request(
+            "GET",
+            f"/channels/{self.channel_id}/webhooks"
+        )
+        known = {str(webhook.id) for webhook in self.webhooks}
+
+        for webhook in await client.http.decode(rs, Webhook.from_data):
+            if webhook.name == self.name and webhook.token and str(webhook.id) not in known:
+                self.webhooks.append(webhook)
+
+    async def _pick(self) -> Webhook:
+        """The webhook with the most budget, created if all are exhausted"""
+
+        async with self._lock:
+            if not self._loaded:
+                await self._load()
+                self._loaded = True
+
+            webhook = max(self.webhooks, key=self.budget, default=None)
+
+            if (webhook is None or self.budget(webhook) <= 0) and len(self.webhooks) < self.size:
+                webhook = await Webhook.create(self.channel_id, name=self.name)
+                self.webhooks.append(webhook)
+
+            key = str(webhook.id)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+            return webhook
+
+    async def _send(self, **kwargs) -> Optional[bhaicord.Message]:
+        webhook = await self._pick()
+
+        try:
+            return await webhook.send(**kwargs)
+        finally:
+            self._in_flight[str(webhook.id)] -= 1
+
+    async def send(self, **kwargs) -> Optional[bhaicord.Message]:
+        """Executes one of the webhooks, takes the same arguments as `Webhook.send`"""
+
+        if not self.ordered:
+            return await self._send(**kwargs)
+
+        async with self._order_lock:
+            return await self._send(**kwargs)
@@ -0,0 +1,182 @@
+import re
+import time
+import asyncio
+
+from typing import (
+    Optional,
+    Dict,
+    Tuple,
+    Mapping
+)
+
+__all__: Tuple[str] = ("Bucket", "RateLimiter")
+
+# ids after these are "major parameters", discord gives every one of them its own bucket
+# https://discord.com/developers/docs/topics/rate-limits#rate-limits
+_MINOR_ID = re.compile(r"(?<!channels/)(?<!guilds/)(?<!webhooks/)(?<!\d)\d{15,21}(?!\d)")
+_MAJOR_PARAMETERS = re.compile(r"(?:channels|guilds)/(\d+)|webhooks/(\d+(?:/[^/?]+)?)")
+
+
+class Bucket:
+    """
+    The rate limit state of a route,
+    updated from the ``X-RateLimit-*`` headers discord sends
+
+    Args:
+        key (str): The key of the bucket
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        # time.monotonic() when the bucket is refilled
+        self.reset_at: float = 0.0
+        # seconds it took to refill the last time
+        self.reset_after: float = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def __repr__(self) -> str:
+        return f"<Bucket key={self.key!r} limit={self.limit} remaining={self.remaining}>"
+
+    @property
+    def budget(self) -> Optional[int]:
+        """Requests that can be made right now, None if not known yet"""
+
+        if self.remaining is None:
+            return None
+
+        if time.monotonic() >= self.reset_at:
+            return self.limit
+
+        return self.remaining
+
+    def delay(self) -> float:
+        """Seconds to wait before a request can be made"""
+
+        if self.budget == 0:
+            return max(0.0, self.reset_at - time.monotonic())
+
+        return 0.0
+
+    def consume(self) -> None:
+        """Takes one request from the budget"""
+
+        if self.remaining is None:
+            return
+
+        now = time.monotonic()
+
+        if now >= self.reset_at:
+            # refilled, the next reset is unknown until the response comes
+            self.remaining = self.limit
+            self.reset_at = now + self.reset_after
+
+        self.remaining = max(0, self.remaining - 1)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Updates the state from the response headers"""
+
+        if "X-RateLimit-Remaining" not in headers:
+            return
+
+        self.limit = int(headers.get("X-RateLimit-Limit", 1))
+        self.remaining = int(headers["X-RateLimit-Remaining"])
+        self.reset_after = float(headers.get("X-RateLimit-Reset-After", 0))
+        self.reset_at = time.monotonic() + self.reset_after
+
+    async def wait(self) -> None:
+        """Sleeps until there is budget, without taking any"""
+
+        delay = self.delay()
+
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def acquire(self) -> None:
+        """Sleeps until there is budget and takes one request of it"""
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await self.wait()
+            self.consume()
+
+
+class RateLimiter:
+    """Keeps a `Bucket` for every route and the global rate limit"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Bucket] = {}
+        # route -> the bucket hash discord told us
+        self._hashes: Dict[str, str] = {}
+        self._global_reset_at: float = 0.0
+
+    @staticmethod
+    def route(method: str, url: str) -> str:
+        """
+        The route of a request, minor ids are replaced by ``{id}``
+
+        Example:
+            ``GET /channels/1234/messages/5678`` is ``GET /channels/1234/messages/{id}``
+        """
+        url = "/" + url.split("?", 1)[0].lstrip("/")
+
+        return f"{method.upper()} {_MINOR_ID.sub('{id}', url)}"
+
+    def bucket_key(self, method: str, url: str) -> str:
+        """The key of the bucket a request goes to"""
+
+        route = RateLimiter.route(method, url)
+        bucket_hash = self._hashes.get(route)
+
+        if bucket_hash is None:
+            return route
+
+        majors = "/".join(
+            match.group(1) or match.group(2)
+            for match in _MAJOR_PARAMETERS.finditer(url.split("?", 1)[0])
+        )
+        return f"{bucket_hash}:{majors}"
+
+    def get_bucket(self, method: str, url: str) -> Bucket:
+        """The bucket of a request, created if needed"""
+
+        key = self.bucket_key(method, url)
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = self._buckets[key] = Bucket(key)
+
+        return bucket
+
+    def update(self, method: str, url: str, headers: Mapping[str, str]) -> None:
+        """Updates the bucket of a request from the response headers"""
+
+        bucket = self.get_bucket(method, url)
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+
+        if bucket_hash is not None:
+            self._hashes[RateLimiter.route(method, url)] = bucket_hash
+            # the same state, now also known by its hash
+            self._buckets.setdefault(self.bucket_key(method, url), bucket)
+
+        bucket.update(headers)
+
+    def set_global(self, retry_after: float) -> None:
+        """Every request waits ``retry_after`` seconds"""
+        self._global_reset_at = time.monotonic() + retry_after
+
+    async def acquire(self, method: str, url: str) -> Bucket:
+        """Waits for the global rate limit and the bucket of the request"""
+
+        delay = self._global_reset_at - time.monotonic()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        bucket = self.get_bucket(method, url)
+        await bucket.acquire()
+
+        return bucket
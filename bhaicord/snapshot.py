@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import gzip
+import time
+import pickle
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple
+)
+
+import bhaicord
+from bhaicord.cache import LRUCache, MessageCache
+from bhaicord.models.user import User
+from bhaicord.models.message import Message
+
+__all__: Tuple[str] = (
+    "save_snapshot",
+    "load_snapshot"
+)
+
+# 2: messages keep their data and build fields lazily, LRUCache entries have a size and stats
+# 3: users have no member data or image sizes
+SNAPSHOT_VERSION = 3
+
+
+def _entries(cache: Any) -> list:
+    if isinstance(cache, (LRUCache, MessageCache)):
+        return list(cache.entries())
+
+    return list(cache.items())
+
+
+def save_snapshot(client: "bhaicord.Client", path: str) -> None:
+    """
+    Writes the cached users, messages and guild state of the client to a file
+
+    It's a gzipped pickle written at once, a crash never leaves half a snapshot.
+    Only what is in memory is written, a storage keeps its own entries.
+
+    Args:
+        client (bhaicord.Client): The client
+        path (str): The file
+    """
+    state = client.state
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.time(),
+        "users": _entries(client.user_cache),
+        "messages": _entries(client.message_cache),
+        "guilds": list(state.guilds.values()),
+        # channels out of guilds, DMs
+        "channels": [
+            channel for channel in state.channels.values()
+            if channel.guild_id is None
+        ]
+    }
+
+    tmp = f"{path}.tmp"
+
+    with gzip.open(tmp, "wb", compresslevel=6) as fp:
+        pickle.dump(snapshot, fp, pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp, path)
+
+
+def _share(state: "bhaicord.ConnectionState", users: Iterable[Optional[User]]) -> None:
+    """Puts the loaded users in the identity map of the state, see `User.from_data`"""
+
+    for user in users:
+        if user is not None:
+            state.users.setdefault(user.id, user)
+
+
+def load_snapshot(client: "bhaicord.Client", path: str) -> bool:
+    """
+    Loads a snapshot written by `save_snapshot` into the caches of the client
+
+    Everything loaded is marked stale in `bhaicord.ConnectionState.stale`
+    until a gateway event carries it again, READY removes the guilds the bot left.
+    The fetch functions request stale users and messages again instead of returning them,
+    the guilds and their channels are sent again by the gateway when it connects.
+
+    Warning:
+        Snapshots are pickles, only load files this bot wrote
+
+    Args:
+        client (bhaicord.Client): The client, before it connects
+        path (str): The file
+
+    Return:
+        bool: False if there's no snapshot or it's from another version
+    """
+    if not os.path.exists(path):
+        return False
+
+    with gzip.open(path, "rb") as fp:
+        snapshot: Dict[str, Any] = pickle.load(fp)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return False
+
+    state = client.state
+    stale = state.stale
+
+    for user_id, user in snapshot["users"]:
+        client.user_cache[user_id] = user
+        stale["users"].add(user_id)
+
+    for message_id, message in snapshot["messages"]:
+        client.message_cache[message_id] = message
+        stale["messages"].add(message_id)
+
+    for guild in snapshot["guilds"]:
+        # the caches were pickled without their storage
+        for mapping in (guild.channels, guild.members):
+            if isinstance(mapping, LRUCache):
+                mapping.storage = state.storage
+
+        state.guilds[guild.id] = guild
+        stale["guilds"].add(guild.id)
+
+        for channel_id, channel in guild.channels.items():
+            state.channels[channel_id] = channel
+            stale["channels"].add(channel_id)
+
+        if not isinstance(guild.members, bhaicord.MemberStore):
+            _share(state, (member.user for member in guild.members.values()))
+
+    for channel in snapshot["channels"]:
+        state.channels[int(channel.id)] = channel
+        stale["channels"].add(int(channel.id))
+
+    _share(state, (user for _, user in snapshot["users"]))
+    # only the authors and mentions already built, reading the lazy ones would build them all,
+    # they join the identity map when built, see `User.from_cached_data`
+    _share(
+        state,
+        (
+            user
+            for _, message in snapshot["messages"]
+            # webhook authors have their own names in every message
+            if isinstance(message, Message) and message.webhook_id is None
+            for user in [getattr(message, "_author", None), *getattr(message, "_mentions", ())]
+        )
+    )
+
+    return True
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import weakref
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple
+)
+
+from bhaicord.utils import DataType
+from bhaicord.cache import CachePolicy
+from bhaicord.storage import BaseStorage
+from bhaicord.models.user import User, _identity_map
+from bhaicord.models.role import Role
+from bhaicord.models.emoji import Emoji
+from bhaicord.models.channel import Channel
+from bhaicord.models.guild import Guild, Member
+
+__all__: Tuple[str] = ("ConnectionState", )
+
+STALE_KINDS: Tuple[str, ...] = ("guilds", "channels", "users", "messages")
+
+
+class ConnectionState:
+    """
+    The guilds, channels, roles, members and emojis sent by the gateway
+
+    The client gives it every dispatch event with `parse`,
+    the fetch functions look here before requesting
+
+    Args:
+        compact_members (bool): Whether guilds keep their members in a `bhaicord.MemberStore`
+        policies (typing.Optional[typing.Dict[str, bhaicord.CachePolicy]]):
+            The ``"members"`` and ``"channels"`` policies, the member limits are per guild
+        storage (typing.Optional[bhaicord.BaseStorage]): Where bounded caches put what they evict
+    """
+
+    def __init__(
+            self,
+            *,
+            compact_members: bool = False,
+            policies: Optional[Dict[str, CachePolicy]] = None,
+            storage: Optional[BaseStorage] = None):
+
+        policies = policies or {}
+
+        self.compact_members = compact_members
+        self.storage = storage
+        self.member_policy: CachePolicy = policies.get("members") or CachePolicy()
+        self.channel_policy: CachePolicy = policies.get("channels") or CachePolicy()
+
+        self.guilds: Dict[int, Guild] = {}
+        self.channels: MutableMapping[int, Channel] = self.channel_policy.build(
+            storage=storage,
+            namespace="channels"
+        )
+
+        # ids loaded from a snapshot that no gateway event confirmed yet, by kind
+        self.stale: Dict[str, Set[int]] = {kind: set() for kind in STALE_KINDS}
+
+        # user id -> the user shared by the cached objects of this client, see `bind`
+        self.users: "weakref.WeakValueDictionary[int, User]" = weakref.WeakValueDictionary()
+
+    def bind(self) -> None:
+        """Makes `User.from_data` share the users through `users` in the running context
+
+        Tasks created afterwards inherit it, the threads decoding responses don't
+        """
+        _identity_map.set(self.users)
+
+    def __repr__(self) -> str:
+        return f"<ConnectionState guilds={len(self.guilds)} channels={len(self.channels)}>"
+
+    def clear(self) -> None:
+        self.guilds.clear()
+        self.channels.clear()
+
+        for ids in self.stale.values():
+            ids.clear()
+
+    def is_stale(self, kind: str, id_: int) -> bool:
+        """
+        Whether the entry was loaded from a snapshot and the gateway didn't confirm it yet
+
+        Args:
+            kind (str): ``"guilds"``, ``"channels"``, ``"users"`` or ``"messages"``
+            id_ (int): The id
+        """
+        return int(id_) in self.stale[kind]
+
+    def _confirm(self, event_name: str, data: DataType) -> None:
+        """Removes the stale mark of what the event carries"""
+
+        if not any(self.stale.values()):
+            return
+
+        stale = self.stale
+
+        if event_name in ("GUILD_CREATE", "GUILD_UPDATE", "GUILD_DELETE"):
+            stale["guilds"].discard(int(data["id"]))
+
+            for channel in data.get("channels", []) + data.get("threads", []):
+                stale["channels"].discard(int(channel["id"]))
+
+            for member in data.get("members", []):
+                stale["users"].discard(int(member["user"]["id"]))
+
+        elif event_name.startswith(("CHANNEL_", "THREAD_")) and "id" in data:
+            stale["channels"].discard(int(data["id"]))
+
+        elif event_name.startswith("GUILD_MEMBER_"):
+            stale["users"].discard(int(data["user"]["id"]))
+
+        elif event_name.startswith("MESSAGE_") and "id" in data:
+            stale["messages"].discard(int(data["id"]))
+
+            if "author" in data:
+                stale["users"].discard(int(data["author"]["id"]))
+
+        elif event_name == "USER_UPDATE":
+            stale["users"].discard(int(data["id"]))
+
+    def get_guild(self, guild_id: int) -> Optional[Guild]:
+        """An available guild by id"""
+
+        guild = self.guilds.get(int(guild_id))
+
+        if guild is None or guild.unavailable:
+            return None
+
+        return guild
+
+    def get_channel(self, channel_id: int) -> Optional[Channel]:
+        """A channel by id"""
+        return self.channels.get(int(channel_id))
+
+    def get_roles(self, guild_id: int) -> Optional[List[Role]]:
+        """The roles of a guild, None if the guild isn't known"""
+
+        guild = self.get_guild(guild_id)
+
+        if guild is None:
+            return None
+
+        return list(guild.roles.values())
+
+    def get_member(self, guild_id: int, user_id: int) -> Optional[Member]:
+        """A member of a guild by id"""
+
+        guild = self.get_guild(guild_id)
+
+        if guild is None:
+            return None
+
+        return guild.get_member(user_id)
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        """
+        A user referenced by a cached object, in O(1)
+
+        The guilds aren't searched, a member kept compact by a `bhaicord.MemberStore`
+        or spilled to a storage is only found with `get_member`.
+        Users from the gateway are partial, they have no banner or accent color.
+        """
+        return self.users.get(int(user_id))
+
+    def parse(self, event_name: str, data: DataType) -> Any:
+        """Updates the state with a dispatch event, unknown events are ignored
+
+        Return:
+            typing.Any: What the parser of the event returns, None for most of them
+        """
+
+        parser = getattr(self, f"parse_{event_name.lower()}", None)
+        result = None if parser is None else parser(data)
+
+        self._confirm(event_name.upper(), data)
+
+        return result
+
+    def parse_ready(self, data: DataType) -> None:
+
+        # guilds from a snapshot the bot isn't in anymore
+        guild_ids = {int(guild["id"]) for guild in data.get("guilds", [])}
+
+        for guild_id in list(self.guilds):
+            if guild_id not in guild_ids:
+                self._remove_guild(guild_id)
+                self.stale["guilds"].discard(guild_id)
+
+    def _add_channel(self, channel: Channel) -> None:
+
+        self.channels[int(channel.id)] = channel
+
+        guild = self.guilds.get(channel.guild_id) if channel.guild_id else None
+
+        if guild is not None:
+            guild.channels[int(channel.id)] = channel
+
+    def _remove_channel(self, data: DataType) -> None:
+
+        channel_id = int(data["id"])
+        self.channels.discard(channel_id)
+
+        guild = self.guilds.get(int(data.get("guild_id") or 0))
+
+        if guild is not None:
+            guild.channels.discard(channel_id)
+
+    def _remove_guild(self, guild_id: int) -> Optional[Guild]:
+
+        guild = self.guilds.pop(guild_id, None)
+
+        if guild is not None:
+            for channel_id in guild.channels:
+                self.channels.discard(channel_id)
+
+        return guild
+
+    def parse_guild_create(self, data: DataType) -> None:
+
+        guild = Guild(
+            data,
+            compact_members=self.compact_members,
+            member_policy=self.member_policy,
+            channel_policy=self.channel_policy,
+            storage=self.storage
+        )
+
+        self._remove_guild(guild.id)
+        self.guilds[guild.id] = guild
+
+        for channel_id, channel in guild.channels.items():
+            self.channels[channel_id] = channel
+
+    def parse_guild_update(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["id"]))
+
+        if guild is None:
+            self.parse_guild_create(data)
+        else:
+            guild._update(data)
+
+    def parse_guild_delete(self, data: DataType) -> None:
+
+        guild_id = int(data["id"])
+
+        if data.get("unavailable"):
+            # an outage, it comes back with GUILD_CREATE
+            guild = self.guilds.get(guild_id)
+
+            if guild is not None:
+                guild.unavailable = True
+
+            return
+
+        self._remove_guild(guild_id)
+
+    def parse_channel_create(self, data: DataType) -> None:
+        self._add_channel(Channel(data))
+
+    parse_channel_update = parse_channel_create
+    parse_thread_create = parse_channel_create
+    parse_thread_update = parse_channel_create
+
+    def parse_channel_delete(self, data: DataType) -> None:
+        self._remove_channel(data)
+
+    parse_thread_delete = parse_channel_delete
+
+    def parse_guild_role_create(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is not None:
+            role = data["role"]
+            guild.roles[int(role["id"])] = Role(role)
+
+    parse_guild_role_update = parse_guild_role_create
+
+    def parse_guild_role_delete(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is not None:
+            guild.roles.pop(int(data["role_id"]), None)
+
+    def parse_guild_member_add(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is None:
+            return
+
+        # a replayed event doesn't count the member twice
+        if int(data["user"]["id"]) not in guild.members:
+            guild.member_count += 1
+
+        guild._add_member(data)
+
+    def parse_guild_member_update(
+            self,
+            data: DataType) -> Optional[Tuple[Optional[Member], Dict[str, Any], Dict[str, Any]]]:
+
+        """The member, what changed in it and what changed in its user, None for an unknown guild"""
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is None:
+            return None
+
+        # before the member, which updates the shared user without telling
+        user = self.users.get(int(data["user"]["id"]))
+        user_changes = {} if user is None else user._update(data["user"])
+
+        member, changes = guild._update_member(data)
+
+        return member, changes, user_changes
+
+    def parse_guild_member_remove(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is None:
+            return
+
+        guild._remove_member(data["user"]["id"])
+        guild.member_count -= 1
+
+    def parse_guild_members_chunk(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is None:
+            return
+
+        for member in data.get("members", []):
+            guild._add_member(member)
+
+    def parse_guild_emojis_update(self, data: DataType) -> None:
+
+        guild = self.guilds.get(int(data["guild_id"]))
+
+        if guild is not None:
+            guild.emojis = {int(emoji["id"]): Emoji(emoji) for emoji in data["emojis"]}
+
+    def _update_users(self, data: DataType) -> None:
+        """
+        Updates the shared users with the author and mentions of a fresh message payload
+
+        Messages build them lazily with `User.from_cached_data`, which doesn't update them,
+        the payload may be old by then. Users nothing references aren't built.
+        """
+        users = list(data.get("mentions") or ())
+
+        # the name of a webhook author is the one of this message
+        if "author" in data and data.get("webhook_id") is None:
+            users.append(data["author"])
+
+        for user_data in users:
+            if int(user_data["id"]) in self.users:
+                User.from_data(user_data)
+
+    def parse_message_create(self, data: DataType) -> None:
+        self._update_users(data)
+
+    def parse_message_update(self, data: DataType) -> None:
+        self._update_users(data)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import abc
+import pickle
+import sqlite3
+
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple
+)
+
+from bhaicord.cache import MISSING
+
+__all__: Tuple[str] = (
+    "BaseStorage",
+    "MemoryStorage",
+    "SQLiteStorage"
+)
+
+
+class BaseStorage(abc.ABC):
+    """
+    Where caches put the entries they don't keep in memory
+
+    Entries are grouped by namespace, ``"users"``, ``"messages"``...
+    ``get`` returns ``bhaicord.cache.MISSING`` for unknown keys
+    """
+
+    @abc.abstractmethod
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """The value of the key, ``MISSING`` if it isn't stored"""
+
+    def get_many(self, namespace: str, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """The values of the keys that are stored"""
+
+        found = {}
+
+        for key in keys:
+            value = self.get(namespace, key)
+
+            if value is not MISSING:
+                found[key] = value
+
+        return found
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        """Stores the value"""
+        self.set_many(namespace, [(key, value)])
+
+    @abc.abstractmethod
+    def set_many(self, namespace: str, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        """Stores many values at once"""
+
+    @abc.abstractmethod
+    def delete(self, namespace: str, key: Hashable) -> None:
+        """Removes the key, if it's stored"""
+
+    @abc.abstractmethod
+    def count(self, namespace: str) -> int:
+        """The values stored in the namespace"""
+
+    @abc.abstractmethod
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Removes everything of a namespace, or of all of them"""
+
+    def flush(self) -> None:
+        """Writes what is pending, if the storage batches writes"""
+
+    def close(self) -> None:
+        """Flushes and releases the storage"""
+        self.flush()
+
+
+class MemoryStorage(BaseStorage):
+    """A storage in a dict, what spills into it still takes memory but is never lost"""
+
+    def __init__(self):
+        self._namespaces: Dict[str, Dict[Hashable, Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"<MemoryStorage namespaces={list(self._namespaces)}>"
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        return self._namespaces.get(namespace, {}).get(key, MISSING)
+
+    def set_many(self, namespace: str, items: Iterable[Tuple[Hashable, Any]]) -> None:
+        self._namespaces.setdefault(namespace, {}).update(items)
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        self._namespaces.get(namespace, {}).pop(key, None)
+
+    def count(self, namespace: str) -> int:
+        return len(self._namespaces.get(namespace, {}))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            self._namespaces.clear()
+        else:
+            self._namespaces.pop(namespace, None)
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    A storage in a SQLite database, values are pickled
+
+    The database is in WAL mode, so many processes can read it
+    while one writes. Writes are kept in memory and written in one transaction
+    once there are ``batch_size`` of them, or on `flush` and `close`.
+    Keys are ids, stored as integers.
+
+    Warning:
+        The caches call it synchronously, so reads and batch writes block the event loop.
+        A lookup by primary key and a batch of ``batch_size`` rows are fast on a local disk,
+        a database on a network share or a big ``batch_size`` delay the gateway
+
+    Args:
+        path (str): The database file, ``":memory:"`` for a private one
+        batch_size (int): The writes kept before writing them
+        timeout (float): Seconds to wait for another process holding the lock
+    """
+
+    def __init__(self, path: str, *, batch_size: int = 500, timeout: float = 5.0):
+        self.path = path
+        self.batch_size = batch_size
+
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, "
+            "key INTEGER NOT NULL, "
+            "value BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, key)"
+            ") WITHOUT ROWID"
+        )
+
+        # (namespace, key) -> pickled value, None to delete
+        self._pending: Dict[Tuple[str, Hashable], Optional[bytes]] = {}
+
+    def __repr__(self) -> str:
+        return f"<SQLiteStorage path={self.path!r} pending={len(self._pending)}>"
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        if (namespace, key) in self._pending:
+            value = self._pending[(namespace, key)]
+            return MISSING if value is None else pickle.loads(value)
+
+        row = self._connection.execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+        return MISSING if row is None else pickle.loads(row[0])
+
+    def get_many(self, namespace: str, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        self.flush()
+
+        keys = list(keys)
+        found = {}
+
+        # sqlite allows 999 parameters in old versions
+        for start in range(0, len(keys), 900):
+            chunk = keys[start:start + 900]
+
+            rows = self._connection.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({', '.join('?' * len(chunk))})",
+                (namespace, *chunk)
+            )
+
+            for key, value in rows:
+                found[key] = pickle.loads(value)
+
+        return found
+
+    def set_many(self, namespace: str, items: Iterable[Tuple[Hashable, Any]]) -> None:
+
+        for key, value in items:
+            self._pending[(namespace, key)] = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+
+        self._pending[(namespace, key)] = None
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def count(self, namespace: str) -> int:
+        self.flush()
+
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ?",
+            (namespace, )
+        ).fetchone()[0]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+
+        if namespace is None:
+            self._pending.clear()
+            self._connection.execute("DELETE FROM entries")
+            return
+
+        self.flush()
+        self._connection.execute("DELETE FROM entries WHERE namespace = ?", (namespace, ))
+
+    def flush(self) -> None:
+
+        if not self._pending:
+            return
+
+        upserts: List[Tuple[str, Hashable, bytes]] = []
+        deletes: List[Tuple[str, Hashable]] = []
+
+        for (namespace, key), value in self._pending.items():
+            if value is None:
+                deletes.append((namespace, key))
+            else:
+                upserts.append((namespace, key, value))
+
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)",
+                upserts
+            )
+            self._connection.executemany(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                deletes
+            )
+
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
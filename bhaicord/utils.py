@@ -10,7 +10,10 @@ from typing import (
     Union,
     TypeVar
 )
+import sys
 import attr
+import enum
+import random
 import datetime
 
 T = Callable[[Any], Any]
@@ -19,12 +22,128 @@ DataType = Dict[str, Any]
 _T = TypeVar("_T")
 
 
+def attributes_of(obj: Any) -> List[str]:
+    """
+    The attribute names of an object, in definition order
+
+    Slots are collected from every class of the MRO, base classes first,
+    and the ``__dict__`` keys are added if the object has one
+
+    Args:
+        obj (typing.Any): The instance
+    """
+    names = {}
+
+    for cls in reversed(type(obj).__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+
+        if isinstance(slots, str):
+            slots = (slots, )
+
+        for name in slots:
+            if name not in ("__dict__", "__weakref__"):
+                names[name] = None
+
+    names.update(dict.fromkeys(getattr(obj, "__dict__", {})))
+
+    return list(names)
+
+
+class lazy_slot:
+    """
+    An attribute of a class with ``__slots__`` built the first time it's read
+
+    The decorated method builds the value, which is kept in the slot of the same name
+    with a leading underscore, the class must define that slot.
+    Assigning the attribute sets the slot, so it's never built.
+
+    Example:
+        class Message:
+            __slots__ = ("_data", "_author")
+
+            @lazy_slot
+            def author(self) -> User:
+                return User.from_cached_data(self._data["author"])
+    """
+
+    def __init__(self, build: Callable[[Any], Any]):
+        self.build = build
+        self.__doc__ = build.__doc__
+
+    def __set_name__(self, owner: Type[Any], name: str) -> None:
+        self.name = name
+        # the member descriptor python made for the slot
+        self.slot = owner.__dict__[f"_{name}"]
+
+    def __get__(self, obj: Any, owner: Optional[Type[Any]] = None) -> Any:
+        if obj is None:
+            return self
+
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            pass
+
+        value = self.build(obj)
+        self.slot.__set__(obj, value)
+
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj: Any) -> None:
+        self.slot.__delete__(obj)
+
+
+# sizes of these don't depend on what they reference
+_ATOMS = (str, bytes, int, float, bool, type(None), datetime.datetime)
+
+
+def approximate_size(obj: Any, *, depth: int = 4) -> int:
+    """
+    The approximate bytes an object takes, with what it references
+
+    Containers, ``__slots__`` and ``__dict__`` are followed ``depth`` levels down,
+    every object is counted once. Objects shared with others,
+    like the author of many messages, are counted for each of them.
+
+    Args:
+        obj (typing.Any): The object
+        depth (int): How many references down to follow
+    """
+    seen = set()
+
+    def walk(value: Any, level: int) -> int:
+        if id(value) in seen or isinstance(value, (type, enum.Enum)):
+            return 0
+
+        seen.add(id(value))
+        size = sys.getsizeof(value)
+
+        if level >= depth or isinstance(value, _ATOMS):
+            return size
+
+        if isinstance(value, dict):
+            return size + sum(walk(key, level + 1) + walk(item, level + 1) for key, item in value.items())
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return size + sum(walk(item, level + 1) for item in value)
+
+        if hasattr(value, "__dict__"):
+            size += sys.getsizeof(value.__dict__)
+
+        return size + sum(walk(getattr(value, name, None), level + 1) for name in attributes_of(value))
+
+    return walk(obj, 0)
+
+
 def from_obj_to_dict(obj: Type[Any], *, ignore: Optional[List[str]] = None) -> DataType:
     """
     Converts an object to dictionary
 
-    We first make some check, since some classes.
-    may use ``__dict__`` or ``__slots__``
+    Works for classes using ``__dict__``, ``__slots__`` or both,
+    see `attributes_of`
 
     Args:
         obj (typing.Type[Any]): The instance or class
@@ -38,15 +157,10 @@ def from_obj_to_dict(obj: Type[Any], *, ignore: Optional[List[str]] = None) -> D
     if ignore is None:
         ignore = []
 
-    if hasattr(obj, "__dict__"):
-        data = obj.__dict__
-    else:
-        data = obj.__slots__
-
     new = {}
-    for key in data:
+    for key in attributes_of(obj):
         if key not in ignore:
-            if not key.startswith("_"):
+            if not key.startswith("_") and hasattr(obj, key):
                 new[key] = getattr(obj, key)
 
     return new
@@ -112,6 +226,33 @@ def snowflake_to_date(snowflake: Union[str, int]) -> datetime.datetime:
     return datetime.datetime.utcfromtimestamp(ms / 1000)
 
 
+def time_snowflake(date: datetime.datetime, *, high: bool = False) -> int:
+    """
+    The reverse of `snowflake_to_date`, the lowest (or highest)
+    snowflake that could have been created at the given date
+
+    Args:
+        date (datetime.datetime): The date, naive dates are taken as UTC
+        high (bool): Whether to set all the non-timestamp bits
+
+    Returns: int
+    """
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+
+    ms = int(date.timestamp() * 1000) - 1420070400000
+
+    return (ms << 22) + ((1 << 22) - 1 if high else 0)
+
+
+def generate_nonce() -> str:
+    """
+    A unique nonce for message creation,
+    discord uses it to not create the same message twice
+    """
+    return str(time_snowflake(datetime.datetime.now(datetime.timezone.utc)) | random.getrandbits(22))
+
+
 def make_optional(callable_: Callable[[Any], Any], *args, kwargs: Dict[str, Any] = None) -> Optional[Any]:
     """
     Some values from models may be null,
@@ -177,7 +318,7 @@ class Utilities:
 
         arguments = []
 
-        args = self.__dict__ or self.__slots__
+        args = attributes_of(self)
 
         for argument in args:
             if not all_attributes:
@@ -6,6 +6,7 @@ with open('README.md') as f:
 
 requirements = [
     'aiohttp>=3.8.4',
+    'attrs>=21.3.0',
     'async-timeout>=4.0,<5.0; python_version<"3.11"'
 ]
 